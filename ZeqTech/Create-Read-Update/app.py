@@ -12,13 +12,21 @@ Key Concepts Covered:
 - Session management
 - Query filtering
 - Batch operations
+- Set-based bulk UPDATE/DELETE
+- Upserts with INSERT ... ON CONFLICT
 - Error handling
 
 Author: ZeqTech Tutorial Series
 License: MIT
 """
 
-from models import User, session
+from bulk_mutations import bulk_delete, bulk_update
+from counting import count_rows
+from models import User, reset_database, session, user_counter
+from upsert import upsert
+
+# The demo seeds its own data, so start from empty tables
+reset_database()
 
 # =============================================================================
 # CREATE OPERATIONS
@@ -130,8 +138,11 @@ def demonstrate_read_operations():
     # Query 4: Count records
     print("\n4️⃣ Total number of users:")
     print("-" * 30)
-    total_users = session.query(User).count()
+    # Plain SELECT count(*) instead of Query.count()'s subquery
+    total_users = count_rows(session, User)
     print(f"   • Total users: {total_users}")
+    # O(1) exact count kept current by triggers
+    print(f"   • Total users (counter): {count_rows(session, User, mode='counter', counter=user_counter)}")
     
     # Query 5: Filter with conditions
     print("\n5️⃣ Users older than 25:")
@@ -180,27 +191,25 @@ def demonstrate_update_operations():
     print("\n2️⃣ Batch Update:")
     print("-" * 30)
     
-    # Update all users with age 20 to age 21
-    users_to_update = session.query(User).filter_by(age=20).all()
-    for user in users_to_update:
-        user.age = 21
-        print(f"   Updated: {user}")
-    
+    # Update all users with age 20 to age 21 with a single UPDATE ... WHERE
+    # instead of loading and modifying every user one at a time
+    updated = bulk_update(session, User, User.age == 20, {"age": 21})
     session.commit()
-    print("   ✅ Batch update completed!")
+    print(f"   ✅ Batch update completed! ({updated} rows)")
     
     # Update 3: Update with conditions
     print("\n3️⃣ Conditional Update:")
     print("-" * 30)
     
-    # Update users older than 30
-    old_users = session.query(User).filter(User.age > 30).all()
-    for user in old_users:
-        user.age += 1  # Increment age by 1
-        print(f"   Updated: {user}")
-    
+    # Update users older than 30 - the increment runs inside the database
+    # ("fetch" takes the new ages of loaded users from the database; "evaluate"
+    # would have to re-run the SQL expression age + 1 in Python, which only
+    # works for the simple expressions SQLAlchemy knows how to evaluate)
+    updated = bulk_update(
+        session, User, User.age > 30, {"age": User.age + 1}, synchronize_session="fetch"
+    )
     session.commit()
-    print("   ✅ Conditional update completed!")
+    print(f"   ✅ Conditional update completed! ({updated} rows)")
 
 # =============================================================================
 # DELETE OPERATIONS
@@ -237,14 +246,10 @@ def demonstrate_delete_operations():
     print("\n2️⃣ Conditional Delete:")
     print("-" * 30)
     
-    # Delete users with age 21
-    users_to_delete = session.query(User).filter_by(age=21).all()
-    for user in users_to_delete:
-        print(f"   Deleting: {user}")
-        session.delete(user)
-    
-    session.commit()
-    print("   ✅ Conditional delete completed!")
+    # Delete users with age 21 in chunks of 1000 rows, each chunk committed
+    # separately so a large delete never holds the write lock for long
+    deleted = bulk_delete(session, User, User.age == 21, chunk_size=1000)
+    print(f"   ✅ Conditional delete completed! ({deleted} rows)")
     
     # Show remaining users
     print("\n3️⃣ Remaining Users:")
@@ -289,6 +294,15 @@ def demonstrate_query_best_practices():
         session.rollback()
         print("   ✅ Transaction rolled back successfully")
     
+    # Upsert: let SQLite resolve the duplicate email with ON CONFLICT
+    # instead of paying for an exception and a rollback per conflict
+    result = upsert(session, User, [
+        {'name': 'Ahmed Hassan', 'age': 32, 'email': "ahmed31@example.com", 'password': 'secure123'},
+        {'name': 'Test User', 'age': 25, 'email': "test25@example.com", 'password': 'test123'},
+    ])
+    session.commit()
+    print(f"   ✅ Upsert: {result.inserted} inserted, {result.updated} updated")
+    
     # Best Practice 2: Use context managers for sessions
     print("\n2️⃣ Session Management:")
     print("-" * 30)
@@ -0,0 +1,168 @@
+"""
+SQLAlchemy Bulk Mutations Tutorial - Set-Based UPDATE and DELETE
+
+Loading every matching row just to change a column (``for user in users:
+user.age += 1``) or to ``session.delete()`` it costs one SELECT plus one
+UPDATE/DELETE per row. This module compiles the same intent into a single
+``UPDATE ... WHERE`` / ``DELETE ... WHERE`` statement, lets the caller pick
+how objects already loaded in the session are synchronized, and returns the
+number of affected rows. Large deletes can be split into chunks that commit
+separately so SQLite's write lock is released between them (or, with
+``commit_each_chunk=False``, stay in the caller's transaction).
+
+Key Concepts Covered:
+- ORM-enabled ``update()`` / ``delete()`` statements
+- ``synchronize_session`` strategies: evaluate, fetch, none
+- Affected row counts via ``rowcount``
+- Chunked deletes with short write transactions
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+from sqlalchemy import delete, inspect, select, update
+from sqlalchemy.orm import scoped_session
+
+# =============================================================================
+# SYNCHRONIZATION STRATEGIES
+# =============================================================================
+
+# "evaluate" - apply the WHERE/SET in Python to objects already in the session
+# "fetch"    - read the affected primary keys back (RETURNING or a SELECT)
+# "none"     - leave loaded objects untouched (fastest; they may be stale)
+SYNCHRONIZE_STRATEGIES = {"evaluate": "evaluate", "fetch": "fetch", "none": False}
+
+
+def _synchronize(strategy):
+    try:
+        return SYNCHRONIZE_STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(
+            "synchronize_session must be one of %s" % ", ".join(SYNCHRONIZE_STRATEGIES)
+        ) from None
+
+
+def _criteria(where):
+    """Accept a single criterion or a list/tuple of criteria."""
+    if where is None:
+        return ()
+    if isinstance(where, (list, tuple)):
+        return tuple(where)
+    return (where,)
+
+
+def _has_written(session):
+    """Whether the session's open transaction has executed any write yet."""
+    if isinstance(session, scoped_session):
+        session = session()
+    if not session.in_transaction():
+        return False
+    dbapi_connection = session.connection().connection.dbapi_connection
+    # pysqlite only issues BEGIN before the first INSERT/UPDATE/DELETE, so
+    # reads alone leave this False; assume a write for drivers without it
+    return getattr(dbapi_connection, "in_transaction", True)
+
+
+# =============================================================================
+# BULK UPDATE / DELETE
+# =============================================================================
+
+
+def bulk_update(session, model, where, values, synchronize_session="evaluate"):
+    """
+    Update every row of ``model`` matching ``where`` with one statement.
+
+    Args:
+        session: Session to execute in (the caller commits).
+        model: Mapped class, e.g. ``User``.
+        where: Criterion or list of criteria, e.g. ``User.age > 30``.
+            ``None`` updates every row.
+        values: Mapping of attribute name or column to new value or SQL
+            expression, e.g. ``{"age": User.age + 1}``.
+        synchronize_session: ``"evaluate"``, ``"fetch"`` or ``"none"``.
+
+    Returns:
+        int: Number of rows updated.
+    """
+    statement = (
+        update(model)
+        .where(*_criteria(where))
+        .values(values)
+        .execution_options(synchronize_session=_synchronize(synchronize_session))
+    )
+    return session.execute(statement).rowcount
+
+
+def bulk_delete(session, model, where, synchronize_session="evaluate", chunk_size=None, commit_each_chunk=True):
+    """
+    Delete every row of ``model`` matching ``where``.
+
+    Without ``chunk_size`` this is a single ``DELETE ... WHERE`` in the
+    caller's transaction. With ``chunk_size`` the matching primary keys are
+    read ``chunk_size`` at a time and each chunk is deleted with
+    ``WHERE id IN (...)``. By default every chunk is committed, so no single
+    write transaction holds the SQLite lock for long; this ends the caller's
+    transaction, so the session must not have pending changes or writes
+    already flushed or executed in it (commit them first, or pass
+    ``commit_each_chunk=False`` to leave committing to the caller). Each
+    chunk seeks past the last primary key deleted instead of re-reading
+    from the lowest one.
+
+    Args:
+        session: Session to execute in.
+        model: Mapped class, e.g. ``User``.
+        where: Criterion or list of criteria. ``None`` deletes every row.
+        synchronize_session: ``"evaluate"``, ``"fetch"`` or ``"none"``.
+        chunk_size: Rows per chunk, or ``None`` for one statement.
+        commit_each_chunk: Commit after every chunk (only with ``chunk_size``).
+
+    Returns:
+        int: Number of rows deleted.
+
+    Raises:
+        ValueError: If ``chunk_size`` is not positive, or chunks would be
+            committed while the session has pending or uncommitted changes.
+    """
+    synchronize = _synchronize(synchronize_session)
+    criteria = _criteria(where)
+
+    if chunk_size is None:
+        statement = (
+            delete(model)
+            .where(*criteria)
+            .execution_options(synchronize_session=synchronize)
+        )
+        return session.execute(statement).rowcount
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    # Committing a chunk would commit the caller's unrelated work too
+    if commit_each_chunk and (session.new or session.dirty or session.deleted):
+        raise ValueError(
+            "the session has pending changes; commit them first or pass commit_each_chunk=False"
+        )
+    if commit_each_chunk and _has_written(session):
+        raise ValueError(
+            "the session's transaction has uncommitted writes; commit them first or pass commit_each_chunk=False"
+        )
+
+    # Use the mapped attribute (not the Table column) so "evaluate" works
+    mapper = inspect(model)
+    primary_key = getattr(model, mapper.get_property_by_column(mapper.primary_key[0]).key)
+    deleted = 0
+    seek = ()
+    while True:
+        ids = session.scalars(
+            select(primary_key).where(*criteria, *seek).order_by(primary_key).limit(chunk_size)
+        ).all()
+        if not ids:
+            return deleted
+        seek = (primary_key > ids[-1],)
+        statement = (
+            delete(model)
+            .where(primary_key.in_(ids))
+            .execution_options(synchronize_session=synchronize)
+        )
+        deleted += session.execute(statement).rowcount
+        if commit_each_chunk:
+            session.commit()
@@ -0,0 +1,160 @@
+"""
+SQLAlchemy Concurrency Tutorial - Threaded Load Generator for the CRUD Model
+
+Runs a mixed read/write workload against the CRUD ``User`` model from a
+growing number of worker threads. Every operation is its own unit of work
+inside ``session_scope()`` on a thread-local ``scoped_session``, which is
+what makes sharing the engine between threads safe. The printed table
+shows how throughput changes with the worker count.
+
+Key Concepts Covered:
+- ``scoped_session`` + ``session_scope()`` per unit of work
+- Sizing the connection pool to the number of workers
+- WAL mode: concurrent readers alongside a single writer
+- Measuring operations per second under load
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, insert, select, update
+
+from sessions import create_sqlite_engine, make_scoped_session, session_scope
+
+# =============================================================================
+# WORKLOAD
+# =============================================================================
+
+
+def seed_users(engine, users):
+    """Insert ``users`` rows with unique emails."""
+    from models import Base, User
+
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "name": f"User {i}",
+                    "age": 18 + i % 60,
+                    "email": f"user{i}@example.com",
+                    "password": "secret",
+                }
+                for i in range(users)
+            ],
+        )
+
+
+def run_operation(registry, users, write_ratio, rng):
+    """
+    Run one unit of work: a lookup by email, an age-range count or an update.
+
+    Args:
+        registry: ``scoped_session`` registry shared by all workers.
+        users: Number of seeded users.
+        write_ratio: Fraction of operations that write.
+        rng: Per-thread ``random.Random`` instance.
+    """
+    from models import User
+
+    with session_scope(registry) as session:
+        if rng.random() < write_ratio:
+            session.execute(
+                update(User)
+                .where(User.id == rng.randint(1, users))
+                .values(age=User.age + 1)
+                .execution_options(synchronize_session=False)
+            )
+        elif rng.random() < 0.5:
+            email = f"user{rng.randrange(users)}@example.com"
+            session.scalars(select(User).where(User.email == email)).first()
+        else:
+            low = rng.randint(18, 70)
+            session.scalar(select(func.count(User.id)).where(User.age.between(low, low + 5)))
+
+
+def run_load(registry, users, workers, seconds, write_ratio=0.1):
+    """
+    Hammer the database from ``workers`` threads for ``seconds``.
+
+    Args:
+        registry: ``scoped_session`` registry shared by all workers.
+        users: Number of seeded users.
+        workers: Number of worker threads.
+        seconds: Duration of the run.
+        write_ratio: Fraction of operations that write.
+
+    Returns:
+        tuple: ``(operations, errors)`` completed during the run.
+    """
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    totals = {"operations": 0, "errors": 0}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        operations = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                run_operation(registry, users, write_ratio, rng)
+                operations += 1
+            except Exception:
+                errors += 1
+        with lock:
+            totals["operations"] += operations
+            totals["errors"] += errors
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for seed in range(workers):
+            pool.submit(worker, seed)
+    return totals["operations"], totals["errors"]
+
+
+def run_benchmark(users=10_000, worker_counts=(1, 2, 4, 8), seconds=3.0, write_ratio=0.1):
+    """
+    Print throughput for each worker count against a fresh database.
+
+    Args:
+        users: Number of users to seed.
+        worker_counts: Worker thread counts to measure.
+        seconds: Duration of each run.
+        write_ratio: Fraction of operations that write.
+    """
+    print("📊 Threaded Load Generator")
+    print("=" * 50)
+    print(f"   {users} users, {write_ratio:.0%} writes, {seconds:.0f}s per run")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "load.db")
+        engine = create_sqlite_engine(path, pool_size=max(worker_counts), max_overflow=0)
+        seed_users(engine, users)
+        registry = make_scoped_session(engine)
+        baseline = None
+        for workers in worker_counts:
+            operations, errors = run_load(registry, users, workers, seconds, write_ratio)
+            throughput = operations / seconds
+            baseline = baseline or throughput
+            print(
+                f"   {workers:>2} workers: {throughput:>9,.0f} ops/sec "
+                f"({throughput / baseline:.2f}x) errors={errors}"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Threaded load against the CRUD User model")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    run_benchmark(args.users, args.workers, args.seconds, args.write_ratio)
@@ -1,14 +1,23 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String
-from sqlalchemy.orm import declarative_base, sessionmaker
+import sys
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.orm import declarative_base
 
+from counting import RowCounter
+from sessions import create_sqlite_engine, make_scoped_session
 
-engine = create_engine(
-    'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(__file__)), "database.db")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from schema_sync import reset_schema, sync_schema  # noqa: E402
+
+
+engine = create_sqlite_engine(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "database.db")
 )
 
-Session = sessionmaker(bind=engine)
-session = Session()
+# Thread-local registry: `session` is used like a Session, but every thread
+# gets its own. Wrap units of work in `with session_scope(Session):`
+session = make_scoped_session(engine)
+Session = session.session_factory
 
 Base = declarative_base()
 
@@ -24,7 +33,7 @@ class User(BaseModel):
 
     name = Column(String)
     age = Column(Integer)
-    email = Column(String)
+    email = Column(String, unique=True)
     password = Column(String)
 
 
@@ -35,5 +44,16 @@ class User(BaseModel):
             self.email,
         )
         
-Base.metadata.drop_all(engine)
-Base.metadata.create_all(engine)
\ No newline at end of file
+# Exact O(1) user counts from a trigger-maintained row_counts table
+# - Installed with the table; run user_counter.install() on older databases
+user_counter = RowCounter(User)
+user_counter.attach()
+
+# Only run DDL when the models changed since the last start; wiping the
+# data is an explicit reset_database() call
+sync_schema(engine, Base.metadata)
+
+
+def reset_database():
+    """Drop and recreate all tables (deletes every row)."""
+    reset_schema(engine, Base.metadata)
@@ -0,0 +1,214 @@
+"""
+SQLAlchemy Upsert Tutorial - INSERT ... ON CONFLICT Instead of try/except
+
+The CRUD tutorial handles a duplicate email by adding the user, letting the
+commit fail and rolling back. That is a round trip, an exception and a
+rollback for every conflict. SQLite (3.24+) can resolve the conflict itself
+with ``INSERT ... ON CONFLICT (email) DO UPDATE`` or ``DO NOTHING``; this
+module wraps that for batches of plain dictionaries and reports how many
+rows were inserted and how many already existed.
+
+Key Concepts Covered:
+- ``sqlalchemy.dialects.sqlite.insert`` with ``on_conflict_do_update`` /
+  ``on_conflict_do_nothing``
+- The ``excluded`` pseudo-table
+- Batched executemany upserts
+- Counting inserts vs updates without per-row exceptions
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import create_engine, exc, inspect, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+# =============================================================================
+# UPSERT
+# =============================================================================
+
+
+@dataclass
+class UpsertResult:
+    """
+    Outcome of an ``upsert()`` call.
+
+    Attributes:
+        inserted: Rows whose key did not exist yet.
+        updated: Rows whose key existed and were updated (``DO UPDATE``).
+        skipped: Rows whose key existed and were left alone (``DO NOTHING``).
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+    @property
+    def total(self):
+        """int: Number of input rows processed."""
+        return self.inserted + self.updated + self.skipped
+
+
+def _existing_keys(session, model, index_elements, keys):
+    """Return the subset of ``keys`` already present in the table."""
+    columns = [getattr(model, name) for name in index_elements]
+    if len(columns) == 1:
+        found = session.scalars(select(columns[0]).where(columns[0].in_([k[0] for k in keys])))
+        return {(value,) for value in found}
+    rows = session.execute(select(*columns).where(tuple_(*columns).in_(keys)))
+    return {tuple(row) for row in rows}
+
+
+def upsert(session, model, rows, index_elements=("email",), update_columns=None,
+           on_conflict="update", batch_size=1000):
+    """
+    Insert ``rows`` into ``model``'s table, resolving key conflicts in SQL.
+
+    Each batch runs one existence check (``SELECT key ... WHERE key IN``)
+    to count inserts vs updates, then one executemany
+    ``INSERT ... ON CONFLICT`` statement. The caller commits.
+
+    Args:
+        session: Session to execute in.
+        model: Mapped class, e.g. ``User``.
+        rows: Iterable of dictionaries with the same keys.
+        index_elements: Columns of the unique constraint that defines a
+            conflict, e.g. ``("email",)``.
+        update_columns: Columns overwritten on conflict; defaults to every
+            supplied column except the key and primary key columns.
+        on_conflict: ``"update"`` (DO UPDATE) or ``"nothing"`` (DO NOTHING).
+        batch_size: Rows per executemany batch.
+
+    Returns:
+        UpsertResult: Counts of inserted, updated and skipped rows.
+    """
+    if on_conflict not in ("update", "nothing"):
+        raise ValueError("on_conflict must be 'update' or 'nothing'")
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    index_elements = list(index_elements)
+    primary_keys = {column.key for column in inspect(model).primary_key}
+    result = UpsertResult()
+    batch = []
+
+    def flush():
+        keys = [tuple(row[name] for name in index_elements) for row in batch]
+        # NULL never equals NULL: such keys never conflict and always insert
+        comparable = {key for key in keys if None not in key}
+        seen = _existing_keys(session, model, index_elements, list(comparable)) if comparable else set()
+        for key in keys:
+            # Later duplicates inside the same batch hit the row just inserted
+            if key in seen:
+                if on_conflict == "update":
+                    result.updated += 1
+                else:
+                    result.skipped += 1
+            else:
+                result.inserted += 1
+                if None not in key:
+                    seen.add(key)
+
+        statement = sqlite_insert(model)
+        if on_conflict == "nothing":
+            statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+        else:
+            columns = update_columns or [
+                name for name in batch[0] if name not in index_elements and name not in primary_keys
+            ]
+            statement = statement.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={name: statement.excluded[name] for name in columns},
+            )
+        session.execute(statement, batch)
+        batch.clear()
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return result
+
+
+# =============================================================================
+# BENCHMARK: try/except PER ROW VS UPSERT
+# =============================================================================
+
+
+def _try_except_load(session, model, rows):
+    """The tutorial's approach: insert, catch the IntegrityError, update."""
+    inserted = updated = 0
+    for row in rows:
+        try:
+            with session.begin_nested():
+                session.add(model(**row))
+            inserted += 1
+        except exc.IntegrityError:
+            existing = session.scalars(select(model).filter_by(email=row["email"])).one()
+            for name, value in row.items():
+                setattr(existing, name, value)
+            updated += 1
+    return UpsertResult(inserted, updated)
+
+
+def run_benchmark(rows=100_000, naive_rows=10_000, batch_size=1000):
+    """
+    Load ``rows`` users where every other email already exists.
+
+    Args:
+        rows: Number of records to upsert.
+        naive_rows: Number of records for the try/except path (it is slow).
+        batch_size: Rows per upsert batch.
+    """
+    from models import Base, User
+
+    def records(count):
+        return [
+            {
+                "name": f"User {i}",
+                "age": 20 + i % 50,
+                "email": f"user{i}@example.com",
+                "password": "secret",
+            }
+            for i in range(count)
+        ]
+
+    print("📊 Upsert Benchmark")
+    print("=" * 50)
+    for label, count, load in (
+        ("try/except", naive_rows, lambda session, data: _try_except_load(session, User, data)),
+        ("upsert", rows, lambda session, data: upsert(session, User, data, batch_size=batch_size)),
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine("sqlite:///" + os.path.join(directory, "bench.db"))
+            Base.metadata.create_all(engine)
+            with Session(engine) as session:
+                upsert(session, User, records(count)[::2])
+                session.commit()
+                started = time.perf_counter()
+                result = load(session, records(count))
+                session.commit()
+                seconds = time.perf_counter() - started
+            engine.dispose()
+        print(
+            f"   {label:<10} {count} rows: {result.inserted} inserted, "
+            f"{result.updated} updated in {seconds:.2f}s -> {count / seconds:,.0f} rows/sec"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark upserts keyed on User.email")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--naive-rows", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.naive_rows, args.batch_size)
@@ -1,7 +1,12 @@
-from models import session, User
+from models import session, User, reset_database
+from membership import large_not_in
+from query_registry import QueryRegistry, register_user_filters
 import random
 from sqlalchemy import or_, and_, not_
 
+# The demo seeds its own data, so start from empty tables
+reset_database()
+
 # List of names, ages, and emails
 
 names = ['Ahmed', 'Omar', 'Ali', 'Mohammed', 'Khalid', 'Belal']
@@ -127,4 +132,32 @@ print()
 
 
 
+# Reuse the same filters through the query registry
+# The statements are built once; only the values change between calls
+
+registry = register_user_filters(QueryRegistry(), User)
+
+print(*(registry.all(session, "by_age", age=20) or ["No users found"]), sep="\n")
+print('='*50)
+print()
+print('='*50)
+print(*(registry.all(session, "name_or_age", name="Ahmed", age=20) or ["No users found"]), sep="\n")
+print('='*50)
+print()
+print('='*50)
+print(*(registry.all(session, "name_not_in", names=["Ahmed", "Omar"]) or ["No users found"]), sep="\n")
+print('='*50)
+print()
+
+
+
+# NOT IN with a very long list: the values go into a temp table instead of
+# thousands of bound parameters (threshold lowered here to show the switch)
+
+with large_not_in(session, User.name, ["Ahmed", "Omar"], threshold=1) as criterion:
+    print(*(session.query(User).filter(criterion).all() or ["No users found"]), sep="\n")
+print('='*50)
+print()
+
+
 # ------------------------------------------------- THE END -------------------------------------------------
\ No newline at end of file
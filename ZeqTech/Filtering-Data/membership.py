@@ -0,0 +1,243 @@
+"""
+SQLAlchemy Filtering Tutorial - Temp Tables for Huge IN / NOT IN Lists
+
+``User.name.not_in(["Ahmed", "Omar"])`` renders one bound parameter per
+value. With tens of thousands of values that becomes a problem: SQLite
+refuses statements with more than ``SQLITE_MAX_VARIABLE_NUMBER`` parameters
+(32,766 by default, 999 before 3.32), and even below the limit the
+expanding IN is re-rendered and re-parsed for every list size.
+
+The helpers in this module keep short lists as they are and switch
+automatically above a threshold:
+
+- the values are bulk-loaded (``executemany``) into a TEMPORARY table that
+  lives on the session's connection for the duration of the block,
+- ``IN`` becomes ``IN (SELECT value FROM temp)``, which SQLite runs as a
+  join against the temp table's primary key,
+- ``NOT IN`` becomes a ``NOT EXISTS`` anti-join, with an ``IS NOT NULL``
+  guard so NULL rows are excluded exactly as ``NOT IN`` excludes them.
+
+Example::
+
+    with large_not_in(session, User.id, banned_ids) as criterion:
+        users = session.query(User).filter(criterion).all()
+
+The temp table lives on one connection, so do not commit the session
+inside the block: the session then moves to another pooled connection and
+later queries in the block no longer see the table.
+
+Key Concepts Covered:
+- SQLite bound-parameter limits and expanding IN
+- ``TEMPORARY`` tables and connection-scoped state
+- Semi-joins (``IN (SELECT ...)``) and anti-joins (``NOT EXISTS``)
+- NULL semantics of ``NOT IN``
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import Column, MetaData, Table, and_, create_engine, event, exists, false, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# Above ~5,000 values the temp table beats an expanding IN (see the
+# benchmark); SQLite before 3.32 caps statements at 999 parameters
+DEFAULT_THRESHOLD = 5000 if sqlite3.sqlite_version_info >= (3, 32, 0) else 900
+
+_table_ids = itertools.count()
+
+# Connection info key of temp tables to drop on the next checkout
+_PENDING_DROPS = "membership_pending_drops"
+
+# =============================================================================
+# TEMP TABLE MEMBERSHIP
+# =============================================================================
+
+
+def _connection(session):
+    """Return the Connection a Session (or Connection) is using."""
+    connection = getattr(session, "connection", None)
+    return connection() if callable(connection) else session
+
+
+@contextmanager
+def _membership(session, column, values, negate, threshold):
+    distinct = set(values)
+    has_null = None in distinct
+    distinct.discard(None)
+
+    if len(distinct) <= threshold:
+        values = list(distinct) + ([None] if has_null else [])
+        yield column.not_in(values) if negate else column.in_(values)
+        return
+
+    if negate and has_null:
+        # x NOT IN (..., NULL) is never true
+        yield false()
+        return
+
+    connection = _connection(session)
+    table = Table(
+        "_membership_%d" % next(_table_ids),
+        MetaData(),
+        Column("value", column.type, primary_key=True),
+        prefixes=["TEMPORARY"],
+    )
+    table.create(connection)
+    # Shared by every checkout of this DBAPI connection
+    connection_info = connection.connection.info
+    try:
+        # One executemany; the column type's bind processing still applies, and
+        # values it maps to the same stored value (e.g. case folding) are
+        # kept once instead of violating the primary key
+        connection.execute(
+            table.insert().prefix_with("OR IGNORE", dialect="sqlite"), [{"value": value} for value in distinct]
+        )
+        if negate:
+            yield and_(column.is_not(None), ~exists().where(table.c.value == column))
+        else:
+            yield column.in_(select(table.c.value))
+    finally:
+        drop = "DROP TABLE IF EXISTS temp.%s" % table.name
+        if not connection.closed:
+            connection.exec_driver_sql(drop)
+        else:
+            # The session committed inside the block and released the
+            # connection: drop the table when it is checked out again
+            connection_info.setdefault(_PENDING_DROPS, []).append(drop)
+            pool = connection.engine.pool
+            if not event.contains(pool, "checkout", _drop_pending):
+                event.listen(pool, "checkout", _drop_pending)
+
+
+def _drop_pending(dbapi_connection, connection_record, connection_proxy):
+    """Pool ``checkout`` hook dropping temp tables left behind on this connection."""
+    drops = connection_record.info.pop(_PENDING_DROPS, None)
+    if drops:
+        cursor = dbapi_connection.cursor()
+        for drop in drops:
+            cursor.execute(drop)
+        cursor.close()
+
+
+def large_in(session, column, values, threshold=DEFAULT_THRESHOLD):
+    """
+    Build ``column IN (values)`` that scales to any number of values.
+
+    Args:
+        session: Session (or Connection) the query will run on.
+        column: Column or mapped attribute, e.g. ``User.id``.
+        values: Iterable of values (duplicates are removed).
+        threshold: Lists with more distinct values use a temp table.
+
+    Returns:
+        A context manager yielding the criterion; the temp table (if any)
+        is dropped when the block exits.
+    """
+    return _membership(session, column, values, False, threshold)
+
+
+def large_not_in(session, column, values, threshold=DEFAULT_THRESHOLD):
+    """
+    Build ``column NOT IN (values)`` that scales to any number of values.
+
+    Args:
+        session: Session (or Connection) the query will run on.
+        column: Column or mapped attribute, e.g. ``User.id``.
+        values: Iterable of values (duplicates are removed).
+        threshold: Lists with more distinct values use a temp-table anti-join.
+
+    Returns:
+        A context manager yielding the criterion; the temp table (if any)
+        is dropped when the block exits.
+    """
+    return _membership(session, column, values, True, threshold)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def run_benchmark(users=100_000, sizes=(10, 100, 1_000, 10_000, 100_000, 300_000), repeats=3):
+    """
+    Compare expanding IN / NOT IN with the temp-table rewrite by list size.
+
+    Args:
+        users: Rows in the users table.
+        sizes: Numbers of ids in the membership list.
+        repeats: Runs per case (the best one is reported).
+    """
+    from models import Base, User
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "membership.db"))
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                insert(User),
+                [{"name": f"User {i}", "age": 18 + i % 60, "email": f"user{i}@example.com"} for i in range(users)],
+            )
+
+        def best(run):
+            timings = []
+            for _ in range(repeats):
+                with Session(engine) as session:
+                    started = time.perf_counter()
+                    count = run(session)
+                    timings.append(time.perf_counter() - started)
+            return min(timings) * 1000, count
+
+        def plain(negate, ids):
+            def run(session):
+                criterion = User.id.not_in(ids) if negate else User.id.in_(ids)
+                return len(session.scalars(select(User.id).where(criterion)).all())
+            return run
+
+        def temp(negate, ids):
+            helper = large_not_in if negate else large_in
+
+            def run(session):
+                with helper(session, User.id, ids, threshold=0) as criterion:
+                    return len(session.scalars(select(User.id).where(criterion)).all())
+            return run
+
+        print("📊 Large IN / NOT IN Benchmark")
+        print("=" * 50)
+        with engine.connect() as conn:
+            getlimit = getattr(conn.connection.dbapi_connection, "getlimit", None)  # Python 3.11+
+            limit = getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) if getlimit else "unknown"
+        print(f"   {users:,} users, best of {repeats}, ms (variable limit {limit})")
+        print(f"   {'values':>8} {'op':<7}{'expanding':>11}{'temp table':>12}")
+        for size in sizes:
+            ids = rng.sample(range(1, users * 2), size)
+            for negate in (False, True):
+                label = "NOT IN" if negate else "IN"
+                try:
+                    plain_ms, expected = best(plain(negate, ids))
+                    plain_text = f"{plain_ms:>11.1f}"
+                except OperationalError:
+                    plain_text, expected = f"{'too many':>11}", None
+                temp_ms, count = best(temp(negate, ids))
+                assert expected is None or count == expected
+                print(f"   {size:>8,} {label:<7}{plain_text}{temp_ms:>12.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark temp-table IN / NOT IN rewrites")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 100_000, 300_000])
+    args = parser.parse_args()
+
+    run_benchmark(args.users, args.sizes)
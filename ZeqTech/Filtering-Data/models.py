@@ -1,6 +1,10 @@
 import os
+import sys
 from sqlalchemy import create_engine, Column, Integer, String
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from schema_sync import reset_schema, sync_schema  # noqa: E402
 
 
 engine = create_engine(
@@ -8,7 +12,8 @@ engine = create_engine(
 )
 
 Session = sessionmaker(bind=engine)
-session = Session()
+# One session per thread instead of a single shared Session()
+session = scoped_session(Session)
 
 Base = declarative_base()
 
@@ -35,5 +40,11 @@ class User(BaseModel):
             self.email,
         )
         
-Base.metadata.drop_all(engine)
-Base.metadata.create_all(engine)
\ No newline at end of file
+# Only run DDL when the models changed since the last start; wiping the
+# data is an explicit reset_database() call
+sync_schema(engine, Base.metadata)
+
+
+def reset_database():
+    """Drop and recreate all tables (deletes every row)."""
+    reset_schema(engine, Base.metadata)
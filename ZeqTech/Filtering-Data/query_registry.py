@@ -0,0 +1,292 @@
+"""
+SQLAlchemy Filtering Tutorial - Named, Pre-Built Parameterized Queries
+
+``session.query(User).filter_by(age=20).all()`` rebuilds the same query
+object on every call: new ``Query``, new ``BinaryExpression``, new cache
+key. SQLAlchemy then finds the compiled SQL in its statement cache, but the
+Python work to get there is repeated every time. The filters in
+``app.py`` only ever change their literals, so this module builds each
+shape once:
+
+- statements use ``bindparam()`` placeholders (or ``lambda_stmt`` closures)
+  and are registered under a name,
+- ``execute(session, query_name, **params)`` only binds new values, so the
+  memoized cache key and compiled SQL are reused,
+- an ``after_cursor_execute`` hook reads each execution's cache status so
+  the registry can report compile-cache hit ratios per query.
+
+Key Concepts Covered:
+- ``bindparam()`` and expanding ``bindparam`` for IN lists
+- ``lambda_stmt`` and the compiled statement cache
+- ``ExecutionContext.cache_hit`` statistics
+- Measuring per-call Python overhead
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from sqlalchemy import and_, bindparam, create_engine, event, lambda_stmt, not_, or_, select
+from sqlalchemy.engine import default
+from sqlalchemy.orm import Session
+
+# =============================================================================
+# QUERY REGISTRY
+# =============================================================================
+
+
+class QueryRegistry:
+    """
+    Named statements built once and executed with new parameters.
+
+    Example::
+
+        registry = QueryRegistry()
+        registry.register("by_age", select(User).where(User.age == bindparam("age")))
+        registry.all(session, "by_age", age=20)
+
+    Parameter values are passed as keywords, so a bind parameter may itself
+    be called ``name``.
+    """
+
+    def __init__(self):
+        self._statements = {}
+        self._stats = defaultdict(lambda: {"calls": 0, "hits": 0, "misses": 0})
+
+    def register(self, name, statement):
+        """
+        Register a statement under ``name``.
+
+        Args:
+            name: Unique query name.
+            statement: ``select()`` with ``bindparam()`` placeholders, or a
+                ``lambda_stmt``.
+
+        Returns:
+            The registered statement (tagged with its name).
+        """
+        if name in self._statements:
+            raise ValueError("query %r is already registered" % name)
+        # Execution options are not part of the cache key
+        statement = statement.execution_options(registry_query=name)
+        self._statements[name] = statement
+        return statement
+
+    def query(self, name):
+        """
+        Decorator form of ``register()`` for zero-argument builder functions.
+
+        Args:
+            name: Unique query name.
+
+        Returns:
+            callable: Decorator that registers ``builder()``'s statement.
+        """
+
+        def decorator(builder):
+            return self.register(name, builder())
+
+        return decorator
+
+    def __contains__(self, name):
+        return name in self._statements
+
+    def execute(self, session, query_name, **params):
+        """
+        Execute a registered query.
+
+        Args:
+            session: Session (or connection) to execute on.
+            query_name: Registered query name.
+            **params: Values for the statement's bind parameters.
+
+        Returns:
+            Result: The execution result.
+        """
+        try:
+            statement = self._statements[query_name]
+        except KeyError:
+            raise KeyError("no query registered as %r" % query_name) from None
+        return session.execute(statement, params)
+
+    def all(self, session, query_name, **params):
+        """Execute a registered query and return its entities as a list."""
+        return self.execute(session, query_name, **params).scalars().all()
+
+    # ---------------------------------------------------------------------
+    # Cache statistics
+    # ---------------------------------------------------------------------
+
+    def attach(self, engine):
+        """
+        Record the compiled-cache status of registered queries run on ``engine``.
+
+        Args:
+            engine: Engine to listen on.
+        """
+        event.listen(engine, "after_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        name = context.execution_options.get("registry_query")
+        if name is None:
+            return
+        stats = self._stats[name]
+        stats["calls"] += 1
+        if context.cache_hit is default.CACHE_HIT:
+            stats["hits"] += 1
+        elif context.cache_hit is default.CACHE_MISS:
+            stats["misses"] += 1
+
+    def stats(self):
+        """
+        Compile-cache statistics per registered query.
+
+        Returns:
+            dict: ``{name: {"calls", "hits", "misses", "hit_ratio"}}``.
+        """
+        report = {}
+        for name, stats in self._stats.items():
+            lookups = stats["hits"] + stats["misses"]
+            report[name] = dict(stats, hit_ratio=stats["hits"] / lookups if lookups else 0.0)
+        return report
+
+
+# =============================================================================
+# THE FILTERING TUTORIAL'S QUERIES
+# =============================================================================
+
+
+def register_user_filters(registry, User):
+    """
+    Register the filter shapes used by ``app.py``.
+
+    Args:
+        registry: ``QueryRegistry`` to fill.
+        User: The ``User`` model.
+
+    Returns:
+        QueryRegistry: ``registry``.
+    """
+    name, age = bindparam("name"), bindparam("age")
+    users = select(User)
+    registry.register("by_age", users.where(User.age == age))
+    registry.register("by_name", users.where(User.name == name))
+    registry.register("by_name_and_age", users.where(User.name == name, User.age == age))
+    # lambda_stmt caches the statement by the lambda's code location
+    registry.register("min_age", lambda_stmt(lambda: select(User).where(User.age >= bindparam("min_age"))))
+    registry.register("name_or_age", users.where(or_(User.name == name, User.age == age)))
+    registry.register("name_and_age", users.where(and_(User.name == name, User.age == age)))
+    registry.register("not_name", users.where(not_(User.name == name)))
+    registry.register(
+        "name_not_in", users.where(User.name.not_in(bindparam("names", expanding=True)))
+    )
+    registry.register(
+        "combined",
+        users.where(
+            or_(User.name == name, User.age == age),
+            and_(User.name == name, User.age == age),
+            not_(User.name == bindparam("excluded")),
+        ),
+    )
+    return registry
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+NAMES = ["Ahmed", "Omar", "Ali", "Mohammed", "Khalid", "Belal"]
+AGES = [30, 25, 20, 35, 40, 20]
+
+
+def benchmark_cases(User):
+    """
+    Pair each ad-hoc ``session.query()`` filter with its registered version.
+
+    Args:
+        User: The ``User`` model.
+
+    Returns:
+        list: ``(name, adhoc(session, i), params(i))`` tuples.
+    """
+
+    def pick(i):
+        return NAMES[i % len(NAMES)], AGES[i % len(AGES)]
+
+    return [
+        ("by_age", lambda s, i: s.query(User).filter_by(age=pick(i)[1]).all(),
+         lambda i: {"age": pick(i)[1]}),
+        ("by_name", lambda s, i: s.query(User).filter_by(name=pick(i)[0]).all(),
+         lambda i: {"name": pick(i)[0]}),
+        ("by_name_and_age", lambda s, i: s.query(User).filter_by(name=pick(i)[0], age=pick(i)[1]).all(),
+         lambda i: {"name": pick(i)[0], "age": pick(i)[1]}),
+        ("name_or_age", lambda s, i: s.query(User).filter(or_(User.name == pick(i)[0], User.age == pick(i)[1])).all(),
+         lambda i: {"name": pick(i)[0], "age": pick(i)[1]}),
+        ("min_age", lambda s, i: s.query(User).filter(User.age >= pick(i)[1]).all(),
+         lambda i: {"min_age": pick(i)[1]}),
+        ("not_name", lambda s, i: s.query(User).filter(not_(User.name == pick(i)[0])).all(),
+         lambda i: {"name": pick(i)[0]}),
+        ("name_not_in", lambda s, i: s.query(User).filter(User.name.not_in([pick(i)[0], "Omar"])).all(),
+         lambda i: {"names": [pick(i)[0], "Omar"]}),
+    ]
+
+
+def run_benchmark(executions=100_000, users=26):
+    """
+    Time ``executions`` calls of each filter with and without the registry.
+
+    The table is tiny on purpose so that per-call Python overhead, not
+    SQLite, dominates.
+
+    Args:
+        executions: Calls per filter and approach.
+        users: Rows in the users table.
+    """
+    from models import Base, User
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "registry.db"))
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add_all(
+                [User(name=NAMES[i % 6], age=AGES[i % 6], email=f"user{i}@example.com") for i in range(users)]
+            )
+            session.commit()
+
+        registry = register_user_filters(QueryRegistry(), User)
+        registry.attach(engine)
+
+        print("📊 Query Registry Benchmark")
+        print("=" * 50)
+        print(f"   {executions:,} executions per filter, µs per call")
+        print(f"   {'filter':<18}{'ad hoc':>10}{'registry':>10}{'speedup':>9}")
+        with Session(engine) as session:
+            for name, adhoc, params in benchmark_cases(User):
+                started = time.perf_counter()
+                for i in range(executions):
+                    adhoc(session, i)
+                adhoc_us = (time.perf_counter() - started) / executions * 1e6
+
+                started = time.perf_counter()
+                for i in range(executions):
+                    registry.all(session, name, **params(i))
+                registry_us = (time.perf_counter() - started) / executions * 1e6
+                print(f"   {name:<18}{adhoc_us:>10.1f}{registry_us:>10.1f}{adhoc_us / registry_us:>8.2f}x")
+
+        print("\n   Compiled cache hit ratios:")
+        for name, stats in registry.stats().items():
+            print(f"   {name:<18}{stats['hit_ratio']:>8.2%}  ({stats['calls']:,} calls)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the named query registry")
+    parser.add_argument("--executions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    run_benchmark(args.executions)
@@ -0,0 +1,421 @@
+"""
+SQLAlchemy Filtering Tutorial - Vectorized In-Memory Filters with NumPy
+
+When the same snapshot of ``users`` is filtered dozens of times, sending
+every ``or_``/``and_``/``not_`` predicate back to SQLite repeats the same
+table scan. This module loads the columns once into NumPy arrays and
+evaluates the *same* SQLAlchemy expressions as vectorized mask operations:
+
+- numeric columns become ``int64``/``float64`` arrays, strings are
+  dictionary-encoded into sorted integer codes (so ``==``, ``<``, ``>=``
+  and ``in_`` become integer comparisons),
+- every column keeps a validity mask, and predicates are evaluated with
+  SQL's three-valued logic (a ``(true, false)`` mask pair), so ``NULL``
+  rows behave exactly as they do in ``WHERE``,
+- ``ids()`` returns the matching primary keys and ``rows()`` the matching
+  column values, ready for analytics code.
+
+Supported: ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``in_``,
+``not_in``, ``is_(None)``, ``is_not(None)``, ``and_``, ``or_``, ``not_``.
+Anything else (``like()``, functions, column-to-column comparisons)
+raises ``UnsupportedExpression``, a ``ValueError``.
+
+NumPy is an optional dependency: ``pip install sqlalchemy-learn[analytics]``.
+
+Key Concepts Covered:
+- Walking SQLAlchemy expression trees (``BinaryExpression``,
+  ``BooleanClauseList``, ``UnaryExpression``)
+- Dictionary encoding of string columns
+- SQL three-valued logic with boolean masks
+- Columnar snapshots vs repeated table scans
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import operator
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from sqlalchemy import and_, create_engine, inspect, not_, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import elements, operators
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class UnsupportedExpression(ValueError):
+    """Raised for expressions a ``VectorSnapshot`` cannot evaluate (use SQL for those)."""
+
+
+# =============================================================================
+# COLUMN STORAGE
+# =============================================================================
+
+_COMPARISONS = {
+    operators.eq: operator.eq,
+    operators.ne: operator.ne,
+    operators.lt: operator.lt,
+    operators.le: operator.le,
+    operators.gt: operator.gt,
+    operators.ge: operator.ge,
+}
+
+# a OP b  ==  b FLIPPED[OP] a
+_FLIPPED = {
+    operators.eq: operators.eq,
+    operators.ne: operators.ne,
+    operators.lt: operators.gt,
+    operators.le: operators.ge,
+    operators.gt: operators.lt,
+    operators.ge: operators.le,
+}
+
+
+class _Column:
+    """One loaded column: values, validity mask and (for strings) categories."""
+
+    def __init__(self, values):
+        self.valid = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+        sample = next((value for value in values if value is not None), None)
+        self.categories = None
+        if isinstance(sample, str):
+            # Dictionary-encode, then renumber so codes follow string order
+            lookup = {}
+            codes = np.fromiter(
+                (lookup.setdefault(value, len(lookup)) if value is not None else -1 for value in values),
+                dtype=np.int64,
+                count=len(values),
+            )
+            self.categories = np.array(sorted(lookup), dtype=object)
+            rank = np.empty(len(lookup) + 1, dtype=np.int64)
+            rank[[lookup[value] for value in self.categories]] = np.arange(len(lookup))
+            rank[-1] = -1
+            self.values = rank[codes]
+        elif self.valid.all():
+            # No NULLs: let NumPy convert the list in C
+            self.values = np.array(values, dtype=np.float64 if isinstance(sample, float) else np.int64)
+        else:
+            dtype = np.float64 if isinstance(sample, float) else np.int64
+            self.values = np.fromiter(
+                (value if value is not None else 0 for value in values), dtype=dtype, count=len(values)
+            )
+
+    def encode(self, value):
+        """Translate a literal into the column's value space (None if absent)."""
+        if self.categories is None:
+            return value
+        position = int(np.searchsorted(self.categories, value))
+        if position < len(self.categories) and self.categories[position] == value:
+            return position
+        return None
+
+    def compare(self, op, value):
+        """Return the mask of rows where ``column OP value`` is true."""
+        if self.categories is None:
+            return _COMPARISONS[op](self.values, value)
+        # Codes are ranks, so an absent literal compares by insertion point
+        left = int(np.searchsorted(self.categories, value, side="left"))
+        right = int(np.searchsorted(self.categories, value, side="right"))
+        if op is operators.eq:
+            return self.values == left if right > left else np.zeros(len(self.values), dtype=bool)
+        if op is operators.ne:
+            return self.values != left if right > left else np.ones(len(self.values), dtype=bool)
+        if op is operators.lt:
+            return self.values < left
+        if op is operators.le:
+            return self.values < right
+        if op is operators.gt:
+            return self.values >= right
+        return self.values >= left
+
+    def isin(self, values):
+        """Return the mask of rows whose value is one of ``values``."""
+        encoded = [self.encode(value) for value in values]
+        return np.isin(self.values, [value for value in encoded if value is not None])
+
+    def decode(self, positions):
+        """Return the original values at ``positions``."""
+        if self.categories is None:
+            values = self.values[positions].astype(object)
+        else:
+            values = self.categories[np.maximum(self.values[positions], 0)]
+        values[~self.valid[positions]] = None
+        return values
+
+
+# =============================================================================
+# VECTORIZED SNAPSHOT
+# =============================================================================
+
+
+class VectorSnapshot:
+    """
+    A columnar, read-only snapshot of one table evaluated with NumPy.
+
+    Args:
+        model: Mapped class the columns belong to.
+        columns: ``{attribute_name: list_of_values}`` including the primary key.
+    """
+
+    def __init__(self, model, columns):
+        if np is None:
+            raise ImportError("VectorSnapshot requires numpy (pip install numpy)")
+        self.model = model
+        self.mapper = inspect(model)
+        self.pk = self.mapper.get_property_by_column(self.mapper.primary_key[0]).key
+        self.columns = {name: _Column(values) for name, values in columns.items()}
+        self.ids_array = self.columns[self.pk].values
+        # Column key -> attribute name (they differ for Column("db_name", ...))
+        self._names = {prop.columns[0].key: prop.key for prop in self.mapper.column_attrs}
+
+    @classmethod
+    def load(cls, session, model, attributes=None, batch_size=100_000):
+        """
+        Read the table once into a snapshot.
+
+        Args:
+            session: Session (or connection) to read with.
+            model: Mapped class to load.
+            attributes: Attribute names to load (default: all columns).
+            batch_size: Rows fetched per partition.
+
+        Returns:
+            VectorSnapshot: The loaded snapshot.
+        """
+        mapper = inspect(model)
+        pk = mapper.get_property_by_column(mapper.primary_key[0]).key
+        names = list(attributes or [prop.key for prop in mapper.column_attrs])
+        if pk not in names:
+            names.insert(0, pk)
+        columns = {name: [] for name in names}
+        statement = select(*(getattr(model, name) for name in names)).order_by(getattr(model, pk))
+        result = session.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            for name, values in zip(names, zip(*partition)):
+                columns[name].extend(values)
+        return cls(model, columns)
+
+    def __len__(self):
+        return len(self.ids_array)
+
+    # ---------------------------------------------------------------------
+    # Evaluation
+    # ---------------------------------------------------------------------
+
+    def mask(self, *criteria):
+        """
+        Evaluate ``criteria`` (ANDed, like ``filter()``) into a boolean mask.
+
+        Args:
+            *criteria: SQLAlchemy boolean expressions on the model's columns.
+
+        Returns:
+            numpy.ndarray: True for rows where the WHERE clause is true.
+
+        Raises:
+            UnsupportedExpression: If a criterion cannot be vectorized.
+        """
+        if not criteria:
+            return np.ones(len(self), dtype=bool)
+        true, _ = self._evaluate(and_(*criteria) if len(criteria) > 1 else criteria[0])
+        return true
+
+    def ids(self, *criteria):
+        """Return the primary keys of matching rows (in primary key order)."""
+        return self.ids_array[self.mask(*criteria)]
+
+    def count(self, *criteria):
+        """Return the number of matching rows."""
+        return int(np.count_nonzero(self.mask(*criteria)))
+
+    def rows(self, *criteria, attributes=None):
+        """
+        Return the matching rows column-wise.
+
+        Args:
+            *criteria: SQLAlchemy boolean expressions.
+            attributes: Attribute names to return (default: all loaded).
+
+        Returns:
+            dict: ``{attribute: numpy object array}`` for matching rows.
+        """
+        positions = np.flatnonzero(self.mask(*criteria))
+        return {
+            name: self.columns[name].decode(positions)
+            for name in (attributes or self.columns)
+        }
+
+    def _evaluate(self, clause):
+        """Return ``(true, false)`` masks; rows in neither are NULL/unknown."""
+        if isinstance(clause, elements.Grouping):
+            return self._evaluate(clause.element)
+        if isinstance(clause, elements.BooleanClauseList):
+            parts = [self._evaluate(c) for c in clause.clauses]
+            if clause.operator is operators.and_:
+                return (
+                    np.logical_and.reduce([t for t, _ in parts]),
+                    np.logical_or.reduce([f for _, f in parts]),
+                )
+            if clause.operator is operators.or_:
+                return (
+                    np.logical_or.reduce([t for t, _ in parts]),
+                    np.logical_and.reduce([f for _, f in parts]),
+                )
+        if isinstance(clause, elements.UnaryExpression) and clause.operator is operators.inv:
+            true, false = self._evaluate(clause.element)
+            return false, true
+        if isinstance(clause, elements.True_):
+            return np.ones(len(self), dtype=bool), np.zeros(len(self), dtype=bool)
+        if isinstance(clause, elements.False_):
+            return np.zeros(len(self), dtype=bool), np.ones(len(self), dtype=bool)
+        if isinstance(clause, elements.BinaryExpression):
+            return self._evaluate_binary(clause)
+        raise UnsupportedExpression("cannot vectorize %r" % str(clause))
+
+    def _column(self, element):
+        if isinstance(element, elements.ColumnElement) and getattr(element, "table", None) is not None:
+            name = self._names.get(element.key)
+            if name in self.columns:
+                return self.columns[name]
+        return None
+
+    def _evaluate_binary(self, clause):
+        op = clause.operator
+        column = self._column(clause.left)
+        other = clause.right
+        if column is None and op in _FLIPPED:
+            column, other, op = self._column(clause.right), clause.left, _FLIPPED[op]
+        if column is None:
+            raise UnsupportedExpression("cannot vectorize %r" % str(clause))
+
+        valid = column.valid
+        if op in (operators.is_, operators.is_not):
+            if not isinstance(other, elements.Null):
+                raise UnsupportedExpression("only IS [NOT] NULL is supported")
+            # IS [NOT] NULL is never unknown
+            return (~valid, valid) if op is operators.is_ else (valid, ~valid)
+
+        if not isinstance(other, elements.BindParameter):
+            raise UnsupportedExpression("cannot vectorize %r" % str(clause))
+        value = other.effective_value
+
+        if op in (operators.in_op, operators.not_in_op):
+            values = list(value)
+            if not values:
+                # Empty IN is false and empty NOT IN is true, even for NULL rows
+                empty = np.zeros(len(self), dtype=bool)
+                return (empty, ~empty) if op is operators.in_op else (~empty, empty)
+            has_null = any(v is None for v in values)
+            matched = column.isin([v for v in values if v is not None]) & valid
+            # A NULL in the list makes non-matches unknown rather than false
+            unmatched = valid & ~matched if not has_null else np.zeros(len(self), dtype=bool)
+            return (matched, unmatched) if op is operators.in_op else (unmatched, matched)
+
+        if op not in _COMPARISONS:
+            raise UnsupportedExpression("operator %s is not supported" % getattr(op, "__name__", op))
+        if value is None:
+            # column = NULL is unknown for every row
+            unknown = np.zeros(len(self), dtype=bool)
+            return unknown, unknown
+        true = column.compare(op, value) & valid
+        return true, valid & ~true
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+NAMES = ["Ahmed", "Omar", "Ali", "Mohammed", "Khalid", "Belal"]
+AGES = [30, 25, 20, 35, 40, 20]
+
+
+def benchmark_predicates(User):
+    """Return the ``(label, criterion)`` pairs from ``app.py``."""
+    return [
+        ("age == 20", User.age == 20),
+        ("name == Ahmed", User.name == "Ahmed"),
+        ("name & age", and_(User.name == "Ahmed", User.age == 20)),
+        ("age >= 20", User.age >= 20),
+        ("or_", or_(User.name == "Ahmed", User.age == 20)),
+        ("not_", not_(User.name == "Ahmed")),
+        ("not_in", User.name.not_in(["Ahmed", "Omar"])),
+        (
+            "or_ + and_ + not_",
+            and_(
+                or_(User.name == "Ahmed", User.age == 20),
+                and_(User.name == "Ahmed", User.age == 20),
+                not_(User.name == "Mohammed"),
+            ),
+        ),
+    ]
+
+
+def seed(path, rows, batch_size=500_000):
+    """Fill a users table quickly through the sqlite3 driver."""
+    from models import Base
+
+    engine = create_engine("sqlite:///" + path)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    rng = random.Random(42)
+    connection = sqlite3.connect(path)
+    for start in range(0, rows, batch_size):
+        connection.executemany(
+            "INSERT INTO users (name, age, email) VALUES (?, ?, ?)",
+            (
+                (rng.choice(NAMES), rng.choice(AGES), f"user{i}@example.com")
+                for i in range(start, min(start + batch_size, rows))
+            ),
+        )
+        connection.commit()
+    connection.close()
+
+
+def run_benchmark(sizes=(100_000, 1_000_000, 10_000_000)):
+    """
+    Time every predicate in SQL and on the vectorized snapshot.
+
+    Args:
+        sizes: Table sizes to measure.
+    """
+    from models import User
+
+    print("📊 Vectorized Filter Benchmark")
+    print("=" * 50)
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "vector.db")
+            seed(path, rows)
+            engine = create_engine("sqlite:///" + path)
+            with Session(engine) as session:
+                started = time.perf_counter()
+                snapshot = VectorSnapshot.load(session, User, ["name", "age"])
+                load_seconds = time.perf_counter() - started
+                print(f"\n   {rows:,} users (snapshot loaded in {load_seconds:.2f}s)")
+                print(f"   {'predicate':<20}{'SQL ms':>10}{'NumPy ms':>10}{'speedup':>9}")
+                for label, criterion in benchmark_predicates(User):
+                    started = time.perf_counter()
+                    expected = session.execute(select(User.id).where(criterion)).scalars().all()
+                    sql_ms = (time.perf_counter() - started) * 1000
+                    started = time.perf_counter()
+                    ids = snapshot.ids(criterion)
+                    numpy_ms = (time.perf_counter() - started) * 1000
+                    assert len(ids) == len(expected), label
+                    print(f"   {label:<20}{sql_ms:>10.1f}{numpy_ms:>10.1f}{sql_ms / numpy_ms:>8.1f}x")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vectorized filters against SQL")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes)
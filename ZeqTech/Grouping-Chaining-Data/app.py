@@ -1,7 +1,11 @@
-from models import session, User
+from models import age_rollup, session, User, reset_database
+from chunked_aggregate import streaming_aggregate
 import random
 from sqlalchemy import func
 
+# The demo seeds its own data, so start from empty tables
+reset_database()
+
 # List of names, ages, and emails
 
 names = ['Ahmed', 'Omar', 'Ali', 'Mohammed', 'Khalid', 'Belal']
@@ -44,4 +48,25 @@ print(*session.query(
     all()
     , sep='\n')
 
+
+print('-'*50)
+print()
+
+# The same histogram from the trigger-maintained rollup: the age filters
+# are rewritten against users_age_counts instead of scanning users
+
+print(*age_rollup.histogram(session, User.age > 20, User.age < 50), sep='\n')
+print(f"Rollup consistent: {not age_rollup.check_consistency(session)}")
+
+
+print('-'*50)
+print()
+
+# Aggregating in primary-key chunks: count, sum, min, max and mean of the
+# ids per age, folded in Python one id window at a time
+
+groups = streaming_aggregate(session, User.id, group_by=User.age, criteria=[User.age > 20, User.age < 50])
+for age, partial in sorted(groups.items()):
+    print(age, partial.count, partial.minimum, partial.maximum, round(partial.mean, 1))
+
 # ------------------------------------------------- THE END -------------------------------------------------
\ No newline at end of file
@@ -0,0 +1,412 @@
+"""
+SQLAlchemy Grouping Tutorial - Chunked, Parallel Streaming Aggregation
+
+``session.query(User.age, func.count(User.id)).group_by(User.age)`` makes
+SQLite sort or hash the whole table in one statement. On very large tables
+that means one long read transaction and a temp B-tree that can spill to
+disk. This module aggregates in chunks instead:
+
+- rows are read in primary-key chunks that seek past the last id seen
+  (``id > :last ORDER BY id LIMIT n``), each a short statement that walks
+  the rowid B-tree in order and is fetched with ``yield_per``, so neither
+  SQLite nor Python holds more than a batch and gaps in the ids cost
+  nothing,
+- every chunk is folded into per-group ``Partial`` aggregates (count, sum,
+  min, max and, through count and sum, mean). Partials are mergeable, so
+- the id range can be split across a process pool and the per-process
+  partials merged at the end.
+
+Example::
+
+    groups = streaming_aggregate(session, User.id, group_by=User.age,
+                                 criteria=[User.age > 20, User.age < 50])
+    groups[30].count, groups[30].mean
+
+    groups = parallel_aggregate(DATABASE_URL, User.id, group_by=User.age, workers=4)
+
+Key Concepts Covered:
+- Primary-key range chunking and ``yield_per``
+- Mergeable (associative) partial aggregates
+- ``ProcessPoolExecutor`` fan-out by id range
+- Passing queries to worker processes as picklable specs
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy import column, create_engine, func, select, table, text
+from sqlalchemy.orm import Session
+
+# =============================================================================
+# PARTIAL AGGREGATES
+# =============================================================================
+
+
+@dataclass
+class Partial:
+    """
+    Count, sum, min and max of the non-NULL values seen so far.
+
+    NULL values are skipped, as SQL aggregates skip them.
+    """
+
+    count: int = 0
+    total: int = 0
+    minimum: Optional[object] = None
+    maximum: Optional[object] = None
+
+    def add(self, value):
+        """Fold one value into the aggregate."""
+        if value is None:
+            return
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        """Fold another partial into this one and return self."""
+        self.count += other.count
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                if self.minimum is None or value < self.minimum:
+                    self.minimum = value
+                if self.maximum is None or value > self.maximum:
+                    self.maximum = value
+        return self
+
+    @property
+    def mean(self):
+        """Average of the values, or None when there were none."""
+        return self.total / self.count if self.count else None
+
+
+def merge_results(results):
+    """
+    Merge several ``{group: Partial}`` results into one.
+
+    Args:
+        results: Iterable of dicts as returned by ``streaming_aggregate()``.
+
+    Returns:
+        dict: ``{group: Partial}`` over all inputs (new objects; the inputs
+        are left unchanged).
+    """
+    merged = {}
+    for result in results:
+        for group, partial in result.items():
+            target = merged.get(group)
+            if target is None:
+                target = merged[group] = Partial()
+            target.merge(partial)
+    return merged
+
+
+# =============================================================================
+# CHUNKED AGGREGATION
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class AggregateSpec:
+    """
+    Picklable description of one aggregation: plain names and SQL text.
+
+    Build it with ``AggregateSpec.build()`` from mapped attributes.
+    """
+
+    table: str
+    id_column: str
+    value_column: str
+    group_columns: Tuple[str, ...] = ()
+    where: Tuple[str, ...] = ()
+
+    @classmethod
+    def build(cls, value, group_by=None, criteria=(), dialect=None):
+        """
+        Describe aggregating ``value`` grouped by ``group_by``.
+
+        Args:
+            value: Mapped attribute or ``Column`` to aggregate, e.g. ``User.id``.
+            group_by: Attribute or list of attributes to group by (optional).
+            criteria: Filters on the same table, e.g. ``[User.age > 20]``.
+            dialect: Dialect used to render the filters (default: generic).
+
+        Returns:
+            AggregateSpec: The spec.
+        """
+        value = getattr(value, "expression", value)
+        source = value.table
+        if group_by is None:
+            group_by = []
+        elif not isinstance(group_by, (list, tuple)):
+            group_by = [group_by]
+        groups = [getattr(group, "expression", group) for group in group_by]
+        for element in groups:
+            if element.table is not source:
+                raise ValueError("group_by columns must belong to %s" % source.name)
+        if len(source.primary_key.columns) != 1:
+            raise ValueError("%s needs a single-column primary key to be chunked" % source.name)
+        # Filters are rendered with their values inlined so they can be sent
+        # to other processes as text
+        where = tuple(
+            str(criterion.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            for criterion in criteria
+        )
+        return cls(
+            table=source.name,
+            id_column=list(source.primary_key.columns)[0].name,
+            value_column=value.name,
+            group_columns=tuple(element.name for element in groups),
+            where=where,
+        )
+
+    def statement(self, low, high, limit, after=None):
+        """
+        SELECT the group key, value and id of the next ``limit`` rows in id order.
+
+        Rows have ``low <= id < high`` and, after the first chunk, ``id > after``.
+        """
+        source = table(self.table, column(self.id_column), column(self.value_column),
+                       *(column(name) for name in self.group_columns))
+        ident = source.c[self.id_column]
+        start = ident >= low if after is None else ident > after
+        return (
+            select(*(source.c[name] for name in self.group_columns), source.c[self.value_column], ident)
+            .where(start, ident < high, *(text(clause) for clause in self.where))
+            .order_by(ident)
+            .limit(limit)
+        )
+
+    def id_bounds(self, connection):
+        """Return ``(min(id), max(id) + 1)``, or None for an empty table."""
+        ident = column(self.id_column)
+        low, high = connection.execute(
+            select(func.min(ident), func.max(ident)).select_from(table(self.table))
+        ).one()
+        return None if low is None else (low, high + 1)
+
+
+def aggregate_range(connection, spec, low, high, chunk_size=50_000, batch_size=1000):
+    """
+    Aggregate the rows with ``low <= id < high``, one chunk of rows at a time.
+
+    Args:
+        connection: ``Connection`` or ``Session``.
+        spec: ``AggregateSpec`` to evaluate.
+        low: First id (inclusive).
+        high: Last id (exclusive).
+        chunk_size: Rows per chunk (one short statement each).
+        batch_size: Rows fetched per ``yield_per`` batch.
+
+    Returns:
+        dict: ``{group: Partial}``; groups are tuples of the group_by values,
+        or a single value when grouping by one column (``None`` without
+        group_by).
+    """
+    if chunk_size < 1 or batch_size < 1:
+        raise ValueError("chunk_size and batch_size must be positive integers")
+    width = len(spec.group_columns)
+    partials = {}
+    last = None
+    while True:
+        statement = spec.statement(low, high, chunk_size, after=last)
+        result = connection.execute(statement.execution_options(yield_per=batch_size))
+        rows = 0
+        try:
+            for partition in result.partitions():
+                rows += len(partition)
+                last = partition[-1][-1]
+                for row in partition:
+                    if width == 0:
+                        group = None
+                    elif width == 1:
+                        group = row[0]
+                    else:
+                        group = tuple(row[:width])
+                    partial = partials.get(group)
+                    if partial is None:
+                        partial = partials[group] = Partial()
+                    partial.add(row[width])
+        finally:
+            result.close()
+        if rows < chunk_size or last >= high - 1:
+            return partials
+
+
+def streaming_aggregate(session, value, group_by=None, criteria=(), chunk_size=50_000, batch_size=1000):
+    """
+    Aggregate ``value`` per group by streaming the table in id-ordered chunks.
+
+    This is the chunked equivalent of
+    ``select(group_by, func.count(value), func.sum(value), func.min(value),
+    func.max(value), func.avg(value)).where(*criteria).group_by(group_by)``.
+
+    Args:
+        session: ``Session`` or ``Connection``.
+        value: Attribute to aggregate, e.g. ``User.id``.
+        group_by: Attribute or list of attributes to group by (optional).
+        criteria: Filters on the same table.
+        chunk_size: Rows per chunk (one short statement each).
+        batch_size: Rows fetched per ``yield_per`` batch.
+
+    Returns:
+        dict: ``{group: Partial}``.
+    """
+    bind = session.get_bind() if hasattr(session, "get_bind") else session
+    spec = AggregateSpec.build(value, group_by, criteria, bind.dialect)
+    bounds = spec.id_bounds(session)
+    if bounds is None:
+        return {}
+    return aggregate_range(session, spec, bounds[0], bounds[1], chunk_size, batch_size)
+
+
+def _aggregate_in_process(url, spec, low, high, chunk_size, batch_size):
+    """Worker entry point: open an own engine and aggregate one id range."""
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            return aggregate_range(conn, spec, low, high, chunk_size, batch_size)
+    finally:
+        engine.dispose()
+
+
+def split_range(low, high, parts):
+    """Split ``[low, high)`` into at most ``parts`` contiguous ranges."""
+    step = max(1, -(-(high - low) // parts))
+    return [(start, min(start + step, high)) for start in range(low, high, step)]
+
+
+def parallel_aggregate(url, value, group_by=None, criteria=(), workers=None, chunk_size=50_000,
+                       batch_size=1000):
+    """
+    Aggregate ``value`` per group across a process pool split by id range.
+
+    Each worker opens its own engine on ``url`` (SQLite allows any number of
+    concurrent readers) and returns partials, which are merged here.
+
+    Args:
+        url: Database URL the workers connect to.
+        value: Attribute to aggregate, e.g. ``User.id``.
+        group_by: Attribute or list of attributes to group by (optional).
+        criteria: Filters on the same table.
+        workers: Number of processes (default: CPU count).
+        chunk_size: Rows per chunk inside each worker.
+        batch_size: Rows fetched per ``yield_per`` batch.
+
+    Returns:
+        dict: ``{group: Partial}``.
+    """
+    workers = workers or os.cpu_count() or 1
+    engine = create_engine(url)
+    try:
+        spec = AggregateSpec.build(value, group_by, criteria, engine.dialect)
+        with engine.connect() as conn:
+            bounds = spec.id_bounds(conn)
+    finally:
+        engine.dispose()
+    if bounds is None:
+        return {}
+    ranges = split_range(bounds[0], bounds[1], workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_aggregate_in_process, url, spec, low, high, chunk_size, batch_size)
+            for low, high in ranges
+        ]
+        return merge_results(future.result() for future in futures)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def run_benchmark(rows=5_000_000, batch_size=100_000, worker_counts=(1, 2, 4), repeats=3):
+    """
+    Compare SQL GROUP BY with the chunked and parallel aggregations.
+
+    Args:
+        rows: Number of users to insert.
+        batch_size: Rows per INSERT batch while seeding.
+        worker_counts: Process pool sizes to try.
+        repeats: Runs per strategy (the best one is reported).
+    """
+    from models import Base, User
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = "sqlite:///" + os.path.join(directory, "aggregate.db")
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+
+        print("📊 Chunked Aggregation Benchmark")
+        print("=" * 50)
+        started = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "INSERT INTO users (name, age, email) VALUES (?, ?, ?)",
+                    [(f"User {i}", 18 + i * 7 % 60, f"user{i}@example.com")
+                     for i in range(start, min(start + batch_size, rows))],
+                )
+        print(f"   Seeded {rows:,} users in {time.perf_counter() - started:.1f}s "
+              f"({os.cpu_count()} CPUs)")
+
+        criteria = [User.age > 20, User.age < 50]
+        sql = (
+            select(User.age, func.count(User.id), func.sum(User.id), func.min(User.id),
+                   func.max(User.id), func.avg(User.id))
+            .where(*criteria)
+            .group_by(User.age)
+        )
+
+        def best(run):
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                result = run()
+                timings.append(time.perf_counter() - started)
+            return min(timings), result
+
+        with Session(engine) as session:
+            sql_seconds, expected = best(lambda: session.execute(sql).all())
+            chunked_seconds, chunked = best(
+                lambda: streaming_aggregate(session, User.id, User.age, criteria)
+            )
+        expected = {row[0]: tuple(row[1:5]) for row in expected}
+
+        def matches(result):
+            return expected == {
+                age: (p.count, p.total, p.minimum, p.maximum) for age, p in result.items()
+            }
+
+        print(f"   SQL GROUP BY            {sql_seconds * 1000:>9.1f} ms")
+        print(f"   chunked, in process     {chunked_seconds * 1000:>9.1f} ms  "
+              f"{'✅' if matches(chunked) else '❌'}")
+        for workers in worker_counts:
+            seconds, result = best(
+                lambda: parallel_aggregate(url, User.id, User.age, criteria, workers=workers)
+            )
+            print(f"   parallel, {workers} process(es) {seconds * 1000:>9.1f} ms  "
+                  f"{'✅' if matches(result) else '❌'}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark chunked and parallel GROUP BY aggregation")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, worker_counts=args.workers, repeats=args.repeats)
@@ -1,6 +1,12 @@
 import os
+import sys
 from sqlalchemy import create_engine, Column, Integer, String
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+
+from rollup import CountRollup
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from schema_sync import reset_schema, sync_schema  # noqa: E402
 
 
 engine = create_engine(
@@ -8,7 +14,8 @@ engine = create_engine(
 )
 
 Session = sessionmaker(bind=engine)
-session = Session()
+# One session per thread instead of a single shared Session()
+session = scoped_session(Session)
 
 Base = declarative_base()
 
@@ -35,5 +42,17 @@ class User(BaseModel):
             self.email,
         )
         
-Base.metadata.drop_all(engine)
-Base.metadata.create_all(engine)
\ No newline at end of file
+# Per-age user counts kept current by triggers, so the age histogram
+# doesn't scan users on every call
+# - Installed with the table; run age_rollup.install() on older databases
+age_rollup = CountRollup(User.age)
+age_rollup.attach()
+
+# Only run DDL when the models changed since the last start; wiping the
+# data is an explicit reset_database() call
+sync_schema(engine, Base.metadata)
+
+
+def reset_database():
+    """Drop and recreate all tables (deletes every row)."""
+    reset_schema(engine, Base.metadata)
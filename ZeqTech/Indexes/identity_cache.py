@@ -0,0 +1,367 @@
+"""
+SQLAlchemy Caching Tutorial - Read-Through Identity Cache for Hot Keys
+
+A unique index makes ``session.query(User).filter(User.email == ...)
+.first()`` fast, but every call is still a round trip through the ORM,
+the driver and SQLite. The identity map only helps within one session, so
+request-per-session code pays for the same hot rows over and over. This
+module keeps a process-wide LRU cache of row values:
+
+- entries are keyed by primary key, and looked up by any unique column
+  (``User.email``) through a secondary key -> primary key map,
+- a miss reads the row once and stores its column values (never live
+  objects, which belong to one session),
+- a hit builds a persistent instance in the caller's session without
+  emitting SQL,
+- ``after_flush`` / ``after_commit`` / ``do_orm_execute`` session events
+  invalidate rows written through the ORM, including bulk UPDATE/DELETE,
+- ``maxsize`` and ``ttl`` bound memory and staleness, and ``hits``,
+  ``misses`` and ``evictions`` counters show whether it pays off.
+
+Key Concepts Covered:
+- LRU eviction with ``collections.OrderedDict``
+- ``set_committed_value`` and ``make_transient_to_detached``
+- Session events for cache invalidation
+- Discovering unique columns from table metadata
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import create_engine, event, inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached, undefer
+from sqlalchemy.orm.attributes import set_committed_value
+
+# =============================================================================
+# IDENTITY CACHE
+# =============================================================================
+
+
+def unique_columns(model):
+    """
+    Find the single-column unique keys of ``model`` (excluding the pk).
+
+    Args:
+        model: Mapped class.
+
+    Returns:
+        tuple: Attribute names backed by a unique column, index or constraint.
+    """
+    mapper = inspect(model)
+    table = mapper.local_table
+    unique = set()
+    for index in table.indexes:
+        if index.unique and len(index.columns) == 1:
+            unique.update(index.columns)
+    for constraint in table.constraints:
+        if constraint.__visit_name__ == "unique_constraint" and len(constraint.columns) == 1:
+            unique.update(constraint.columns)
+    return tuple(
+        prop.key
+        for prop in mapper.column_attrs
+        if prop.columns[0] not in mapper.primary_key
+        and (prop.columns[0].unique or prop.columns[0] in unique)
+    )
+
+
+class IdentityCache:
+    """
+    A process-wide LRU read-through cache of one model's rows.
+
+    Args:
+        model: Mapped class to cache, e.g. ``User``.
+        unique: Attribute names usable with ``get_by()``; discovered from the
+            table's unique columns when omitted.
+        maxsize: Maximum number of cached rows.
+        ttl: Seconds an entry stays valid, or None for no expiry.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(self, model, unique=None, maxsize=1024, ttl=None, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.model = model
+        self.mapper = inspect(model)
+        self.unique = tuple(unique) if unique is not None else unique_columns(model)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pk_keys = [self.mapper.get_property_by_column(c).key for c in self.mapper.primary_key]
+        self._columns = [prop.columns[0].label(prop.key) for prop in self.mapper.column_attrs]
+        self._entries = OrderedDict()  # pk tuple -> (expires_at, values)
+        self._by_unique = {}  # (attribute, value) -> pk tuple
+        self._lock = threading.RLock()
+        self._info_key = "_identity_cache_%d" % id(self)
+
+    # ---------------------------------------------------------------------
+    # Lookups
+    # ---------------------------------------------------------------------
+
+    def get(self, session, ident):
+        """
+        Return the instance with primary key ``ident``, like ``session.get()``.
+
+        Args:
+            session: Session the instance is returned in.
+            ident: Primary key value (or tuple for composite keys).
+
+        Returns:
+            The instance, or None if no such row exists.
+        """
+        ident = ident if isinstance(ident, tuple) else (ident,)
+        values = self._lookup(ident)
+        if values is None:
+            criteria = [column == value for column, value in zip(self.mapper.primary_key, ident)]
+            values = self._load(session, criteria)
+        return self._materialize(session, values)
+
+    def get_by(self, session, attribute, value):
+        """
+        Return the instance whose unique ``attribute`` equals ``value``.
+
+        Args:
+            session: Session the instance is returned in.
+            attribute: Name of a unique attribute, e.g. ``"email"``.
+            value: Value to look up.
+
+        Returns:
+            The instance, or None if no such row exists.
+        """
+        if attribute not in self.unique:
+            raise ValueError("%r is not a unique attribute of %s" % (attribute, self.model.__name__))
+        with self._lock:
+            ident = self._by_unique.get((attribute, value))
+            values = self._lookup(ident) if ident is not None else None
+            if values is None and ident is None:
+                self.misses += 1
+        if values is None:
+            values = self._load(session, [getattr(self.model, attribute) == value])
+        return self._materialize(session, values)
+
+    def _lookup(self, ident):
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is not None and entry[0] is not None and entry[0] <= self.clock():
+                self._remove(ident)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(ident)
+            self.hits += 1
+            return entry[1]
+
+    def _load(self, session, criteria):
+        row = session.execute(select(*self._columns).where(*criteria)).first()
+        if row is None:
+            return None
+        values = dict(row._mapping)
+        # Never publish rows this transaction has written but not committed
+        if self._info_key not in session.info:
+            self._store(values)
+        return values
+
+    def _materialize(self, session, values):
+        if values is None:
+            return None
+        ident = tuple(values[key] for key in self._pk_keys)
+        existing = session.identity_map.get(self.mapper.identity_key_from_primary_key(ident))
+        if existing is not None:
+            # Fill expired/deferred attributes so touching them stays SQL-free
+            for key in inspect(existing).unloaded & values.keys():
+                set_committed_value(existing, key, values[key])
+            return existing
+        instance = self.mapper.class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(instance, key, value)
+        make_transient_to_detached(instance)
+        session.add(instance)
+        return instance
+
+    # ---------------------------------------------------------------------
+    # Storage
+    # ---------------------------------------------------------------------
+
+    def _store(self, values):
+        ident = tuple(values[key] for key in self._pk_keys)
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._remove(ident)
+            self._entries[ident] = (expires_at, values)
+            for attribute in self.unique:
+                self._by_unique[(attribute, values[attribute])] = ident
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, ident):
+        entry = self._entries.pop(ident, None)
+        if entry is None:
+            return
+        for attribute in self.unique:
+            key = (attribute, entry[1][attribute])
+            if self._by_unique.get(key) == ident:
+                del self._by_unique[key]
+
+    def invalidate(self, ident):
+        """Drop the row with primary key ``ident`` from the cache."""
+        with self._lock:
+            self._remove(ident if isinstance(ident, tuple) else (ident,))
+
+    def clear(self):
+        """Drop every cached row (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_unique.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Summarise cache effectiveness.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``evictions``, ``size`` and
+            ``hit_ratio``.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    # ---------------------------------------------------------------------
+    # Invalidation
+    # ---------------------------------------------------------------------
+
+    def attach(self, session_class=Session):
+        """
+        Invalidate cached rows written through ``session_class`` sessions.
+
+        Flushed rows are dropped right away and again after COMMIT (another
+        session may have re-read the old committed row in between). ORM
+        UPDATE/DELETE/INSERT statements on the model clear the whole cache.
+
+        Args:
+            session_class: ``Session`` subclass or ``sessionmaker`` to hook.
+        """
+        event.listen(session_class, "after_flush", self._after_flush)
+        event.listen(session_class, "do_orm_execute", self._after_execute)
+        event.listen(session_class, "after_commit", self._after_commit)
+        event.listen(session_class, "after_rollback", self._after_rollback)
+
+    def _after_flush(self, session, flush_context):
+        written = session.info.setdefault(self._info_key, set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(obj, self.model):
+                ident = tuple(self.mapper.primary_key_from_instance(obj))
+                written.add(ident)
+                self.invalidate(ident)
+
+    def _after_execute(self, orm_execute_state):
+        if orm_execute_state.is_select or self.mapper not in orm_execute_state.all_mappers:
+            return
+        orm_execute_state.session.info.setdefault(self._info_key, set()).add(None)
+        self.clear()
+
+    def _after_commit(self, session):
+        written = session.info.pop(self._info_key, set())
+        if None in written:
+            self.clear()
+        for ident in written:
+            self.invalidate(ident)
+
+    def _after_rollback(self, session):
+        session.info.pop(self._info_key, None)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def run_benchmark(users=10_000, lookups=20_000, hot_keys=100, requests=200, maxsize=1024):
+    """
+    Compare hot-key email lookups with and without the cache.
+
+    Each "request" uses a fresh session, as a web handler would, so the
+    identity map cannot help; lookups are skewed towards ``hot_keys``.
+
+    Args:
+        users: Number of users to seed.
+        lookups: Total lookups per approach.
+        hot_keys: Number of frequently requested emails.
+        requests: Number of sessions the lookups are spread over.
+        maxsize: Cache size.
+    """
+    from models import Base, User
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "cache.db"))
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                User.__table__.insert(),
+                [
+                    {"name": f"User {i}", "age": 20 + i % 50, "email": f"user{i}@example.com"}
+                    for i in range(users)
+                ],
+            )
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+        rng = random.Random(42)
+        emails = [
+            f"user{rng.randrange(hot_keys) if rng.random() < 0.9 else rng.randrange(users)}@example.com"
+            for _ in range(lookups)
+        ]
+        per_request = max(1, lookups // requests)
+        cache = IdentityCache(User, maxsize=maxsize)
+
+        def uncached(session, email):
+            # undefer("*") so the comparison is one statement per lookup too
+            return session.query(User).options(undefer("*")).filter(User.email == email).first()
+
+        def cached(session, email):
+            return cache.get_by(session, "email", email)
+
+        print("📊 Hot-Key Lookup Benchmark")
+        print("=" * 50)
+        print(f"   {users} users, {lookups} lookups, {hot_keys} hot keys, {requests} sessions")
+        for label, lookup in (("query().first()", uncached), ("IdentityCache", cached)):
+            statements.clear()
+            started = time.perf_counter()
+            for start in range(0, lookups, per_request):
+                with Session(engine) as session:
+                    for email in emails[start:start + per_request]:
+                        assert lookup(session, email).email == email
+            elapsed = time.perf_counter() - started
+            print(f"   {label:<16} {lookups / elapsed:>9,.0f} lookups/sec  {len(statements):>6} statements")
+        print(f"   cache stats: {cache.stats()}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the read-through identity cache")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--hot-keys", type=int, default=100)
+    parser.add_argument("--maxsize", type=int, default=1024)
+    args = parser.parse_args()
+
+    run_benchmark(args.users, args.lookups, args.hot_keys, maxsize=args.maxsize)
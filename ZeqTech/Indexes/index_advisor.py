@@ -0,0 +1,491 @@
+"""
+SQLAlchemy Indexes Tutorial - EXPLAIN QUERY PLAN Capture and Index Advisor
+
+The ``User`` models of the Filtering and Grouping tutorials declare no
+indexes (and the Ordering one only its listing index), so most
+``filter()``, ``order_by()`` and ``group_by()`` calls scan the whole table.
+This module shows it, and fixes it:
+
+- ``PlanCapture`` records the SELECT statements an engine executes
+  (through ``before_cursor_execute`` / ``after_cursor_execute`` events),
+  with their parameters, execution count and time,
+- ``explain()`` runs ``EXPLAIN QUERY PLAN`` for each and classifies the
+  plan lines: ``SCAN`` (full table scan), ``SEARCH`` (index lookup),
+  ``INDEX SCAN`` (covering index scan) and ``TEMP B-TREE`` (sort step),
+- ``propose_indexes()`` reads the compiled SQLAlchemy statement (equality
+  filters, then one range filter, or ORDER BY / GROUP BY columns) and
+  proposes concrete ``Index(...)`` definitions for the model,
+- ``what_if()`` creates the candidates on a *copy* of the database and
+  reports the before/after timings and plans.
+
+Run ``python index_advisor.py Filtering-Data`` (or ``Ordering-Data``,
+``Grouping-Chaining-Data``) to analyze a tutorial's typical queries.
+
+Key Concepts Covered:
+- ``EXPLAIN QUERY PLAN`` output in SQLite
+- Engine cursor events and ``context.compiled``
+- Equality-first, range-last composite index design
+- Testing indexes safely on a database copy
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+from sqlalchemy import Column, create_engine, event, func, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import elements, operators
+
+# =============================================================================
+# CAPTURE
+# =============================================================================
+
+
+@dataclass
+class CapturedStatement:
+    """One distinct SELECT statement seen by ``PlanCapture``."""
+
+    sql: str
+    parameters: tuple
+    statement: object = None  # the SQLAlchemy Select, when available
+    executions: int = 0
+    seconds: float = 0.0
+
+
+class PlanCapture:
+    """
+    Record the SELECT statements executed on ``engine``.
+
+    Usable as a context manager::
+
+        with PlanCapture(engine) as capture:
+            session.query(User).filter_by(age=20).all()
+        for captured in capture.statements:
+            print(explain(engine, captured))
+
+    Args:
+        engine: Engine to listen on.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._statements = {}
+        self._local = threading.local()
+
+    @property
+    def statements(self):
+        """Distinct captured statements, most time-consuming first."""
+        return sorted(self._statements.values(), key=lambda s: s.seconds, reverse=True)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        event.listen(self.engine, "after_cursor_execute", self._after)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._before)
+        event.remove(self.engine, "after_cursor_execute", self._after)
+        return False
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        captured = self._statements.get(statement)
+        if captured is None:
+            compiled = getattr(context, "compiled", None)
+            captured = CapturedStatement(
+                sql=statement,
+                parameters=tuple(parameters or ()),
+                statement=getattr(compiled, "statement", None),
+            )
+            self._statements[statement] = captured
+        captured.executions += 1
+        captured.seconds += time.perf_counter() - self._local.started
+
+
+# =============================================================================
+# EXPLAIN QUERY PLAN
+# =============================================================================
+
+
+def classify(detail):
+    """
+    Classify one ``EXPLAIN QUERY PLAN`` detail line.
+
+    Args:
+        detail: e.g. ``"SCAN users"`` or ``"SEARCH users USING INDEX ..."``.
+
+    Returns:
+        str: ``"scan"``, ``"index scan"``, ``"search"``, ``"temp b-tree"``
+        or ``"other"``.
+    """
+    if detail.startswith("SEARCH "):
+        return "search"
+    if detail.startswith("SCAN "):
+        if "CONSTANT ROW" in detail:
+            return "other"
+        return "index scan" if " USING " in detail else "scan"
+    if detail.startswith("USE TEMP B-TREE"):
+        return "temp b-tree"
+    return "other"
+
+
+@dataclass
+class Plan:
+    """The query plan of one captured statement."""
+
+    captured: CapturedStatement
+    details: List[str]
+
+    @property
+    def kinds(self):
+        return [classify(detail) for detail in self.details]
+
+    @property
+    def has_full_scan(self):
+        return "scan" in self.kinds
+
+    @property
+    def uses_index(self):
+        return "search" in self.kinds or "index scan" in self.kinds
+
+
+def explain(engine, captured):
+    """
+    Run ``EXPLAIN QUERY PLAN`` for a captured statement.
+
+    Args:
+        engine: Engine of the database to explain against.
+        captured: A ``CapturedStatement``.
+
+    Returns:
+        Plan: The plan lines and their classification.
+    """
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + captured.sql, captured.parameters).all()
+    return Plan(captured, [row[-1] for row in rows])
+
+
+# =============================================================================
+# INDEX PROPOSALS
+# =============================================================================
+
+
+@dataclass
+class IndexProposal:
+    """A candidate index for one table."""
+
+    table: object
+    columns: List[Column]
+    reason: str
+    statements: List[CapturedStatement] = field(default_factory=list)
+
+    @property
+    def name(self):
+        return "ix_%s_%s" % (self.table.name, "_".join(column.name for column in self.columns))
+
+    def definition(self):
+        """Return the ``Index(...)`` line to add to the model's ``__table_args__``."""
+        return "Index(%r, %s)" % (self.name, ", ".join(repr(column.name) for column in self.columns))
+
+    def ddl(self):
+        """Return the ``CREATE INDEX`` statement (leaves the model untouched)."""
+        return "CREATE INDEX IF NOT EXISTS %s ON %s (%s)" % (
+            self.name,
+            self.table.name,
+            ", ".join(column.name for column in self.columns),
+        )
+
+
+def _column_of(expression):
+    if isinstance(expression, elements.UnaryExpression):
+        expression = expression.element
+    if isinstance(expression, elements.Label):
+        expression = expression.element
+    if isinstance(expression, elements.ColumnClause) and getattr(expression, "table", None) is not None:
+        return expression
+    return None
+
+
+def _collect(clause, equality, ranges, alternatives):
+    if isinstance(clause, elements.Grouping):
+        _collect(clause.element, equality, ranges, alternatives)
+    elif isinstance(clause, elements.BooleanClauseList) and clause.operator is operators.and_:
+        for child in clause.clauses:
+            _collect(child, equality, ranges, alternatives)
+    elif isinstance(clause, elements.BooleanClauseList) and clause.operator is operators.or_:
+        # SQLite can answer OR with one index per branch ("MULTI-INDEX OR")
+        branches = []
+        for child in clause.clauses:
+            branch_eq, branch_range = [], []
+            _collect(child, branch_eq, branch_range, [])
+            branches.append((branch_eq + branch_range)[:1])
+        if all(branches):
+            alternatives.extend(branch[0] for branch in branches)
+    elif isinstance(clause, elements.BinaryExpression):
+        column = _column_of(clause.left)
+        if column is None:
+            column = _column_of(clause.right)
+        if column is None:
+            return
+        if clause.operator in (operators.eq, operators.in_op, operators.is_):
+            equality.append(column)
+        elif clause.operator in (
+            operators.gt, operators.ge, operators.lt, operators.le, operators.between_op,
+        ):
+            ranges.append(column)
+
+
+def _dedupe(columns):
+    seen, result = set(), []
+    for column in columns:
+        key = (column.table.name, column.name)
+        if key not in seen:
+            seen.add(key)
+            result.append(column)
+    return result
+
+
+def _is_covered(table, columns):
+    """True if an index (or the integer primary key) already leads with ``columns``."""
+    names = [column.name for column in columns]
+    if len(names) == 1 and names[0] in [c.name for c in table.primary_key.columns]:
+        return True
+    for index in table.indexes:
+        if [column.name for column in index.columns][: len(names)] == names:
+            return True
+    return False
+
+
+def candidate_columns(statement):
+    """
+    Work out the index columns a SELECT would benefit from.
+
+    Args:
+        statement: A SQLAlchemy ``Select``.
+
+    Returns:
+        list: ``(columns, reason)`` tuples, one per candidate index.
+    """
+    equality, ranges, alternatives = [], [], []
+    if getattr(statement, "whereclause", None) is not None:
+        _collect(statement.whereclause, equality, ranges, alternatives)
+    ordering = [_column_of(c) for c in getattr(statement, "_group_by_clauses", ())]
+    ordering += [_column_of(c) for c in getattr(statement, "_order_by_clauses", ())]
+    ordering = [column for column in ordering if column is not None]
+
+    candidates = []
+    equality = _dedupe(equality)
+    if ranges:
+        columns = _dedupe(equality + ranges[:1])
+        reason = "equality filters, then the range filter"
+    elif ordering:
+        columns = _dedupe(equality + ordering)
+        reason = "filters, then ORDER BY / GROUP BY columns (avoids the sort)"
+    else:
+        columns = equality
+        reason = "equality filters"
+    # An index serves one table; keep the columns of the first table
+    if columns:
+        table = columns[0].table
+        candidates.append(([c for c in columns if c.table is table], reason))
+    for column in _dedupe(alternatives):
+        candidates.append(([column], "one branch of an OR"))
+    return candidates
+
+
+def propose_indexes(plans):
+    """
+    Propose indexes for plans that scan a table.
+
+    Args:
+        plans: ``Plan`` objects from ``explain()``.
+
+    Returns:
+        list: ``IndexProposal`` objects, most statements served first.
+    """
+    proposals = {}
+    for plan in plans:
+        if not plan.has_full_scan and "temp b-tree" not in plan.kinds:
+            continue
+        if plan.captured.statement is None:
+            continue
+        for columns, reason in candidate_columns(plan.captured.statement):
+            table = columns[0].table
+            table = getattr(table, "original", table)
+            columns = [table.c[column.name] for column in columns]
+            if _is_covered(table, columns):
+                continue
+            key = (table.name, tuple(column.name for column in columns))
+            proposal = proposals.setdefault(key, IndexProposal(table, columns, reason))
+            proposal.statements.append(plan.captured)
+
+    # (age) is served by (age, name): fold prefixes into the longer index
+    for key, proposal in list(proposals.items()):
+        for other_key, other in proposals.items():
+            if other_key != key and other_key[0] == key[0] and other_key[1][: len(key[1])] == key[1]:
+                other.statements.extend(s for s in proposal.statements if s not in other.statements)
+                del proposals[key]
+                break
+    return sorted(proposals.values(), key=lambda p: len(p.statements), reverse=True)
+
+
+# =============================================================================
+# WHAT-IF
+# =============================================================================
+
+
+@dataclass
+class WhatIfResult:
+    """Timing of one statement before and after the proposed indexes."""
+
+    sql: str
+    before_ms: float
+    after_ms: float
+    before_plan: List[str]
+    after_plan: List[str]
+
+    @property
+    def speedup(self):
+        return self.before_ms / self.after_ms if self.after_ms else float("inf")
+
+
+def _time(engine, captured, repeats):
+    best = None
+    with engine.connect() as conn:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            conn.exec_driver_sql(captured.sql, captured.parameters).all()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def what_if(database, statements, proposals, repeats=3):
+    """
+    Measure ``statements`` before and after creating ``proposals`` on a copy.
+
+    The original database file is never modified.
+
+    Args:
+        database: Path of the SQLite database file.
+        statements: ``CapturedStatement`` objects to time.
+        proposals: ``IndexProposal`` objects to create.
+        repeats: Timed runs per statement (the best one is kept).
+
+    Returns:
+        list: ``WhatIfResult`` per statement.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        copy = os.path.join(directory, "what_if.db")
+        shutil.copyfile(database, copy)
+        engine = create_engine("sqlite:///" + copy)
+        before = [(_time(engine, s, repeats), explain(engine, s).details) for s in statements]
+        with engine.begin() as conn:
+            for proposal in proposals:
+                conn.execute(text(proposal.ddl()))
+            conn.execute(text("ANALYZE"))
+        results = []
+        for captured, (before_ms, before_plan) in zip(statements, before):
+            results.append(
+                WhatIfResult(
+                    captured.sql,
+                    before_ms,
+                    _time(engine, captured, repeats),
+                    before_plan,
+                    explain(engine, captured).details,
+                )
+            )
+        engine.dispose()
+    return results
+
+
+# =============================================================================
+# TUTORIAL WORKLOAD
+# =============================================================================
+
+
+def tutorial_workload(session, User):
+    """Run the filter/order/group queries used by the tutorial apps."""
+    session.query(User).filter_by(age=20).all()
+    session.query(User).filter_by(name="Ahmed").all()
+    session.query(User).filter_by(name="Ahmed", age=20).all()
+    session.query(User).filter(User.age >= 38).all()
+    session.query(User).order_by(User.age, User.name).limit(20).all()
+    session.query(User.age, func.count(User.id)).filter(User.age > 20, User.age < 50).group_by(User.age).all()
+
+
+def run_advisor(tutorial, rows=200_000, repeats=3):
+    """
+    Seed a tutorial's schema, capture its workload and report index advice.
+
+    Args:
+        tutorial: Tutorial directory name, e.g. ``"Filtering-Data"``.
+        rows: Number of synthetic users.
+        repeats: Timed runs per statement in the what-if step.
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), tutorial))
+    from models import Base, User
+
+    rng = random.Random(42)
+    names = ["Ahmed", "Omar", "Ali", "Mohammed", "Khalid", "Belal"]
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "advisor.db")
+        engine = create_engine("sqlite:///" + database)
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                User.__table__.insert(),
+                [
+                    {"name": rng.choice(names), "age": rng.randint(18, 60), "email": f"user{i}@example.com"}
+                    for i in range(rows)
+                ],
+            )
+
+        with PlanCapture(engine) as capture, Session(engine) as session:
+            tutorial_workload(session, User)
+        plans = [explain(engine, captured) for captured in capture.statements]
+        proposals = propose_indexes(plans)
+
+        print(f"🔍 Query plans for {tutorial} ({rows:,} users)")
+        print("=" * 50)
+        for plan in plans:
+            print(f"\n   {plan.captured.sql.splitlines()[-1].strip() or plan.captured.sql}")
+            for detail, kind in zip(plan.details, plan.kinds):
+                marker = "❌" if kind in ("scan", "temp b-tree") else "✅"
+                print(f"   {marker} {detail}")
+
+        print("\n💡 Proposed indexes (add to User.__table_args__):")
+        for proposal in proposals:
+            print(f"   {proposal.definition():<45} # {proposal.reason}, {len(proposal.statements)} queries")
+
+        print("\n📊 What-if on a copy of the database:")
+        for result in what_if(database, capture.statements, proposals, repeats):
+            # Low-selectivity columns (6 names, half the ages) may not pay off
+            marker = "🚀" if result.speedup >= 1.2 else "⚠️"
+            print(f"   {marker} {result.before_ms:8.2f} ms -> {result.after_ms:8.2f} ms  ({result.speedup:5.1f}x)  "
+                  f"{result.after_plan[0] if result.after_plan else ''}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Explain a tutorial's queries and propose indexes")
+    parser.add_argument("tutorial", nargs="?", default="Filtering-Data")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    run_advisor(args.tutorial, args.rows, args.repeats)
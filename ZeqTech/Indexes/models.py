@@ -20,7 +20,9 @@ License: MIT
 from sqlalchemy import (
     create_engine, Column, Integer, String, Index, CheckConstraint
 )
-from sqlalchemy.orm import declarative_base, deferred, sessionmaker
+from sqlalchemy.orm import declarative_base, deferred, scoped_session, sessionmaker
+
+from identity_cache import IdentityCache
 
 # =============================================================================
 # DATABASE CONFIGURATION
@@ -32,7 +34,8 @@ engine = create_engine("sqlite:///:memory:", echo=True)
 
 # Create session factory and session instance
 Session = sessionmaker(bind=engine)
-session = Session()
+# One session per thread instead of a single shared Session()
+session = scoped_session(Session)
 
 # Create declarative base for model definitions
 Base = declarative_base()
@@ -95,13 +98,13 @@ class User(BaseModel):
     # - index=True: Creates index for fast email lookups
     # - group="private": Groups with other private/sensitive data
     # - String(120): Standard email length limit
-    email = deferred(Column(String(120), unique=True, index=True, group="private"))
+    email = deferred(Column(String(120), unique=True, index=True), group="private")
     
     # Password field (deferred for security and performance)
     # - deferred(): Never loaded unless explicitly requested
     # - group="private": Groups with other sensitive data
     # - String(200): Accommodates hashed passwords
-    password = deferred(Column(String(200), group="private"))
+    password = deferred(Column(String(200)), group="private")
 
     # =====================================================================
     # TABLE-LEVEL CONSTRAINTS AND INDEXES
@@ -128,6 +131,16 @@ class User(BaseModel):
         """
         return f"<User(name='{self.name}', age='{self.age}', email='{self.email}')>"
 
+# =============================================================================
+# IDENTITY CACHE
+# =============================================================================
+
+# Process-wide LRU cache for hot lookups by primary key and unique email
+# - Invalidated by flushes/commits of any session made by Session
+# - See identity_cache.py for the hit/miss benchmark
+user_cache = IdentityCache(User, maxsize=1024, ttl=300)
+user_cache.attach(Session)
+
 # =============================================================================
 # DATABASE SCHEMA CREATION
 # =============================================================================
@@ -199,6 +212,12 @@ def demonstrate_indexing():
     ).first()
     print(f"User by name and email: {user_by_name_email}")
 
+    # Hot-key lookups through the read-through cache
+    # - First call reads the row, later calls skip SQL entirely
+    for _ in range(3):
+        cached_user = user_cache.get_by(session, "email", "omar@example.com")
+    print(f"Cached user by email: {cached_user.name} {user_cache.stats()}")
+
 if __name__ == "__main__":
     # Main execution block for running the indexing demonstration
     # This block:
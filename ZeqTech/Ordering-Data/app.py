@@ -1,5 +1,11 @@
-from models import session, User
+from models import session, User, reset_database
+from ordered_streaming import top_k, users_by_age_and_name
+from pagination import iterate_pages
 import random
+from sqlalchemy import select
+
+# The demo seeds its own data, so start from empty tables
+reset_database()
 
 
 
@@ -53,4 +59,34 @@ print('-'*100)
 
 users = session.query(User).order_by(User.age, User.name).all()
 
-print(*users, sep="\n")
\ No newline at end of file
+print(*users, sep="\n")
+
+
+
+print("-"*100)
+print()
+print('-'*100)
+
+
+# Page through the same ordering with keyset pagination instead of OFFSET:
+# every page seeks past the (age, name, id) of the previous page's last row
+for number, page in enumerate(iterate_pages(session, select(User), (User.age, User.name, User.id), page_size=10), start=1):
+    print(f"Page {number} (next cursor: {page.next_cursor})")
+    print(*page, sep="\n")
+
+
+
+print("-"*100)
+print()
+print('-'*100)
+
+
+# Stream the same ordering straight from the covering index: no temp B-tree,
+# and each user is printed as soon as it is read
+for user in users_by_age_and_name(session, batch_size=10):
+    print(user)
+
+print("-"*100)
+
+# The 5 youngest users: SQLite stops after 5 index entries
+print(*top_k(session, select(User), (User.age, User.name, User.id), 5), sep="\n")
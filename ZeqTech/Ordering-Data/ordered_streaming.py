@@ -0,0 +1,260 @@
+"""
+SQLAlchemy Ordering Tutorial - Index-Ordered Streaming and Top-K
+
+``session.query(User).order_by(User.age, User.name).all()`` makes SQLite
+copy every row into a temp B-tree, sort it, and only then hand back the
+first row, while Python builds the full list. With an index in the same
+order the sort disappears:
+
+- ``ix_users_age_name_covering`` on ``(age, name, id, email, password)``
+  is both *ordered* like the listing and *covering* (holds every column),
+  so SQLite answers by walking the index, without touching the table,
+- ``stream_ordered()`` fetches that walk with ``yield_per``, so the first
+  row arrives right away and memory stays at one batch,
+- ``top_k()`` adds ``LIMIT k``: SQLite stops after k index entries,
+- ``query_plan()`` / ``assert_index_order()`` read ``EXPLAIN QUERY PLAN`` so
+  tests can fail when a change brings the temp B-tree back.
+
+Key Concepts Covered:
+- Covering, ordered composite indexes
+- ``USE TEMP B-TREE FOR ORDER BY`` vs ``SCAN ... USING COVERING INDEX``
+- ``yield_per`` streaming and latency to the first row
+- ``LIMIT`` as an early stop
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Query, Session
+
+# =============================================================================
+# QUERY PLANS
+# =============================================================================
+
+
+def _as_statement(query):
+    """Accept both legacy ``Query`` objects and 2.0 ``select()`` statements."""
+    if isinstance(query, Query):
+        return query.statement
+    return query
+
+
+def query_plan(session, statement):
+    """
+    Return SQLite's ``EXPLAIN QUERY PLAN`` lines for a statement.
+
+    Args:
+        session: ``Session`` or ``Connection``.
+        statement: A ``select()`` or legacy ``Query``.
+
+    Returns:
+        list: Plan detail strings, e.g. ``["SCAN users USING COVERING INDEX ..."]``.
+    """
+    statement = _as_statement(statement)
+    bind = session.get_bind() if hasattr(session, "get_bind") else session
+    # Expand in_() lists; EXPLAIN cannot bind the [POSTCOMPILE_...] placeholders
+    compiled = statement.compile(dialect=bind.dialect, compile_kwargs={"render_postcompile": True})
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    connection = session.connection() if hasattr(session, "get_bind") else session
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), parameters).all()
+    return [row[-1] for row in rows]
+
+
+def assert_index_order(session, statement, index=None):
+    """
+    Fail unless SQLite returns the rows in index order, without sorting.
+
+    Args:
+        session: ``Session`` or ``Connection``.
+        statement: An ordered ``select()`` or legacy ``Query``.
+        index: Name of the index that must be used (optional).
+
+    Returns:
+        list: The plan lines, for further checks.
+
+    Raises:
+        AssertionError: If the plan sorts in a temp B-tree or does not use
+            ``index``.
+    """
+    plan = query_plan(session, statement)
+    sorts = [line for line in plan if line.startswith("USE TEMP B-TREE")]
+    if sorts:
+        raise AssertionError("query sorts in a temp B-tree: %s" % "; ".join(plan))
+    if index is not None and not any(("INDEX %s" % index) in line for line in plan):
+        raise AssertionError("query does not use %s: %s" % (index, "; ".join(plan)))
+    return plan
+
+
+# =============================================================================
+# ORDERED STREAMING
+# =============================================================================
+
+
+def stream_ordered(session, statement, order_by, batch_size=1000):
+    """
+    Yield the results of ``statement`` in ``order_by`` order, one at a time.
+
+    Rows are fetched with ``yield_per`` so, when an index matches
+    ``order_by``, the first row is available as soon as SQLite reads the
+    first index entry. Single-entity statements yield entities, others
+    yield ``Row`` objects.
+
+    Args:
+        session: ``Session`` used to execute the statement.
+        statement: A ``select()`` or legacy ``Query``.
+        order_by: Sequence of columns to order by, e.g. ``(User.age, User.name)``.
+        batch_size: Rows fetched per batch.
+
+    Yields:
+        The rows in order.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    statement = _as_statement(statement).order_by(*order_by)
+    result = session.execute(statement, execution_options={"yield_per": batch_size})
+    if len(statement.column_descriptions) == 1:
+        result = result.scalars()
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        # Release the cursor if the consumer stops early
+        result.close()
+
+
+def top_k(session, statement, order_by, k):
+    """
+    Return the first ``k`` results of ``statement`` in ``order_by`` order.
+
+    ``LIMIT k`` lets SQLite stop after ``k`` index entries; without a
+    matching index it still keeps only ``k`` rows in its sorter.
+
+    Args:
+        session: ``Session`` used to execute the statement.
+        statement: A ``select()`` or legacy ``Query``.
+        order_by: Sequence of columns to order by.
+        k: Number of rows to return.
+
+    Returns:
+        list: Up to ``k`` entities or rows.
+    """
+    if k < 0:
+        raise ValueError("k must not be negative")
+    statement = _as_statement(statement).order_by(*order_by).limit(k)
+    result = session.execute(statement)
+    if len(statement.column_descriptions) == 1:
+        result = result.scalars()
+    return result.all()
+
+
+def users_by_age_and_name(session, batch_size=1000):
+    """
+    Stream every user ordered by age, then name (then id, for stable ties).
+
+    This is the streaming version of
+    ``session.query(User).order_by(User.age, User.name).all()``.
+
+    Args:
+        session: Session bound to the tutorial database.
+        batch_size: Rows fetched per batch.
+
+    Yields:
+        User: The users in order.
+    """
+    from models import User
+
+    return stream_ordered(session, select(User), (User.age, User.name, User.id), batch_size)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def run_benchmark(rows=1_000_000, k=10, batch_size=1000, repeats=3):
+    """
+    Time the first row, the full listing and top-K with and without the index.
+
+    Args:
+        rows: Number of users to insert.
+        k: Rows fetched by the top-K query.
+        batch_size: Rows fetched per ``yield_per`` batch.
+        repeats: Runs per case (the best one is reported).
+    """
+    from models import Base, User
+
+    order_by = (User.age, User.name, User.id)
+    names = ["Ahmed", "Omar", "Ali", "Mohammed", "Khalid", "Belal"]
+    index = "ix_users_age_name_covering"
+
+    def first_row(session):
+        rows_iter = stream_ordered(session, select(User), order_by, batch_size)
+        next(rows_iter)
+        rows_iter.close()
+
+    cases = [
+        ("all(), first row", lambda s: s.query(User).order_by(*order_by).all()[0]),
+        ("stream, first row", first_row),
+        ("all(), every row", lambda s: s.query(User).order_by(*order_by).all()),
+        ("stream, every row", lambda s: sum(1 for _ in stream_ordered(s, select(User), order_by, batch_size))),
+        (f"top {k}", lambda s: top_k(s, select(User), order_by, k)),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "ordered.db"))
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP INDEX {index}"))
+            for start in range(0, rows, 100_000):
+                conn.execute(
+                    insert(User),
+                    [
+                        {"name": random.choice(names), "age": random.randint(18, 80),
+                         "email": f"user{i}@example.com", "password": "secret"}
+                        for i in range(start, min(rows, start + 100_000))
+                    ],
+                )
+
+        print("📊 Ordered Streaming Benchmark")
+        print("=" * 50)
+        print(f"   {rows:,} users, best of {repeats}, ms")
+        timings = {}
+        for indexed in (False, True):
+            if indexed:
+                started = time.perf_counter()
+                for table_index in User.__table__.indexes:
+                    table_index.create(engine)
+                print(f"   Built {index} in {time.perf_counter() - started:.1f}s")
+            with Session(engine) as session:
+                plan = query_plan(session, select(User).order_by(*order_by))
+                print(f"   Plan {'with' if indexed else 'without'} index: {'; '.join(plan)}")
+                for label, run in cases:
+                    best = float("inf")
+                    for _ in range(repeats):
+                        session.expunge_all()
+                        started = time.perf_counter()
+                        run(session)
+                        best = min(best, time.perf_counter() - started)
+                    timings[label, indexed] = best * 1000
+
+        print(f"\n   {'':<20}{'no index':>12}{'index':>12}")
+        for label, _ in cases:
+            print(f"   {label:<20}{timings[label, False]:>12.2f}{timings[label, True]:>12.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark index-ordered streaming and top-K")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.k, repeats=args.repeats)
@@ -0,0 +1,281 @@
+"""
+SQLAlchemy Keyset Pagination Tutorial - Deep Pages Without OFFSET
+
+``LIMIT 10 OFFSET 100000`` makes the database walk and discard 100,000 rows
+before returning page 10,001, so every page is slower than the last. Keyset
+(a.k.a. seek) pagination remembers the sort key of the last row instead and
+asks for ``WHERE (age, name, id) > (:age, :name, :id)``. With an index on
+the order-by columns that is an index seek, so page N costs the same as
+page 1.
+
+Key Concepts Covered:
+- Row-value comparisons with ``tuple_()``
+- Mixed ASC/DESC keysets expanded into OR chains
+- Opaque, URL-safe cursor tokens
+- Benchmarking keyset vs OFFSET pagination
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import Index, and_, create_engine, insert, or_, select, tuple_
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+# =============================================================================
+# CURSOR TOKENS
+# =============================================================================
+
+
+def encode_cursor(values):
+    """
+    Turn the sort-key values of a row into an opaque token.
+
+    Args:
+        values: Sequence of JSON-serializable key values.
+
+    Returns:
+        str: URL-safe token.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Inverse of ``encode_cursor()``.
+
+    Args:
+        token: Token produced by ``encode_cursor()``.
+
+    Returns:
+        list: The sort-key values.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as err:
+        raise ValueError("invalid pagination cursor") from err
+    if not isinstance(values, list):
+        raise ValueError("invalid pagination cursor")
+    return values
+
+
+# =============================================================================
+# KEYSET PAGINATION
+# =============================================================================
+
+
+class Page:
+    """
+    One page of results.
+
+    Attributes:
+        items: Rows/entities on this page.
+        next_cursor: Token for the following page, or ``None`` on the last page.
+    """
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        """bool: Whether another page follows."""
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return "<Page(items=%d, has_next=%s)>" % (len(self.items), self.has_next)
+
+
+def _split_order(order_by):
+    """Return ``[(column, descending), ...]`` for plain or ``.desc()`` columns."""
+    keys = []
+    for clause in order_by:
+        if isinstance(clause, UnaryExpression) and clause.modifier in (
+            operators.desc_op,
+            operators.asc_op,
+        ):
+            keys.append((clause.element, clause.modifier is operators.desc_op))
+        else:
+            keys.append((clause, False))
+    return keys
+
+
+def _seek_condition(keys, values):
+    """Build the WHERE clause selecting rows strictly after ``values``."""
+    columns = [column for column, _ in keys]
+    directions = {descending for _, descending in keys}
+    if len(directions) == 1:
+        # Uniform direction: one row-value comparison the index can seek on
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal = [keys[j][0] == values[j] for j in range(i)]
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*(equal + [after])))
+    return or_(*clauses)
+
+
+def paginate(session, query, order_by, page_size=50, cursor=None):
+    """
+    Fetch one page of ``query`` ordered by ``order_by`` using keyset seeks.
+
+    The last ``order_by`` column must make the ordering unique (normally the
+    primary key, e.g. ``(User.age, User.name, User.id)``) and none of the
+    columns may be NULL.
+
+    Args:
+        session: Session used to run the query.
+        query: A ``select()`` statement or a legacy ``Query``; it must not
+            have its own ORDER BY, LIMIT or OFFSET.
+        order_by: Tuple of columns, optionally wrapped in ``.desc()``.
+        page_size: Maximum number of items per page.
+        cursor: ``Page.next_cursor`` of the previous page, or ``None`` for
+            the first page.
+
+    Returns:
+        Page: The items and the cursor of the next page.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be a positive integer")
+
+    statement = query.statement if isinstance(query, Query) else query
+    keys = _split_order(order_by)
+    entities = len(statement.column_descriptions)
+
+    statement = statement.add_columns(*(column for column, _ in keys))
+    if cursor is not None:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise ValueError("cursor does not match the order_by columns")
+        statement = statement.where(_seek_condition(keys, values))
+    statement = statement.order_by(*order_by).limit(page_size + 1)
+
+    rows = session.execute(statement).all()
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if entities == 1:
+        items = [row[0] for row in rows]
+    else:
+        items = [tuple(row[:entities]) for row in rows]
+    next_cursor = encode_cursor(rows[-1][entities:]) if has_next else None
+    return Page(items, next_cursor)
+
+
+def iterate_pages(session, query, order_by, page_size=50):
+    """
+    Yield every page of ``query`` in order.
+
+    Args:
+        session: Session used to run the query.
+        query: Statement to paginate.
+        order_by: Tuple of order-by columns (see ``paginate()``).
+        page_size: Maximum number of items per page.
+
+    Yields:
+        Page: Each page in turn.
+    """
+    cursor = None
+    while True:
+        page = paginate(session, query, order_by, page_size, cursor)
+        yield page
+        if not page.has_next:
+            return
+        cursor = page.next_cursor
+
+
+# =============================================================================
+# BENCHMARK: KEYSET VS OFFSET
+# =============================================================================
+
+
+def run_benchmark(rows=1_000_000, page_size=50, pages=(1, 100, 1_000, 10_000)):
+    """
+    Time fetching page N with OFFSET and with a keyset cursor.
+
+    Args:
+        rows: Number of users in the benchmark table.
+        page_size: Items per page.
+        pages: Page numbers to time.
+    """
+    from models import Base, User
+
+    order_by = (User.age, User.name, User.id)
+    print("📊 Keyset vs OFFSET Pagination")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "bench.db"))
+        Base.metadata.create_all(engine)
+        Index("ix_bench_users_age_name_id", User.age, User.name, User.id).create(engine)
+        names = ["Ahmed", "Omar", "Ali", "Mohammed", "Khalid", "Belal"]
+        with engine.begin() as conn:
+            for start in range(0, rows, 100_000):
+                conn.execute(
+                    insert(User),
+                    [
+                        {"name": random.choice(names), "age": random.randint(18, 80)}
+                        for _ in range(start, min(rows, start + 100_000))
+                    ],
+                )
+
+        with Session(engine) as session:
+            for page in pages:
+                offset = (page - 1) * page_size
+                if offset >= rows:
+                    continue
+                started = time.perf_counter()
+                session.execute(
+                    select(User).order_by(*order_by).offset(offset).limit(page_size)
+                ).all()
+                offset_seconds = time.perf_counter() - started
+
+                # Cursor of the row just before the requested page
+                cursor = None
+                if offset:
+                    previous = session.execute(
+                        select(*order_by).order_by(*order_by).offset(offset - 1).limit(1)
+                    ).one()
+                    cursor = encode_cursor(previous)
+                started = time.perf_counter()
+                paginate(session, select(User), order_by, page_size, cursor)
+                keyset_seconds = time.perf_counter() - started
+
+                print(
+                    f"   page {page:>6}: OFFSET {offset_seconds * 1000:8.2f} ms | "
+                    f"keyset {keyset_seconds * 1000:6.2f} ms"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark keyset vs OFFSET pagination")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1_000, 10_000])
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.page_size, args.pages)
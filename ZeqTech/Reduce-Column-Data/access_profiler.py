@@ -0,0 +1,497 @@
+"""
+SQLAlchemy Deferred Columns Tutorial - Profiling Attribute Access
+
+``load_only()``, ``defer()`` and ``undefer()`` are chosen by hand, and
+they drift out of date when the code that reads the results changes.
+``AccessProfiler`` watches what the code actually does, per query call
+site (``app.py:42``, relative to the profile file's directory):
+
+- which columns the query selected for the objects it returned,
+- which attributes were then read,
+- which deferred columns were fetched lazily, one extra SELECT later.
+
+From that it reports the loaded-but-never-read columns and the lazily
+fetched ones, and learns the options the query should have had:
+``load_only(...)`` of the columns read, or ``undefer(...)`` when every
+default column is read anyway. The learned reads can be saved to a JSON
+file together with a fingerprint of each site's statement; a later run
+with ``auto_apply=True`` adds the options to queries from the same call
+site that have no loader options of their own, as long as the statement
+there is still the one that was profiled. Queries with options of their
+own are profiled but get no learned options.
+``execution_options(access_profile=False)`` leaves a query out.
+
+How it works: a ``do_orm_execute`` session event finds each SELECT's call
+site, applies learned options, and buffers the result to store the site
+on every object it returns, with the columns the compiled statement
+selected (``yield_per`` results are tagged by an instance ``load`` event
+instead, as they arrive). While profiling, the
+mapped class gets a ``__getattribute__`` that records reads of column
+attributes. An object's reads count for the last query that returned it.
+
+Key Concepts Covered:
+- ``do_orm_execute`` events and rewriting statements
+- Instance ``load`` events and ``InstanceState.info``
+- ``load_only()`` / ``undefer()`` loader options
+- Feedback-driven query tuning
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+import sqlalchemy
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session, load_only, undefer
+from sqlalchemy.sql import Select
+
+# Key of the call site, in execution options and InstanceState.info
+SITE = "access_profile_site"
+
+# Execution option to leave one query out of profiling and auto_apply
+OPTION = "access_profile"
+
+_SQLALCHEMY_DIR = os.path.dirname(sqlalchemy.__file__)
+
+# =============================================================================
+# PROFILES
+# =============================================================================
+
+
+@dataclass
+class SiteProfile:
+    """What the objects of one entity, from one query call site, were used for."""
+
+    site: str
+    entity: str
+    # Fingerprint of the statement the site runs (see _fingerprint())
+    statement: str = ""
+    # Whether the query brings its own loader options
+    own_options: bool = False
+    queries: int = 0
+    objects: int = 0
+    # Column keys the query selected for the objects
+    loaded: set = field(default_factory=set)
+    # Column keys read from the objects (kept across runs)
+    read: set = field(default_factory=set)
+    # Column keys that were not loaded and got fetched on access
+    lazy: set = field(default_factory=set)
+
+    @property
+    def unused(self):
+        """Columns that were loaded but never read."""
+        return self.loaded - self.read
+
+
+def _call_site(root):
+    """Return ``path/to/file.py:line`` of the first frame outside SQLAlchemy, from an event handler."""
+    # Skip this function and the event handler calling it, and another
+    # profiler's handler when the statement is run from inside it
+    frame = sys._getframe(2)
+    while frame is not None and (
+        frame.f_code.co_filename.startswith(_SQLALCHEMY_DIR) or frame.f_code.co_filename == __file__
+    ):
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+    filename = frame.f_code.co_filename
+    try:
+        filename = os.path.relpath(filename, root)
+    except ValueError:
+        # Another drive on Windows
+        filename = os.path.abspath(filename)
+    return "%s:%d" % (filename.replace(os.sep, "/"), frame.f_lineno)
+
+
+def _fingerprint(statement):
+    """Short hash of a statement's SQL, without its bound values."""
+    return hashlib.sha1(str(statement).encode("utf-8")).hexdigest()[:16]
+
+
+# =============================================================================
+# PROFILER
+# =============================================================================
+
+
+class AccessProfiler:
+    """
+    Record which columns each query's results really use.
+
+    Args:
+        *mapped_classes: Classes to profile, e.g. ``User``.
+        path: JSON file the learned reads are loaded from and saved to.
+        auto_apply: Add the learned ``load_only()`` / ``undefer()`` options
+            to queries that have no loader options.
+        record: Record attribute reads. Turn it off to only apply learned
+            options, without the cost of the ``__getattribute__`` hook.
+        root: Directory call sites are relative to (default: the directory
+            of ``path``, or the working directory).
+
+    Example::
+
+        profiler = AccessProfiler(User, path="access_profile.json")
+        profiler.install()
+        ...                       # run the code
+        profiler.print_report()
+        profiler.save()           # next run: auto_apply=True
+
+        # Leave one query alone
+        session.query(User).execution_options(access_profile=False)
+    """
+
+    def __init__(self, *mapped_classes, path=None, auto_apply=False, record=True, root=None):
+        if not mapped_classes:
+            raise ValueError("pass at least one mapped class")
+        self.mapped_classes = mapped_classes
+        self.path = path
+        self.auto_apply = auto_apply
+        self.record = record
+        if root is None:
+            root = os.path.dirname(os.path.abspath(path)) if path is not None else os.getcwd()
+        self.root = root
+        self.profiles = {}
+        self._hooks = {}
+        self._target = None
+        # Column (or any column proxying it) -> (mapped class, attribute key)
+        self._columns = {
+            column: (mapped_class, prop.key)
+            for mapped_class in mapped_classes
+            for prop in inspect(mapped_class).column_attrs
+            for column in prop.columns
+        }
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as source:
+                for entry in json.load(source):
+                    profile = self._profile(entry["site"], entry["entity"])
+                    profile.statement = entry.get("statement", "")
+                    profile.read.update(entry["read"])
+
+    def _profile(self, site, entity):
+        profile = self.profiles.get((site, entity))
+        if profile is None:
+            profile = self.profiles[site, entity] = SiteProfile(site, entity)
+        return profile
+
+    # -------------------------------------------------------------------------
+    # Installation
+    # -------------------------------------------------------------------------
+
+    def install(self, target=Session):
+        """
+        Start profiling queries run through ``target``.
+
+        Args:
+            target: ``Session`` class (every session), a ``Session`` or a
+                ``sessionmaker``.
+        """
+        if self._target is not None:
+            return
+        self._target = target
+        event.listen(target, "do_orm_execute", self._on_execute)
+        for mapped_class in self.mapped_classes:
+            if self.record:
+                event.listen(mapped_class, "load", self._on_load)
+                self._hooks[mapped_class] = self._hook(mapped_class)
+
+    def remove(self):
+        """Stop profiling and restore the mapped classes."""
+        if self._target is None:
+            return
+        event.remove(self._target, "do_orm_execute", self._on_execute)
+        for mapped_class, original in self._hooks.items():
+            event.remove(mapped_class, "load", self._on_load)
+            if original is None:
+                del mapped_class.__getattribute__
+            else:
+                mapped_class.__getattribute__ = original
+        self._hooks = {}
+        self._target = None
+
+    @property
+    def installed(self):
+        return self._target is not None
+
+    def _hook(self, mapped_class):
+        """Give ``mapped_class`` a ``__getattribute__`` that records column reads."""
+        original = mapped_class.__dict__.get("__getattribute__")
+        base = mapped_class.__getattribute__
+        columns = frozenset(prop.key for prop in inspect(mapped_class).column_attrs)
+        record = self._record
+
+        def __getattribute__(obj, name):
+            if name in columns:
+                info = base(obj, "_sa_instance_state").info
+                if SITE in info:
+                    record(info[SITE], name, name not in base(obj, "__dict__"))
+            return base(obj, name)
+
+        mapped_class.__getattribute__ = __getattribute__
+        return original
+
+    # -------------------------------------------------------------------------
+    # Events
+    # -------------------------------------------------------------------------
+
+    def _on_execute(self, execute_state):
+        if not execute_state.is_select or execute_state.is_column_load or execute_state.is_relationship_load:
+            return
+        if not execute_state.execution_options.get(OPTION, True):
+            return
+        statement = execute_state.statement
+        # Compound statements (union_all(), ...) have no column descriptions
+        descriptions = getattr(statement, "column_descriptions", None)
+        if not descriptions:
+            return
+        # Whole entities only: select(User.name) returns no objects to watch
+        entities = [
+            description["entity"] for description in descriptions
+            if description.get("entity") in self.mapped_classes and description["expr"] is description["entity"]
+        ]
+        if not entities:
+            return
+        site = _call_site(self.root)
+        fingerprint = _fingerprint(statement)
+        own_options = isinstance(statement, Select) and bool(statement._with_options)
+        for entity in entities:
+            profile = self._profile(site, entity.__name__)
+            if profile.statement != fingerprint:
+                if not profile.queries:
+                    # Learned in an earlier run from another statement: the
+                    # code at this line changed, so do not apply it
+                    profile.read.clear()
+                profile.statement = fingerprint
+            profile.own_options = profile.own_options or own_options
+            profile.queries += 1
+
+        if self.auto_apply and isinstance(statement, Select) and not own_options:
+            # Only queries of one class, e.g. session.query(User)
+            if len(descriptions) == 1:
+                options = self.learned_options(site, entities[0])
+                if options:
+                    execute_state.statement = statement.options(*options)
+
+        if not self.record:
+            return None
+        if execute_state.execution_options.get("yield_per") or execute_state.load_options._yield_per:
+            # Streamed: tag the objects as they are loaded
+            execute_state.update_execution_options(**{SITE: site})
+            return None
+        # Buffer the result so objects already in the identity map (no load
+        # event for them) are attributed to this query too
+        result = execute_state.invoke_statement()
+        selected = self._selected(result)
+        frozen = result.freeze()
+        hooked = tuple(self._hooks)
+        for row in frozen.data:
+            # Single-entity results hold the objects themselves, not rows
+            for value in (row,) if isinstance(row, hooked) else row:
+                if isinstance(value, hooked):
+                    self._tag(inspect(value), site, selected)
+        return frozen()
+
+    def _selected(self, result):
+        """Return ``{mapped class: column keys}`` the result's SQL selected, or None if unknown."""
+        cursor = getattr(result, "raw", None)
+        compiled = getattr(getattr(cursor, "context", None), "compiled", None)
+        if compiled is None:
+            return None
+        selected = {}
+        for result_column in compiled._result_columns:
+            for expression in result_column.objects:
+                # Columns of aliased(User) proxy the mapped ones
+                for column in getattr(expression, "proxy_set", ()):
+                    if column in self._columns:
+                        mapped_class, key = self._columns[column]
+                        selected.setdefault(mapped_class, set()).add(key)
+        return selected
+
+    def _on_load(self, target, context):
+        site = context.execution_options.get(SITE)
+        if site is not None:
+            # A freshly loaded object holds just what this query selected
+            self._tag(inspect(target), site)
+
+    def _tag(self, state, site, selected=None):
+        """Attribute ``state``'s object to ``site`` and note the columns the query selected."""
+        mapper = state.mapper
+        # The primary key is always loaded; it identifies the object
+        primary_key = {mapper.get_property_by_column(column).key for column in mapper.primary_key}
+        if selected is None:
+            loaded = {prop.key for prop in mapper.column_attrs if prop.key in state.dict}
+        else:
+            # Objects from the identity map may hold columns of earlier queries
+            loaded = selected.get(state.class_, set())
+        loaded = loaded - primary_key
+        profile = self._profile(site, state.class_.__name__)
+        profile.objects += 1
+        profile.loaded.update(loaded)
+        state.info[SITE] = (profile, frozenset(prop.key for prop in mapper.column_attrs) - loaded - primary_key)
+
+    def _record(self, entry, name, missing):
+        profile, unloaded = entry
+        profile.read.add(name)
+        if missing and name in unloaded:
+            profile.lazy.add(name)
+
+    # -------------------------------------------------------------------------
+    # Reports
+    # -------------------------------------------------------------------------
+
+    def _learned(self, site, mapped_class):
+        """Return ``("load_only" or "undefer", keys)`` for a call site, or None."""
+        profile = self.profiles.get((site, mapped_class.__name__))
+        if profile is None or not profile.read:
+            return None
+        mapper = inspect(mapped_class)
+        primary_key = {mapper.get_property_by_column(column).key for column in mapper.primary_key}
+        defaults = {prop.key for prop in mapper.column_attrs if not prop.deferred} - primary_key
+        if defaults - profile.read:
+            return "load_only", sorted(profile.read)
+        deferred = sorted(key for key in profile.read if mapper.get_property(key).deferred)
+        return ("undefer", deferred) if deferred else None
+
+    def learned_options(self, site, mapped_class):
+        """
+        Return the loader options learned for ``mapped_class`` at ``site``.
+
+        Args:
+            site: Call site, e.g. ``"app.py:42"``.
+            mapped_class: The queried class.
+
+        Returns:
+            list: ``[load_only(...)]`` if some default column is never
+            read, ``[undefer(...), ...]`` if deferred columns are read and
+            every default one is too, or ``[]``.
+        """
+        learned = self._learned(site, mapped_class)
+        if learned is None:
+            return []
+        kind, keys = learned
+        attributes = [getattr(mapped_class, key) for key in keys]
+        if kind == "load_only":
+            return [load_only(*attributes)]
+        return [undefer(attribute) for attribute in attributes]
+
+    def describe_options(self, site, mapped_class):
+        """Return ``learned_options()`` as source code, e.g. ``"load_only(User.id, User.name)"``."""
+        learned = self._learned(site, mapped_class)
+        if learned is None:
+            return ""
+        kind, keys = learned
+        attributes = ["%s.%s" % (mapped_class.__name__, key) for key in keys]
+        if kind == "load_only":
+            return "load_only(%s)" % ", ".join(attributes)
+        return ", ".join("undefer(%s)" % attribute for attribute in attributes)
+
+    def report(self):
+        """Return the ``SiteProfile`` objects, ordered by call site."""
+        return sorted(self.profiles.values(), key=lambda profile: (profile.site, profile.entity))
+
+    def print_report(self):
+        """Print unused and lazily fetched columns and the learned options per call site."""
+        classes = {mapped_class.__name__: mapped_class for mapped_class in self.mapped_classes}
+        print("📊 Attribute Access Profile")
+        print("=" * 50)
+        for profile in self.report():
+            if not profile.queries:
+                continue
+            queries = "query" if profile.queries == 1 else "queries"
+            print(f"   {profile.site} {profile.entity}: {profile.objects} objects from {profile.queries} {queries}")
+            print(f"      loaded, never read: {', '.join(sorted(profile.unused)) or '-'}")
+            print(f"      fetched lazily:     {', '.join(sorted(profile.lazy)) or '-'}")
+            if profile.own_options:
+                # auto_apply leaves these queries alone
+                print("      learned options:    - (the query sets its own)")
+            else:
+                print(f"      learned options:    {self.describe_options(profile.site, classes[profile.entity]) or '-'}")
+
+    def save(self, path=None):
+        """Write the learned reads to ``path`` (default: the constructor's)."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("no path to save the profile to")
+        entries = [
+            {"site": profile.site, "entity": profile.entity, "statement": profile.statement, "read": sorted(profile.read)}
+            for profile in self.report() if profile.read
+        ]
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(entries, output, indent=2)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def run_benchmark(rows=100_000, repeats=3):
+    """
+    Profile a report that reads two columns, then rerun it with the learned options.
+
+    Args:
+        rows: Number of users.
+        repeats: Runs per case (the best one is reported).
+    """
+    from models import User
+
+    def name_and_age_report(session):
+        return [(user.name, user.age) for user in session.query(User).all()]
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "profile.db"))
+        inspect(User).local_table.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                inspect(User).local_table.insert(),
+                [{"name": f"User {i}", "age": 18 + i % 60, "email": f"user{i}@example.com", "password": "x" * 60}
+                 for i in range(rows)],
+            )
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+        path = os.path.join(directory, "access_profile.json")
+
+        print("📊 Access Profiler Benchmark")
+        print("=" * 50)
+        print(f"   {rows:,} users, report reads name and age, best of {repeats}")
+        profiler = AccessProfiler(User, path=path)
+        profiler.install()
+        with Session(engine) as session:
+            name_and_age_report(session)
+        profiler.remove()
+        profiler.save()
+        profiler.print_report()
+
+        cases = [
+            ("as written", None),
+            ("learned options", AccessProfiler(User, path=path, auto_apply=True, record=False)),
+        ]
+        for label, applying in cases:
+            if applying is not None:
+                applying.install()
+            best = float("inf")
+            for _ in range(repeats):
+                with Session(engine) as session:
+                    statements.clear()
+                    started = time.perf_counter()
+                    name_and_age_report(session)
+                    best = min(best, time.perf_counter() - started)
+            if applying is not None:
+                applying.remove()
+            print(f"   {label:<16}{best * 1000:>10.1f} ms   {len(statements):>8,} statements")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile attribute access and apply the learned loader options")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.repeats)
@@ -1,7 +1,25 @@
-from models import session, User
+from models import session, User, reset_database
 from sqlalchemy.orm import defer, undefer, load_only, undefer_group
+from access_profiler import AccessProfiler
+import os
 import random
 
+# PROFILE_ACCESS=1 python app.py reports, per query, the columns that were
+# loaded but never read and the deferred ones fetched lazily, and saves what
+# it learned. PROFILE_ACCESS=apply also adds the learned load_only()/undefer()
+# options to the queries below that have no options of their own
+profiler = None
+if os.environ.get("PROFILE_ACCESS"):
+    profiler = AccessProfiler(
+        User,
+        path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "access_profile.json"),
+        auto_apply=os.environ["PROFILE_ACCESS"] == "apply",
+    )
+    profiler.install()
+
+# The demo seeds its own data, so start from empty tables
+reset_database()
+
 
 
 # List of names, ages, and emails
@@ -100,4 +118,32 @@ users = session.query(User).options(
 ).order_by(User.name).all()
 print("Ordered by name with load_only(name):")
 for u in users:
-    print(u.name)
\ No newline at end of file
+    print(u.name)
+print("-"*100)
+print()
+print('-'*100)
+
+print("# Batched loading of deferred columns\n")
+# 6) models.py installs BatchUndefer(User): the first user.age loads age for
+#    every user of the same query in one SELECT ... WHERE id IN (...).
+#    execution_options(batch_undefer=False) goes back to one SELECT per user.
+#    access_profile=False keeps PROFILE_ACCESS=apply from adding options here
+from sqlalchemy import event
+from models import engine
+
+statements = []
+count_statements = lambda *args: statements.append(1)  # noqa: E731
+event.listen(engine, "before_cursor_execute", count_statements)
+for batched in (True, False):
+    session.expunge_all()
+    users = session.query(User).execution_options(batch_undefer=batched, access_profile=False).all()
+    statements.clear()
+    ages = [u.age for u in users]
+    print(f"batch_undefer={batched}: {len(ages)} ages loaded with {len(statements)} SELECT(s)")
+event.remove(engine, "before_cursor_execute", count_statements)
+
+if profiler is not None:
+    profiler.remove()
+    profiler.save()
+    print()
+    profiler.print_report()
@@ -0,0 +1,264 @@
+"""
+SQLAlchemy Deferred Columns Tutorial - Batched Undefer Loading
+
+``deferred()`` columns are left out of the SELECT and loaded when first
+touched, one object at a time:
+
+    for user in session.query(User).all():   # 1 SELECT
+        print(user.age)                      # + 1 SELECT per user
+
+``BatchUndefer`` makes that first access load the column (or its whole
+deferred group) for *every* object that came from the same query and
+still lacks it, with one ``SELECT id, age FROM users WHERE id IN (...)``
+per 500 objects - what ``selectinload()`` does for relationships:
+
+    for user in session.query(User).all():   # 1 SELECT
+        print(user.age)                      # + 1 SELECT in total
+
+How it works: a ``load`` event records the objects each query returns
+and installs a per-object loader callable on their unloaded deferred
+attributes (the same hook ``defer()`` uses). On first access the loader
+gathers the objects of that query still waiting for the attribute and
+fills them with ``set_committed_value()``, which also removes the
+callable. Attributes using ``raiseload`` keep raising, values changed in
+Python are left alone, and expiring an object (e.g. ``commit()``) drops
+back to the mapper's per-object loading.
+
+Key Concepts Covered:
+- ``deferred()`` columns and deferred groups
+- Instance ``load`` events and per-object loader callables
+- Batching lazy loads with ``WHERE id IN (...)``
+- Counting statements to catch N+1 queries
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, inspect, select, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.base import ATTR_WAS_SET, PASSIVE_NO_RESULT, PassiveFlag
+from sqlalchemy.orm.exc import DetachedInstanceError, ObjectDeletedError
+
+# Objects per IN (...) statement, the same as selectinload()
+CHUNK_SIZE = 500
+
+# Execution option to turn batching off for one query
+OPTION = "batch_undefer"
+
+# =============================================================================
+# LOADER
+# =============================================================================
+
+
+class _Batch:
+    """The objects one query returned and their loaders, one per deferred group."""
+
+    __slots__ = ("states", "loaders")
+
+    def __init__(self):
+        self.states = []
+        self.loaders = {}
+
+
+class _GroupLoader:
+    """Loader callable shared by every object of a batch for one deferred group."""
+
+    __slots__ = ("owner", "batch", "keys")
+
+    def __init__(self, owner, batch, keys):
+        self.owner = owner
+        self.batch = batch
+        self.keys = keys
+
+    def __call__(self, state, passive):
+        if not passive & PassiveFlag.SQL_OK:
+            return PASSIVE_NO_RESULT
+        self.owner._load(self, state)
+        if any(key not in state.dict for key in self.keys):
+            # The row was deleted since the query ran
+            raise ObjectDeletedError(state)
+        return ATTR_WAS_SET
+
+
+class BatchUndefer:
+    """
+    Load deferred columns for a whole query result on first access.
+
+    Args:
+        mapped_class: The mapped class, e.g. ``User``.
+        chunk_size: Objects per ``IN (...)`` statement.
+
+    Example::
+
+        batch_undefer = BatchUndefer(User)
+        batch_undefer.install()
+        users = session.query(User).all()
+        ages = [u.age for u in users]    # one extra SELECT, not len(users)
+
+        # Opt out for one query
+        session.query(User).execution_options(batch_undefer=False)
+    """
+
+    def __init__(self, mapped_class, chunk_size=CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        self.mapped_class = mapped_class
+        self.chunk_size = chunk_size
+        self._groups = None
+
+    @property
+    def groups(self):
+        """``{attribute key: tuple of keys loaded together}`` for the column attributes."""
+        if self._groups is None:
+            mapper = inspect(self.mapped_class)
+            groups = {}
+            for prop in mapper.column_attrs:
+                if prop.deferred and prop.group:
+                    groups.setdefault(prop.group, []).append(prop.key)
+            self._groups = {
+                prop.key: tuple(groups[prop.group]) if prop.deferred and prop.group else (prop.key,)
+                for prop in mapper.column_attrs
+            }
+        return self._groups
+
+    # -------------------------------------------------------------------------
+    # Installation
+    # -------------------------------------------------------------------------
+
+    def install(self):
+        """Start batching for every query of the class (and its subclasses)."""
+        if not self.installed:
+            event.listen(self.mapped_class, "load", self._on_load, propagate=True)
+
+    def remove(self):
+        """Stop batching; objects already loaded keep their batch."""
+        if self.installed:
+            event.remove(self.mapped_class, "load", self._on_load)
+
+    @property
+    def installed(self):
+        return event.contains(self.mapped_class, "load", self._on_load)
+
+    # -------------------------------------------------------------------------
+    # Events
+    # -------------------------------------------------------------------------
+
+    def _on_load(self, target, context):
+        if not context.execution_options.get(OPTION, context.query.get_execution_options().get(OPTION, True)):
+            return
+        state = inspect(target)
+        mapper = state.mapper
+        unloaded = [
+            prop.key for prop in mapper.column_attrs
+            if prop.key not in state.dict and not prop.raiseload
+            and not getattr(state.callables.get(prop.key), "raiseload", False)
+        ]
+        if not unloaded:
+            return
+
+        batch = context.attributes.get((OPTION, self))
+        if batch is None:
+            batch = context.attributes[(OPTION, self)] = _Batch()
+        batch.states.append(state)
+        if "callables" not in state.__dict__:
+            state.callables = {}
+        for key in unloaded:
+            keys = self.groups.get(key, (key,))
+            loader = batch.loaders.get(keys)
+            if loader is None:
+                loader = batch.loaders[keys] = _GroupLoader(self, batch, keys)
+            state.callables[key] = loader
+
+    def _load(self, loader, state):
+        """Load ``loader.keys`` for ``state`` and every object of its batch still waiting."""
+        session = state.session
+        if session is None:
+            raise DetachedInstanceError(
+                "Parent instance %r is not bound to a Session; deferred load of %s cannot proceed"
+                % (state.obj(), ", ".join(loader.keys))
+            )
+        pending = [state] + [
+            other for other in loader.batch.states
+            if other is not state and other.session_id == state.session_id and other.obj() is not None
+            and any(other.callables.get(key) is loader for key in loader.keys)
+        ]
+
+        mapper = state.mapper
+        primary_key = mapper.primary_key
+        columns = [mapper.get_property(key).columns[0].label(key) for key in loader.keys]
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = {other.key[1]: other for other in pending[start:start + self.chunk_size]}
+            if len(primary_key) == 1:
+                where = primary_key[0].in_([identity[0] for identity in chunk])
+            else:
+                where = tuple_(*primary_key).in_(list(chunk))
+            with session.no_autoflush:
+                rows = session.execute(select(*primary_key, *columns).where(where))
+                for row in rows:
+                    other = chunk[tuple(row[:len(primary_key)])]
+                    instance = other.obj()
+                    for key, value in zip(loader.keys, row[len(primary_key):]):
+                        # Keep values assigned in Python since the query ran
+                        if key not in other.dict and instance is not None:
+                            set_committed_value(instance, key, value)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def run_benchmark(rows=20_000, repeats=3):
+    """
+    Touch a deferred column on every user, per-object vs batched.
+
+    Args:
+        rows: Number of users.
+        repeats: Runs per case (the best one is reported).
+    """
+    # models.py installs the loader; the per-object runs opt out per query
+    from models import User, batch_undefer
+
+    batch_undefer.install()
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "deferred.db"))
+        inspect(User).local_table.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                inspect(User).local_table.insert(),
+                [{"name": f"User {i}", "age": 18 + i % 60, "email": f"user{i}@example.com", "password": "secret"}
+                 for i in range(rows)],
+            )
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+        print("📊 Batched Undefer Benchmark")
+        print("=" * 50)
+        print(f"   {rows:,} users, touching user.age and user.email, best of {repeats}")
+        for batched in (False, True):
+            best = float("inf")
+            for _ in range(repeats):
+                with Session(engine) as session:
+                    statements.clear()
+                    started = time.perf_counter()
+                    for user in session.query(User).execution_options(batch_undefer=batched).all():
+                        user.age, user.email
+                    best = min(best, time.perf_counter() - started)
+            label = "batched" if batched else "per object"
+            print(f"   {label:<12}{best * 1000:>10.1f} ms   {len(statements):>8,} statements")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched loading of deferred columns")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.repeats)
@@ -1,6 +1,11 @@
 import os
+import sys
 from sqlalchemy import create_engine, Column, Integer, String
-from sqlalchemy.orm import declarative_base, deferred, sessionmaker
+from sqlalchemy.orm import declarative_base, deferred, scoped_session, sessionmaker
+from batch_undefer import BatchUndefer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from schema_sync import reset_schema, sync_schema  # noqa: E402
 
 
 engine = create_engine(
@@ -8,7 +13,8 @@ engine = create_engine(
 )
 
 Session = sessionmaker(bind=engine)
-session = Session()
+# One session per thread instead of a single shared Session()
+session = scoped_session(Session)
 
 Base = declarative_base()
 
@@ -40,6 +46,18 @@ class User(BaseModel):
             self.age,
             self.email,
         )
-        
-Base.metadata.drop_all(engine)
-Base.metadata.create_all(engine)
\ No newline at end of file
+
+
+# Touching a deferred column on one user loads it for every user of the
+# same query in one SELECT ... WHERE id IN (...), instead of one per user
+batch_undefer = BatchUndefer(User)
+batch_undefer.install()
+
+# Only run DDL when the models changed since the last start; wiping the
+# data is an explicit reset_database() call
+sync_schema(engine, Base.metadata)
+
+
+def reset_database():
+    """Drop and recreate all tables (deletes every row)."""
+    reset_schema(engine, Base.metadata)
@@ -1,5 +1,9 @@
-from models import session, User, Post
-from sqlalchemy import func
+from models import engine, session, User, Post, reset_database
+from bulk_load import seed_users_with_posts
+from streaming import users_with_posts
+
+# The demo seeds its own data, so start from empty tables
+reset_database()
 
 
 
@@ -18,28 +22,22 @@ print(session.query(User).where(User.id == post.user_id).first())
 
 
 
-session.add_all(
-    [
-        User(
-            name = f"User {y}",
-            age = (y/2+1)*((1/2) * y),
-            posts = [
-                Post(
-                    title = f'This is the title for {y * 10 + x}',
-                    content = f'This is the content for {y * 10 + x}',
-                ) for x in range(50)
-            ],
-        ) for y in range(10_000)
-    ]
-)
-session.commit()
+# Seed 10,000 users with 50 posts each.
+# The ORM add_all() version pushed all 500k rows through one unit of work,
+# bulk_load.py streams them through Core executemany batches instead
+# (run `python bulk_load.py` to benchmark both paths)
+print(seed_users_with_posts(engine, users=10_000, posts_per_user=50))
 
 
 #print(*session.query(User).all(), sep='\n')
 print('-'*100)
-print(*session.query(User).where(Post.user_id == User.id).all(), sep='\n')
+# Stream users that have posts instead of materializing (and duplicating) every row
+for user in users_with_posts(session):
+    print(user)
 print('-'*100)
-print(*session.query(User.name, func.count(Post.id)).join(Post).group_by(User).all(), sep='\n')
+# post_count is maintained by triggers, so no GROUP BY scan over posts is needed
+# (the old report: session.query(User.name, func.count(Post.id)).join(Post).group_by(User))
+print(*session.query(User.name, User.post_count).filter(User.post_count > 0).all(), sep='\n')
 
 
 #print('-'*100) 
@@ -0,0 +1,294 @@
+"""
+SQLAlchemy Bulk Loading Tutorial - High-Throughput Seeding with Core INSERT
+
+This module shows how to load large parent/child datasets (e.g. 10,000 users
+with 50 posts each) without pushing every row through the ORM unit of work.
+Rows are streamed in fixed-size batches and written with Core ``insert()``
+executemany, so memory stays bounded by the batch size instead of the
+dataset size.
+
+Key Concepts Covered:
+- Core ``insert()`` with executemany parameter lists
+- Bulk primary key assignment (no RETURNING round trip per parent)
+- Streaming records through bounded batches
+- Measuring throughput (rows/sec) against the ORM ``add_all()`` path
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import create_engine, func, insert, select
+
+# =============================================================================
+# LOAD STATISTICS
+# =============================================================================
+
+
+@dataclass
+class LoadStats:
+    """
+    Counters collected while a bulk load runs.
+
+    Attributes:
+        parents: Number of parent rows inserted.
+        children: Number of child rows inserted.
+        batches: Number of executemany batches flushed.
+        seconds: Wall-clock time spent loading.
+    """
+
+    parents: int = 0
+    children: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows(self):
+        """int: Total number of rows inserted."""
+        return self.parents + self.children
+
+    @property
+    def rows_per_second(self):
+        """float: Insert throughput for the whole load."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return "%d rows (%d parents, %d children) in %.2fs -> %.0f rows/sec" % (
+            self.rows,
+            self.parents,
+            self.children,
+            self.seconds,
+            self.rows_per_second,
+        )
+
+
+# =============================================================================
+# BULK LOADER
+# =============================================================================
+
+
+def next_primary_key(connection, model):
+    """
+    Return the first free integer primary key for ``model``.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+        model: A mapped class with a single integer ``id`` primary key.
+
+    Returns:
+        int: ``max(id) + 1`` or ``1`` for an empty table.
+    """
+    current = connection.execute(select(func.max(model.id))).scalar()
+    return (current or 0) + 1
+
+
+def bulk_load(
+    engine,
+    parent_model,
+    child_model,
+    records: Iterable[Tuple[Dict, Sequence[Dict]]],
+    foreign_key: str,
+    batch_size: int = 10_000,
+):
+    """
+    Stream parent rows and their children into the database in batches.
+
+    Parent primary keys are assigned in Python from ``max(id) + 1`` so child
+    rows can reference their parent without reading anything back. Each batch
+    is written with one executemany per table and committed, which keeps both
+    Python memory and the SQLite journal bounded by ``batch_size``.
+
+    The loader assumes it is the only writer to ``parent_model`` while it
+    runs (the usual situation when seeding a database).
+
+    Args:
+        engine: SQLAlchemy engine to load into.
+        parent_model: Mapped parent class, e.g. ``User``.
+        child_model: Mapped child class, e.g. ``Post``.
+        records: Iterable of ``(parent_values, [child_values, ...])`` pairs.
+            May be a generator; it is consumed lazily.
+        foreign_key: Name of the child column that references the parent id.
+        batch_size: Number of rows (parents + children) per flushed batch.
+
+    Returns:
+        LoadStats: Row counts, batch count and throughput for the load.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    stats = LoadStats()
+    parent_insert = insert(parent_model.__table__)
+    child_insert = insert(child_model.__table__)
+    parents: List[Dict] = []
+    children: List[Dict] = []
+
+    def flush(connection):
+        # Parents first so the children never point at a missing row
+        if parents:
+            connection.execute(parent_insert, parents)
+        if children:
+            connection.execute(child_insert, children)
+        connection.commit()
+        stats.parents += len(parents)
+        stats.children += len(children)
+        stats.batches += 1
+        parents.clear()
+        children.clear()
+
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        next_id = next_primary_key(connection, parent_model)
+        for parent_values, child_values in records:
+            parents.append(dict(parent_values, id=next_id))
+            for values in child_values:
+                children.append(dict(values, **{foreign_key: next_id}))
+            next_id += 1
+            if len(parents) + len(children) >= batch_size:
+                flush(connection)
+        if parents or children:
+            flush(connection)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+# =============================================================================
+# TUTORIAL DATASET
+# =============================================================================
+
+
+def generate_users_with_posts(users=10_000, posts_per_user=50):
+    """
+    Lazily generate the User/Post dataset used by ``app.py``.
+
+    Args:
+        users: Number of users to generate.
+        posts_per_user: Number of posts attached to each user.
+
+    Yields:
+        tuple: ``(user_values, [post_values, ...])`` for each user.
+    """
+    for y in range(users):
+        user = {"name": f"User {y}", "age": (y / 2 + 1) * ((1 / 2) * y)}
+        posts = [
+            {
+                "title": f"This is the title for {y * 10 + x}",
+                "content": f"This is the content for {y * 10 + x}",
+            }
+            for x in range(posts_per_user)
+        ]
+        yield user, posts
+
+
+def seed_users_with_posts(engine, users=10_000, posts_per_user=50, batch_size=10_000):
+    """
+    Bulk-load the tutorial dataset of users and their posts.
+
+    Args:
+        engine: SQLAlchemy engine to load into.
+        users: Number of users to create.
+        posts_per_user: Number of posts per user.
+        batch_size: Rows per executemany batch.
+
+    Returns:
+        LoadStats: Statistics for the load.
+    """
+    from models import Post, User
+
+    return bulk_load(
+        engine,
+        User,
+        Post,
+        generate_users_with_posts(users, posts_per_user),
+        foreign_key="user_id",
+        batch_size=batch_size,
+    )
+
+
+# =============================================================================
+# BENCHMARK: ORM UNIT OF WORK VS CORE BULK LOAD
+# =============================================================================
+
+
+def _orm_seed(engine, users, posts_per_user):
+    """Load the dataset the way ``app.py`` originally did (one big add_all)."""
+    from sqlalchemy.orm import Session
+
+    from models import Post, User
+
+    stats = LoadStats()
+    started = time.perf_counter()
+    with Session(engine) as session:
+        session.add_all(
+            [
+                User(
+                    name=user["name"],
+                    age=user["age"],
+                    posts=[Post(**values) for values in posts],
+                )
+                for user, posts in generate_users_with_posts(users, posts_per_user)
+            ]
+        )
+        session.commit()
+    stats.seconds = time.perf_counter() - started
+    stats.parents = users
+    stats.children = users * posts_per_user
+    stats.batches = 1
+    return stats
+
+
+def _measure(label, load):
+    """Run ``load()`` against a fresh database and print throughput/memory."""
+    from models import Base
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "bench.db"))
+        Base.metadata.create_all(engine)
+        tracemalloc.start()
+        stats = load(engine)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        engine.dispose()
+    print(f"   {label:<12} {stats} | peak {peak / 1024 / 1024:.1f} MiB")
+    return stats
+
+
+def run_benchmark(users=10_000, posts_per_user=50, batch_size=10_000):
+    """
+    Compare the ORM ``add_all()`` path with the Core bulk loader.
+
+    Args:
+        users: Number of users to load.
+        posts_per_user: Number of posts per user.
+        batch_size: Rows per executemany batch for the bulk loader.
+
+    Returns:
+        dict: ``{"orm": LoadStats, "bulk": LoadStats}``.
+    """
+    print("📊 Bulk Load Benchmark")
+    print("=" * 50)
+    print(f"   {users} users x {posts_per_user} posts, batch_size={batch_size}")
+    orm = _measure("ORM add_all", lambda engine: _orm_seed(engine, users, posts_per_user))
+    bulk = _measure(
+        "Core bulk",
+        lambda engine: seed_users_with_posts(engine, users, posts_per_user, batch_size),
+    )
+    if orm.seconds and bulk.seconds:
+        print(f"   🚀 Speedup: {orm.seconds / bulk.seconds:.1f}x")
+    return {"orm": orm, "bulk": bulk}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bulk seeding of users/posts")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--posts-per-user", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    run_benchmark(args.users, args.posts_per_user, args.batch_size)
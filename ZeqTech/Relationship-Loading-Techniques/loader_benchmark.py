@@ -0,0 +1,288 @@
+"""
+SQLAlchemy Loader Strategy Benchmark - Choosing ``lazy=`` From Data
+
+``models.py`` lists the relationship loading strategies for ``User.posts``
+in a comment. This module measures them: the same access patterns run under
+every strategy (applied per query with loader options, so the model does not
+have to change) and each run records wall time, SQL statement count, rows
+fetched from the cursor and peak Python memory. Results are printed as a
+table and can be written as a JSON report.
+
+Key Concepts Covered:
+- Loader options: ``lazyload``, ``joinedload``, ``subqueryload``,
+  ``selectinload``, ``noload``, ``raiseload``
+- Counting statements with ``before_cursor_execute`` events
+- Counting fetched rows at the DBAPI cursor level
+- Measuring peak memory with ``tracemalloc``
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+from sqlalchemy import create_engine, event, exc, select
+from sqlalchemy.orm import (
+    Session,
+    joinedload,
+    lazyload,
+    noload,
+    raiseload,
+    selectinload,
+    subqueryload,
+)
+
+# =============================================================================
+# STRATEGIES AND ACCESS PATTERNS
+# =============================================================================
+
+# Strategy name (as used in ``relationship(lazy=...)``) -> loader option
+STRATEGIES = {
+    "select": lazyload,
+    "joined": joinedload,
+    "subquery": subqueryload,
+    "selectin": selectinload,
+    "noload": noload,
+    "raise": raiseload,
+}
+
+
+def iterate_users(users, relationship_name):
+    """Touch only the parent rows."""
+    for user in users:
+        user.name
+
+
+def touch_posts(users, relationship_name):
+    """Walk every child of every parent."""
+    for user in users:
+        for post in getattr(user, relationship_name):
+            post.title
+
+
+def count_posts(users, relationship_name):
+    """Count the children of every parent."""
+    for user in users:
+        len(getattr(user, relationship_name))
+
+
+ACCESS_PATTERNS = {
+    "iterate_users": iterate_users,
+    "touch_posts": touch_posts,
+    "count_posts": count_posts,
+}
+
+# =============================================================================
+# INSTRUMENTED ENGINE
+# =============================================================================
+
+
+class QueryCounter:
+    """
+    Statement and row counters shared by an instrumented engine.
+
+    Attributes:
+        statements: Number of statements sent to the database.
+        rows: Number of rows fetched from DBAPI cursors.
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+
+    def reset(self):
+        """Zero both counters before a measured run."""
+        self.statements = 0
+        self.rows = 0
+
+
+def create_counting_engine(path):
+    """
+    Create a SQLite engine whose statements and fetched rows are counted.
+
+    Args:
+        path: Path of the SQLite database file.
+
+    Returns:
+        tuple: ``(engine, QueryCounter)``.
+    """
+    counter = QueryCounter()
+
+    class CountingCursor(sqlite3.Cursor):
+        def fetchone(self):
+            row = super().fetchone()
+            if row is not None:
+                counter.rows += 1
+            return row
+
+        def fetchmany(self, *args, **kwargs):
+            rows = super().fetchmany(*args, **kwargs)
+            counter.rows += len(rows)
+            return rows
+
+        def fetchall(self):
+            rows = super().fetchall()
+            counter.rows += len(rows)
+            return rows
+
+    class CountingConnection(sqlite3.Connection):
+        def cursor(self, factory=CountingCursor):
+            return super().cursor(factory)
+
+    engine = create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(path, factory=CountingConnection),
+    )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        counter.statements += 1
+
+    return engine, counter
+
+
+# =============================================================================
+# BENCHMARK RUNNER
+# =============================================================================
+
+
+def run_case(engine, counter, parent_model, relationship_name, strategy, pattern):
+    """
+    Load every parent under one strategy and replay one access pattern.
+
+    Args:
+        engine: Engine created by ``create_counting_engine()``.
+        counter: The engine's ``QueryCounter``.
+        parent_model: Mapped parent class, e.g. ``User``.
+        relationship_name: Name of the collection, e.g. ``"posts"``.
+        strategy: Key of ``STRATEGIES``.
+        pattern: Key of ``ACCESS_PATTERNS``.
+
+    Returns:
+        dict: ``strategy``, ``pattern``, ``seconds``, ``statements``,
+        ``rows_fetched``, ``peak_memory_bytes`` and ``error`` (``None`` or
+        the exception raised, e.g. by the ``raise`` strategy).
+    """
+    with warnings.catch_warnings():
+        # noload() is deprecated in newer releases but still worth measuring
+        warnings.simplefilter("ignore", exc.SADeprecationWarning)
+        option = STRATEGIES[strategy](getattr(parent_model, relationship_name))
+    access = ACCESS_PATTERNS[pattern]
+    error = None
+
+    counter.reset()
+    tracemalloc.start()
+    started = time.perf_counter()
+    with Session(engine) as session:
+        try:
+            users = session.scalars(select(parent_model).options(option)).unique().all()
+            access(users, relationship_name)
+        except exc.InvalidRequestError as err:
+            error = "%s: %s" % (type(err).__name__, err)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "strategy": strategy,
+        "pattern": pattern,
+        "seconds": round(seconds, 6),
+        "statements": counter.statements,
+        "rows_fetched": counter.rows,
+        "peak_memory_bytes": peak,
+        "error": error,
+    }
+
+
+def run_benchmark(sizes=(1_000, 10_000, 100_000), posts_per_user=10,
+                  strategies=None, patterns=None):
+    """
+    Run every strategy/pattern combination at each dataset size.
+
+    Args:
+        sizes: Numbers of users to benchmark with.
+        posts_per_user: Number of posts attached to each user.
+        strategies: Strategy names to run (defaults to all).
+        patterns: Access pattern names to run (defaults to all).
+
+    Returns:
+        dict: Machine-readable report with one result per combination.
+    """
+    from bulk_load import bulk_load, generate_users_with_posts
+    from models import Base, Post, User
+
+    strategies = list(strategies or STRATEGIES)
+    patterns = list(patterns or ACCESS_PATTERNS)
+    report = {
+        "posts_per_user": posts_per_user,
+        "strategies": strategies,
+        "patterns": patterns,
+        "results": [],
+    }
+
+    for users in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            engine, counter = create_counting_engine(os.path.join(directory, "bench.db"))
+            Base.metadata.create_all(engine)
+            bulk_load(
+                engine,
+                User,
+                Post,
+                generate_users_with_posts(users, posts_per_user),
+                foreign_key="user_id",
+            )
+            for strategy in strategies:
+                for pattern in patterns:
+                    result = run_case(engine, counter, User, "posts", strategy, pattern)
+                    result["users"] = users
+                    report["results"].append(result)
+            engine.dispose()
+    return report
+
+
+def print_report(report, stream=sys.stdout):
+    """Print a benchmark report as a fixed-width table."""
+    header = "%8s  %-9s %-14s %10s %10s %12s %10s" % (
+        "users", "strategy", "pattern", "seconds", "statements", "rows", "peak MiB"
+    )
+    print(header, file=stream)
+    print("-" * len(header), file=stream)
+    for r in report["results"]:
+        print(
+            "%8d  %-9s %-14s %10.3f %10d %12d %10.1f%s" % (
+                r["users"],
+                r["strategy"],
+                r["pattern"],
+                r["seconds"],
+                r["statements"],
+                r["rows_fetched"],
+                r["peak_memory_bytes"] / 1024 / 1024,
+                "  (raised)" if r["error"] else "",
+            ),
+            file=stream,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark User.posts loader strategies")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--posts-per-user", type=int, default=10)
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES))
+    parser.add_argument("--patterns", nargs="+", choices=list(ACCESS_PATTERNS))
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, args.posts_per_user, args.strategies, args.patterns)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\n✅ JSON report written to {args.output}")
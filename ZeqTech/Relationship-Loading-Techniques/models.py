@@ -1,6 +1,12 @@
 import os
+import sys
 from sqlalchemy import ForeignKey, create_engine, Column, Integer, String
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.orm import declarative_base, relationship, scoped_session, sessionmaker
+
+from post_counter import DenormalizedCounter
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from schema_sync import reset_schema, sync_schema  # noqa: E402
 
 
 engine = create_engine(
@@ -8,7 +14,8 @@ engine = create_engine(
 )
 
 Session = sessionmaker(bind=engine)
-session = Session()
+# One session per thread instead of a single shared Session()
+session = scoped_session(Session)
 
 Base = declarative_base()
 
@@ -24,6 +31,8 @@ class User(BaseModel):
 
     name = Column(String)
     age = Column(Integer)
+    # Denormalized count(posts) kept current by triggers (see post_counter.py)
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
     # Lazy loading options:
     # 'select' (default) - Loads when accessed (N+1 problem)
     # 'joined' - Uses JOIN to load in single query
@@ -32,6 +41,7 @@ class User(BaseModel):
     #             Best for one-to-many relationships, avoids N+1 queries
     # 'noload' - Never loads the relationship
     # 'raise' - Raises error if accessed
+    # Run `python loader_benchmark.py` to measure every option on real data
     posts = relationship("Post", backref="user", lazy='selectin')
     
 
@@ -58,6 +68,16 @@ class Post(BaseModel):
     
     
 
-        
-Base.metadata.drop_all(engine)
-Base.metadata.create_all(engine)
\ No newline at end of file
+
+# Install the post_count triggers with the tables and keep loaded users fresh
+post_counter = DenormalizedCounter(User, Post, "user_id", "post_count")
+post_counter.attach(Session)
+
+# Only run DDL when the models changed since the last start; wiping the
+# data is an explicit reset_database() call
+sync_schema(engine, Base.metadata)
+
+
+def reset_database():
+    """Drop and recreate all tables (deletes every row)."""
+    reset_schema(engine, Base.metadata)
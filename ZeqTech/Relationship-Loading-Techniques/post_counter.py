@@ -0,0 +1,214 @@
+"""
+SQLAlchemy Denormalized Counter Tutorial - O(1) Post Counts per User
+
+The report ``session.query(User.name, func.count(Post.id)).join(Post)
+.group_by(User)`` scans the whole posts table on every call. This module
+keeps a ``post_count`` column on ``User`` up to date instead:
+
+- SQLite triggers adjust the counter on INSERT, DELETE and re-parenting
+  UPDATEs of ``posts``, so Core bulk inserts (see ``bulk_load.py``) are
+  counted too.
+- An ORM ``after_flush`` hook expires the counter on parents already loaded
+  in the session so they re-read the trigger-maintained value.
+- ``verify``/``rebuild`` recompute the counters from scratch for drift
+  checks and for databases created before the triggers existed.
+
+Key Concepts Covered:
+- ``DDL`` attached to ``after_create`` events
+- SQLite ``AFTER INSERT/DELETE/UPDATE OF`` triggers
+- Session ``after_flush`` / ``after_flush_postexec`` events
+- Verifying and rebuilding denormalized data
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+
+from sqlalchemy import DDL, event, func, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+# =============================================================================
+# DENORMALIZED COUNTER
+# =============================================================================
+
+
+class DenormalizedCounter:
+    """
+    A ``parent.counter`` column that mirrors ``count(child)`` per parent.
+
+    Args:
+        parent_model: Mapped parent class, e.g. ``User``.
+        child_model: Mapped child class, e.g. ``Post``.
+        foreign_key: Child column referencing the parent, e.g. ``"user_id"``.
+        counter: Parent integer column holding the count, e.g. ``"post_count"``.
+    """
+
+    def __init__(self, parent_model, child_model, foreign_key, counter):
+        self.parent_model = parent_model
+        self.child_model = child_model
+        self.foreign_key = foreign_key
+        self.counter = counter
+
+    @property
+    def _names(self):
+        parent = self.parent_model.__table__
+        return {
+            "parent": parent.name,
+            "child": self.child_model.__table__.name,
+            "pk": parent.primary_key.columns.values()[0].name,
+            "fk": self.foreign_key,
+            "counter": self.counter,
+        }
+
+    # ---------------------------------------------------------------------
+    # Triggers
+    # ---------------------------------------------------------------------
+
+    def trigger_ddl(self):
+        """
+        Build the SQLite trigger statements that maintain the counter.
+
+        Returns:
+            list: ``CREATE TRIGGER`` statements for insert, delete and
+            re-parenting of child rows.
+        """
+        names = self._names
+        prefix = "%(child)s_%(counter)s" % names
+        adjust = "UPDATE %(parent)s SET %(counter)s = %(counter)s %%s 1 WHERE %(pk)s = %%s.%(fk)s;" % names
+        return [
+            "CREATE TRIGGER IF NOT EXISTS %s_insert AFTER INSERT ON %s "
+            "WHEN NEW.%s IS NOT NULL BEGIN %s END"
+            % (prefix, names["child"], names["fk"], adjust % ("+", "NEW")),
+            "CREATE TRIGGER IF NOT EXISTS %s_delete AFTER DELETE ON %s "
+            "WHEN OLD.%s IS NOT NULL BEGIN %s END"
+            % (prefix, names["child"], names["fk"], adjust % ("-", "OLD")),
+            "CREATE TRIGGER IF NOT EXISTS %s_update AFTER UPDATE OF %s ON %s "
+            "WHEN OLD.%s IS NOT NEW.%s BEGIN %s %s END"
+            % (
+                prefix,
+                names["fk"],
+                names["child"],
+                names["fk"],
+                names["fk"],
+                adjust % ("-", "OLD"),
+                adjust % ("+", "NEW"),
+            ),
+        ]
+
+    def install(self, connection):
+        """Create the triggers on an existing database (idempotent)."""
+        for statement in self.trigger_ddl():
+            connection.execute(text(statement))
+
+    def attach(self, session_class=Session):
+        """
+        Maintain the counter automatically.
+
+        Registers the triggers to be created with the child table by
+        ``metadata.create_all()`` and hooks ``session_class`` flushes so that
+        parents in the identity map do not keep a stale counter.
+
+        Args:
+            session_class: ``Session`` subclass or ``sessionmaker`` to hook.
+        """
+        for statement in self.trigger_ddl():
+            event.listen(
+                self.child_model.__table__,
+                "after_create",
+                DDL(statement).execute_if(dialect="sqlite"),
+            )
+        event.listen(session_class, "after_flush", self._collect_parents)
+        event.listen(session_class, "after_flush_postexec", self._expire_parents)
+
+    # ---------------------------------------------------------------------
+    # ORM synchronisation
+    # ---------------------------------------------------------------------
+
+    def _collect_parents(self, session, flush_context):
+        touched = session.info.setdefault("_counter_parents", set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if not isinstance(obj, self.child_model):
+                continue
+            history = inspect(obj).attrs[self.foreign_key].history
+            touched.update(history.sum())
+            touched.add(getattr(obj, self.foreign_key, None))
+
+    def _expire_parents(self, session, flush_context):
+        touched = session.info.pop("_counter_parents", set())
+        for parent_id in touched - {None}:
+            key = session.identity_key(self.parent_model, parent_id)
+            parent = session.identity_map.get(key)
+            if parent is not None:
+                session.expire(parent, [self.counter])
+
+    # ---------------------------------------------------------------------
+    # Verification
+    # ---------------------------------------------------------------------
+
+    def _actual_count(self):
+        child_fk = getattr(self.child_model, self.foreign_key)
+        parent_pk = inspect(self.parent_model).primary_key[0]
+        return (
+            select(func.count())
+            .select_from(self.child_model)
+            .where(child_fk == parent_pk)
+            .scalar_subquery()
+        )
+
+    def verify(self, connection):
+        """
+        Compare every stored counter with the real child count.
+
+        Args:
+            connection: Connection or Session to check.
+
+        Returns:
+            list: ``(parent_id, stored, actual)`` tuples for drifted parents.
+        """
+        parent_pk = inspect(self.parent_model).primary_key[0]
+        stored = getattr(self.parent_model, self.counter)
+        actual = self._actual_count()
+        rows = connection.execute(
+            select(parent_pk, stored, actual).where(stored.is_distinct_from(actual))
+        )
+        return [tuple(row) for row in rows]
+
+    def rebuild(self, connection):
+        """
+        Recompute every counter from the child table.
+
+        Args:
+            connection: Connection or Session to update (not committed).
+
+        Returns:
+            int: Number of parent rows updated.
+        """
+        result = connection.execute(
+            update(self.parent_model.__table__).values(
+                {self.counter: self._actual_count()}
+            )
+        )
+        return result.rowcount
+
+
+# =============================================================================
+# COMMAND LINE: VERIFY / REBUILD
+# =============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify or rebuild users.post_count")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    args = parser.parse_args()
+
+    from models import engine, post_counter
+
+    with engine.begin() as connection:
+        if args.command == "rebuild":
+            post_counter.install(connection)
+            print(f"✅ Rebuilt post_count for {post_counter.rebuild(connection)} users")
+        else:
+            drift = post_counter.verify(connection)
+            for user_id, stored, actual in drift[:20]:
+                print(f"   ❌ user {user_id}: stored {stored}, actual {actual}")
+            print(f"{'❌' if drift else '✅'} {len(drift)} users with a wrong post_count")
@@ -0,0 +1,234 @@
+"""
+SQLAlchemy N+1 Detection Tutorial - Statement Budgets for Units of Work
+
+Lazy relationships make it easy to issue one query per object without
+noticing: a ``__repr__`` that calls ``len(self.appointments)``, a loop that
+touches ``user.posts``, a linked list that follows ``next_node``. This module
+listens to the engine's ``before_cursor_execute`` event, counts the
+statements issued inside a logical unit of work and fingerprints their
+shapes. When the unit goes over its statement budget, or repeats the same
+statement shape too often (the N+1 signature), the budget logs a warning or
+raises.
+
+Key Concepts Covered:
+- Engine ``before_cursor_execute`` events
+- Statement fingerprinting (literals and IN lists normalized)
+- Budgets as context managers and decorators
+- Catching N+1 regressions in tests instead of in production
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import functools
+import logging
+import re
+import threading
+from collections import Counter
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# STATEMENT FINGERPRINTS
+# =============================================================================
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def fingerprint(statement):
+    """
+    Reduce a SQL string to its shape.
+
+    Literals become ``?`` and ``IN (?, ?, ?)`` lists collapse to ``IN (?)``,
+    so the same query with different parameters gets the same fingerprint.
+
+    Args:
+        statement: SQL text as sent to the DBAPI cursor.
+
+    Returns:
+        str: The normalized statement.
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+# =============================================================================
+# QUERY BUDGET
+# =============================================================================
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a unit of work issues more statements than its budget."""
+
+
+class QueryBudget:
+    """
+    Count the statements issued by one unit of work and enforce a budget.
+
+    Use it as a context manager::
+
+        with QueryBudget(engine, max_statements=2):
+            users = session.query(User).all()
+            print(users)
+
+    or as a decorator::
+
+        @QueryBudget(engine, max_repeats=3, action="log")
+        def list_doctors(session):
+            ...
+
+    Only statements issued from the thread that entered the budget are
+    counted, so concurrent requests do not pollute each other's numbers.
+
+    Attributes:
+        statements: Total statements counted in the last unit of work.
+        shapes: ``Counter`` of statement fingerprints.
+        violations: Human-readable budget violations (empty when within budget).
+    """
+
+    def __init__(self, engine, max_statements=None, max_repeats=5, action="raise", name=None):
+        """
+        Args:
+            engine: Engine whose statements are counted.
+            max_statements: Maximum number of statements, or ``None`` for no limit.
+            max_repeats: Maximum times a single statement shape may run, or
+                ``None`` for no limit. Exceeding it usually means N+1.
+            action: ``"raise"`` to raise ``QueryBudgetExceeded`` or ``"log"``
+                to log a warning.
+            name: Label used in reports (defaults to the decorated function).
+        """
+        if action not in ("raise", "log"):
+            raise ValueError("action must be 'raise' or 'log'")
+        self.engine = engine
+        self.max_statements = max_statements
+        self.max_repeats = max_repeats
+        self.action = action
+        self.name = name
+        self.statements = 0
+        self.shapes = Counter()
+        self.violations = []
+        self._thread = None
+
+    # ---------------------------------------------------------------------
+    # Event handling
+    # ---------------------------------------------------------------------
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() != self._thread:
+            return
+        self.statements += 1
+        self.shapes[fingerprint(statement)] += 1
+
+    def __enter__(self):
+        self.statements = 0
+        self.shapes = Counter()
+        self.violations = []
+        self._thread = threading.get_ident()
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        self._thread = None
+        self.violations = self._check()
+        # Never hide the original error behind a budget report
+        if self.violations and exc_type is None:
+            message = self.report()
+            if self.action == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            budget = QueryBudget(
+                self.engine,
+                max_statements=self.max_statements,
+                max_repeats=self.max_repeats,
+                action=self.action,
+                name=self.name or func.__qualname__,
+            )
+            with budget:
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    # ---------------------------------------------------------------------
+    # Reporting
+    # ---------------------------------------------------------------------
+
+    def _check(self):
+        violations = []
+        if self.max_statements is not None and self.statements > self.max_statements:
+            violations.append(
+                "%d statements issued, budget is %d" % (self.statements, self.max_statements)
+            )
+        if self.max_repeats is not None:
+            for shape, count in self.shapes.most_common():
+                if count <= self.max_repeats:
+                    break
+                violations.append(
+                    "possible N+1: %d x %s (max %d)" % (count, shape, self.max_repeats)
+                )
+        return violations
+
+    def report(self):
+        """
+        Summarize the unit of work.
+
+        Returns:
+            str: Statement count, violations and the most frequent shapes.
+        """
+        lines = ["%s: %d statements" % (self.name or "unit of work", self.statements)]
+        lines.extend("  ! " + violation for violation in self.violations)
+        for shape, count in self.shapes.most_common(5):
+            lines.append("  %5d x %s" % (count, shape))
+        return "\n".join(lines)
+
+
+# =============================================================================
+# DEMONSTRATION
+# =============================================================================
+
+if __name__ == "__main__":
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session, lazyload, selectinload
+
+    from bulk_load import bulk_load, generate_users_with_posts
+    from models import Base, Post, User
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    print("🚀 N+1 Detection Demo")
+    print("=" * 50)
+
+    demo_engine = create_engine("sqlite://")
+    Base.metadata.create_all(demo_engine)
+    bulk_load(demo_engine, User, Post, generate_users_with_posts(20, 3), "user_id")
+
+    print("\n1️⃣ Lazy loading inside a logging budget:")
+    with Session(demo_engine) as session, QueryBudget(demo_engine, action="log") as budget:
+        for user in session.query(User).options(lazyload(User.posts)):
+            len(user.posts)
+
+    print("\n2️⃣ The same loop inside a raising budget:")
+    try:
+        with Session(demo_engine) as session, QueryBudget(demo_engine, max_statements=2):
+            for user in session.query(User).options(lazyload(User.posts)):
+                len(user.posts)
+    except QueryBudgetExceeded as err:
+        print(f"   ❌ {err.args[0].splitlines()[1].strip()}")
+
+    print("\n3️⃣ selectinload stays within budget:")
+    with Session(demo_engine) as session, QueryBudget(demo_engine, max_statements=2) as budget:
+        for user in session.query(User).options(selectinload(User.posts)):
+            len(user.posts)
+    print(f"   ✅ {budget.statements} statements")
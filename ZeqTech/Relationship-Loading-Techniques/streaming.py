@@ -0,0 +1,221 @@
+"""
+SQLAlchemy Streaming Results Tutorial - Constant-Memory Listing Queries
+
+``query(...).all()`` builds the complete result list in Python before the
+first row can be printed. For a listing such as "every user that has a post"
+over 500k posts that means holding every row, plus the duplicates produced by
+the implicit join. This module streams results instead: rows are fetched with
+``yield_per`` (which turns on ``stream_results``), consumed one partition at a
+time and de-duplicated on the fly, so peak memory depends on the batch size
+rather than on the number of rows.
+
+Key Concepts Covered:
+- ``yield_per`` / ``stream_results`` execution options
+- Partitioned iteration with ``Result.partitions()``
+- On-the-fly de-duplication of ORM entities
+- Generator APIs that print/export code can consume lazily
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Query, Session, lazyload
+from sqlalchemy.orm.attributes import instance_state
+
+# =============================================================================
+# STREAMING API
+# =============================================================================
+
+
+def _as_statement(query):
+    """Accept both legacy ``Query`` objects and 2.0 ``select()`` statements."""
+    if isinstance(query, Query):
+        return query.statement
+    return query
+
+
+def stream_partitions(session, query, batch_size=1000):
+    """
+    Execute ``query`` and yield its results one partition at a time.
+
+    The statement runs with ``yield_per=batch_size`` so rows are fetched from
+    the cursor in chunks and ORM objects are only built for the current
+    chunk. Single-entity statements yield lists of entities, multi-column
+    statements yield lists of ``Row`` objects.
+
+    Args:
+        session: Session used to execute the statement.
+        query: A ``select()`` statement or a legacy ``Query``.
+        batch_size: Number of rows fetched and hydrated per partition.
+
+    Yields:
+        list: The rows of the next partition.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    statement = _as_statement(query)
+    result = session.execute(statement, execution_options={"yield_per": batch_size})
+    if len(statement.column_descriptions) == 1:
+        result = result.scalars()
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        # Release the cursor if the consumer stops early
+        result.close()
+
+
+def _identity(row):
+    """Return the identity key of an ORM entity, or the row itself."""
+    try:
+        return instance_state(row).key
+    except AttributeError:
+        return row
+
+
+def stream_unique(session, query, batch_size=1000, key=None, ordered=False):
+    """
+    Stream the results of ``query`` with duplicate rows removed.
+
+    Duplicates are detected by ORM identity (or by ``key(row)``). By default
+    the identities already seen are remembered, so memory grows with the
+    number of distinct results (e.g. users) but not with the number of
+    duplicate rows (e.g. posts). When the statement is ordered so that
+    duplicates are adjacent (``order_by(User.id)``), pass ``ordered=True`` and
+    only the previous key is kept.
+
+    Args:
+        session: Session used to execute the statement.
+        query: A ``select()`` statement or a legacy ``Query``.
+        batch_size: Number of rows fetched per partition.
+        key: Optional callable returning the de-duplication key of a row.
+        ordered: Whether duplicate rows are guaranteed to be adjacent.
+
+    Yields:
+        The distinct rows/entities in result order.
+    """
+    key = key or _identity
+    seen = set()
+    previous = object()
+    last_row = None
+    for partition in stream_partitions(session, query, batch_size):
+        for row in partition:
+            # Duplicates of the same entity inside a partition are the same
+            # Python object thanks to the identity map, so skip them cheaply
+            if row is last_row:
+                continue
+            last_row = row
+            row_key = key(row)
+            if ordered:
+                if row_key == previous:
+                    continue
+                previous = row_key
+            else:
+                if row_key in seen:
+                    continue
+                seen.add(row_key)
+            yield row
+
+
+def users_with_posts(session, batch_size=1000):
+    """
+    Stream every user that has at least one post, each user once.
+
+    This is the streaming version of
+    ``session.query(User).where(Post.user_id == User.id).all()``.
+    ``User.posts`` is switched to lazy loading for the listing so the
+    ``selectin`` loader does not pull every post in behind each partition.
+
+    Args:
+        session: Session bound to the tutorial database.
+        batch_size: Number of rows fetched per partition.
+
+    Yields:
+        User: Each matching user once.
+    """
+    from models import Post, User
+
+    statement = (
+        select(User).where(Post.user_id == User.id).options(lazyload(User.posts))
+    )
+    return stream_unique(session, statement, batch_size)
+
+
+# =============================================================================
+# BENCHMARK: .all() VS STREAMING
+# =============================================================================
+
+
+def _peak_memory(consume):
+    """Run ``consume()`` under tracemalloc and return (result, peak MiB, seconds)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = consume()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1024 / 1024, seconds
+
+
+def run_benchmark(users=1_000, post_counts=(1, 10, 50), batch_size=1000):
+    """
+    Compare peak memory of ``.all()`` and ``users_with_posts()``.
+
+    Args:
+        users: Number of users in every dataset.
+        post_counts: Posts per user for each dataset size.
+        batch_size: Rows fetched per partition when streaming.
+    """
+    from bulk_load import bulk_load, generate_users_with_posts
+    from models import Base, Post, User
+
+    print("📊 Streaming Listing Benchmark")
+    print("=" * 50)
+    for posts_per_user in post_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine("sqlite:///" + os.path.join(directory, "bench.db"))
+            Base.metadata.create_all(engine)
+            bulk_load(
+                engine,
+                User,
+                Post,
+                generate_users_with_posts(users, posts_per_user),
+                foreign_key="user_id",
+            )
+            with Session(engine) as session:
+                listed, all_peak, all_seconds = _peak_memory(
+                    lambda: len(
+                        session.query(User)
+                        .where(Post.user_id == User.id)
+                        .options(lazyload(User.posts))
+                        .all()
+                    )
+                )
+            with Session(engine) as session:
+                streamed, stream_peak, stream_seconds = _peak_memory(
+                    lambda: sum(1 for _ in users_with_posts(session, batch_size))
+                )
+            engine.dispose()
+        print(
+            f"   {users * posts_per_user:>9} posts | .all(): {listed} rows, "
+            f"{all_peak:.1f} MiB, {all_seconds:.2f}s | streamed: {streamed} users, "
+            f"{stream_peak:.1f} MiB, {stream_seconds:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streaming listings")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--posts-per-user", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    run_benchmark(args.users, args.posts_per_user, args.batch_size)
@@ -0,0 +1,282 @@
+"""
+SQLAlchemy Joins Tutorial - Anti-Joins: NOT EXISTS vs LEFT JOIN ... IS NULL
+
+An anti-join returns the left rows that have no match on the right, e.g.
+the users without an address. SQL offers two spellings:
+
+- ``not_exists``: ``SELECT ... FROM user WHERE NOT EXISTS (SELECT * FROM
+  address WHERE address.user_id = user.id)``, which is what
+  ``User.addresses == None`` renders,
+- ``left_join``: ``SELECT ... FROM user LEFT OUTER JOIN address ON
+  address.user_id = user.id WHERE address.user_id IS NULL``.
+
+Both return the same rows, but SQLite plans them very differently:
+
+- without an index on ``address.user_id`` the correlated ``NOT EXISTS``
+  scans the whole address table once per user (two minutes for 200k
+  users and 20k addresses), while the LEFT JOIN gets an automatic index
+  (about 0.1 s),
+- with the index, ``NOT EXISTS`` stops at the first address of a user,
+  while the LEFT JOIN walks every address of every matched user before
+  discarding them: on dense relationships (many addresses per user)
+  ``NOT EXISTS`` is about twice as fast, on sparse ones the LEFT JOIN is
+  as fast or slightly faster.
+
+``anti_join()`` builds either statement. ``strategy="auto"`` reads
+``table_stats()`` (``sqlite_stat1`` after ``ANALYZE``, ``COUNT(*)``
+otherwise) and the indexes on the join columns to pick one; a hint is
+just ``strategy="not_exists"`` or ``strategy="left_join"``.
+
+Key Concepts Covered:
+- Correlated ``EXISTS`` subqueries vs outer joins
+- Automatic indexes in SQLite
+- Using table statistics (``ANALYZE``) to choose a plan
+- Benchmarking sparse and dense relationships
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import create_engine, exists, func, inspect, select, text
+from sqlalchemy.sql.util import join_condition
+
+from full_join import _dialect, _inspectable, join_columns, right_side_indexed
+
+STRATEGIES = ("auto", "not_exists", "left_join")
+
+# Right rows per left row above which a relationship counts as dense
+DENSE_RATIO = 2.0
+
+# =============================================================================
+# TABLE STATISTICS
+# =============================================================================
+
+
+@dataclass
+class TableStats:
+    """What ``choose_strategy()`` knows about the two sides of an anti-join."""
+
+    left_rows: int
+    right_rows: int
+    indexed: bool
+    source: str = "count"
+
+    @property
+    def density(self):
+        """Right rows per left row: what a LEFT JOIN walks on top of NOT EXISTS."""
+        return self.right_rows / max(self.left_rows, 1)
+
+
+def _sqlite_stat1(connection, table_name):
+    """Return ``{index name or None: [numbers]}`` from ``sqlite_stat1``."""
+    has_stats = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+    ).first()
+    if has_stats is None:
+        return {}
+    rows = connection.execute(text("SELECT idx, stat FROM sqlite_stat1 WHERE tbl = :table"), {"table": table_name})
+    return {index: [int(number) for number in stat.split() if number.isdigit()] for index, stat in rows}
+
+
+def table_stats(bind, left, right, onclause=None):
+    """
+    Collect the row counts of both sides of an anti-join.
+
+    On SQLite the counts come from ``sqlite_stat1`` when ``ANALYZE`` has
+    been run on both tables; otherwise both tables are counted.
+
+    Args:
+        bind: ``Session``, ``Engine`` or ``Connection``.
+        left: Mapped class whose unmatched rows are wanted, e.g. ``User``.
+        right: Mapped class that must not match, e.g. ``Address``.
+        onclause: Join condition (default: inferred from the foreign key).
+
+    Returns:
+        TableStats: The statistics.
+    """
+    connection = _inspectable(bind)
+    if hasattr(connection, "connect"):
+        # An Engine: read everything on one connection
+        with connection.connect() as conn:
+            return table_stats(conn, left, right, onclause)
+
+    left_table = inspect(left).mapper.local_table
+    right_table = inspect(right).mapper.local_table
+    indexed = right_side_indexed(connection, left, right, onclause)
+    if connection.dialect.name == "sqlite":
+        left_stat = _sqlite_stat1(connection, left_table.name)
+        right_stat = _sqlite_stat1(connection, right_table.name)
+        if left_stat and right_stat:
+            # Every entry of a table starts with its row count
+            left_rows = next(iter(left_stat.values()))[0]
+            right_rows = next(iter(right_stat.values()))[0]
+            return TableStats(left_rows, right_rows, indexed, "sqlite_stat1")
+
+    left_rows = connection.execute(select(func.count()).select_from(left_table)).scalar()
+    right_rows = connection.execute(select(func.count()).select_from(right_table)).scalar()
+    return TableStats(left_rows, right_rows, indexed)
+
+
+def choose_strategy(bind, left, right, onclause=None, stats=None):
+    """
+    Pick ``"not_exists"`` or ``"left_join"`` for an anti-join.
+
+    Args:
+        bind: ``Session``, ``Engine`` or ``Connection``.
+        left: Mapped class whose unmatched rows are wanted.
+        right: Mapped class that must not match.
+        onclause: Join condition (default: inferred from the foreign key).
+        stats: ``TableStats`` to use instead of collecting them.
+
+    Returns:
+        str: ``"left_join"`` on SQLite when the right join column has no
+        index or fewer than ``DENSE_RATIO`` right rows per left row,
+        ``"not_exists"`` otherwise.
+    """
+    if _dialect(bind).name != "sqlite":
+        # Other planners turn both spellings into the same anti-join
+        return "not_exists"
+    if stats is None:
+        stats = table_stats(bind, left, right, onclause)
+    if not stats.indexed or stats.density < DENSE_RATIO:
+        return "left_join"
+    return "not_exists"
+
+
+# =============================================================================
+# ANTI-JOIN
+# =============================================================================
+
+
+def anti_join(bind, left, right, *criteria, onclause=None, strategy="auto", stats=None):
+    """
+    Build ``SELECT left`` for the left rows that have no ``right`` match.
+
+    Args:
+        bind: ``Session``, ``Engine`` or ``Connection`` the statement will
+            run on (used by ``strategy="auto"``).
+        left: Mapped class whose unmatched rows are wanted, e.g. ``User``.
+        right: Mapped class that must not match, e.g. ``Address``.
+        *criteria: Filters on the left rows.
+        onclause: Join condition (default: inferred from the foreign key).
+        strategy: ``"auto"`` (see ``choose_strategy()``), ``"not_exists"``
+            or ``"left_join"``.
+        stats: ``TableStats`` for ``strategy="auto"``, e.g. collected once
+            with ``table_stats()`` and reused.
+
+    Returns:
+        Select: A statement returning ``left`` entities.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError("strategy must be one of %s" % ", ".join(STRATEGIES))
+    if strategy == "auto":
+        strategy = choose_strategy(bind, left, right, onclause, stats)
+
+    right_table = inspect(right).mapper.local_table
+    if strategy == "not_exists":
+        if onclause is None:
+            condition = join_condition(inspect(left).mapper.local_table, right_table)
+        elif hasattr(onclause, "property"):
+            condition = onclause.property.primaryjoin
+        else:
+            condition = onclause
+        return select(left).where(~exists().where(condition), *criteria)
+
+    # A matched row has a non-NULL join column, so IS NULL keeps the misses
+    names = sorted(join_columns(left, right, onclause))
+    missing = right_table.c[names[0]] if names else right_table.primary_key.columns[0]
+    return select(left).join_from(left, right, onclause, isouter=True).where(missing.is_(None), *criteria)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+SCENARIOS = {
+    # users, addresses, share of users that have addresses
+    "sparse": (1.0, 0.1, 0.1),
+    "dense": (0.2, 2.0, 0.9),
+}
+
+
+def run_benchmark(users=1_000_000, repeats=3, max_scan=10**9):
+    """
+    Time both anti-join spellings on sparse and dense relationships.
+
+    ``sparse`` has ``users`` users and a tenth as many addresses, owned by
+    a tenth of the users. ``dense`` has a fifth of the users and twice as
+    many addresses, owned by 90% of them (about 11 each). Both run
+    without and then with an index on ``address.user_id``.
+
+    Args:
+        users: Scale of the scenarios.
+        repeats: Runs per case (the best one is reported).
+        max_scan: Skip ``not_exists`` without an index when users x
+            addresses is above this, since it scans address once per user.
+    """
+    from models import Address, Base, User
+
+    random.seed(42)
+    print("📊 Anti-Join Benchmark")
+    print("=" * 50)
+    print(f"   best of {repeats}, ms")
+    for name, (user_scale, address_scale, owners) in SCENARIOS.items():
+        user_count, address_count = int(users * user_scale), int(users * address_scale)
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine("sqlite:///" + os.path.join(directory, "anti.db"))
+            Base.metadata.create_all(engine)
+            with engine.begin() as conn:
+                for index in Address.__table__.indexes:
+                    conn.execute(text("DROP INDEX %s" % index.name))
+                conn.exec_driver_sql(
+                    'INSERT INTO "user" (first_name, last_name) VALUES (?, ?)',
+                    [(f"First {i}", f"Last {i}") for i in range(user_count)],
+                )
+                conn.exec_driver_sql(
+                    "INSERT INTO address (city, state, zip_code, user_id) VALUES (?, ?, ?, ?)",
+                    [("City", "CA", "00000", 1 + random.randrange(int(user_count * owners)))
+                     for _ in range(address_count)],
+                )
+
+            print(f"\n   {name}: {user_count:,} users, {address_count:,} addresses")
+            for indexed in (False, True):
+                if indexed:
+                    with engine.begin() as conn:
+                        for index in Address.__table__.indexes:
+                            index.create(conn)
+                        conn.execute(text("ANALYZE"))
+                stats = table_stats(engine, User, Address)
+                print(f"   {'with' if indexed else 'without'} index: {stats.density:.2f} addresses per user"
+                      f" ({stats.source}), auto picks {choose_strategy(engine, User, Address, stats=stats)}")
+                for strategy in ("not_exists", "left_join"):
+                    if strategy == "not_exists" and not indexed and user_count * address_count > max_scan:
+                        print("      not_exists: skipped, it scans address once per user")
+                        continue
+                    statement = anti_join(engine, User, Address, strategy=strategy)
+                    counting = select(func.count()).select_from(statement.subquery())
+                    best = float("inf")
+                    with engine.connect() as conn:
+                        for _ in range(repeats):
+                            started = time.perf_counter()
+                            count = conn.execute(counting).scalar()
+                            best = min(best, time.perf_counter() - started)
+                    print(f"      {strategy:<11}{best * 1000:>10.1f}   ({count:,} users)")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark NOT EXISTS vs LEFT JOIN IS NULL anti-joins")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-scan", type=int, default=10**9)
+    args = parser.parse_args()
+
+    run_benchmark(args.users, args.repeats, args.max_scan)
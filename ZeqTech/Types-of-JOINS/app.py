@@ -1,7 +1,13 @@
 from sqlalchemy.sql.functions import user
-from models import Address, session, User
+from models import Address, session, User, reset_database
 import random
 from sqlalchemy import func
+from full_join import full_outer_join
+from anti_join import anti_join
+from reports import fetch_report, report_record, report_select
+
+# The demo seeds its own data, so start from empty tables
+reset_database()
 
 # List of names, ages, and emails
 
@@ -54,6 +60,12 @@ print(address2.user or "No User")
 print(address3.user or "No User")
 print('='*50)
 print()
+# The outer join reports only print these fields: read them into compact
+# records instead of full User / Address entities (see reports.py)
+UserAddressRow = report_record(
+    "UserAddressRow", User.first_name, User.last_name, Address.city, Address.state, Address.zip_code
+)
+
 # 4 Joins Main Types
 # Inner Join
 # Left Outer Join
@@ -69,38 +81,42 @@ print()
 
 # 2 - Anti Inner Join
 print("Anti Inner Join:")
-print(*session.query(User, Address).join(Address, full=True).filter(User.addresses == None, Address.user_id == None).all(), sep="\n")
+print(*session.execute(full_outer_join(session, User, Address, User.addresses == None, Address.user_id == None)).all(), sep="\n")
 print('='*50)
 print()
 
 # 3 - Left Outer Join
 print("Left Outer Join:")
-print(*session.query(User, Address).outerjoin(Address).all(), sep="\n")
+print(*fetch_report(session, report_select(UserAddressRow).outerjoin_from(User, Address), UserAddressRow), sep="\n")
 print('='*50)
 print()
 
 # 4 - Anti Left Outer Join
 print("Anti Left Outer Join:")
-print(*session.query(User, Address).outerjoin(Address, full=True).filter(User.addresses == None).all(), sep="\n")
+# Users without an address: NOT EXISTS or LEFT JOIN ... IS NULL, whichever
+# suits the table statistics (see anti_join.py)
+print(*session.scalars(anti_join(session, User, Address)).all(), sep="\n")
 print('='*50)
 print()
 
 
 # 5 - Right Outer Join
 print("Right Outer Join:")
-print(*session.query(User, Address).outerjoin(User).all(), sep="\n")
+print(*fetch_report(session, report_select(UserAddressRow).outerjoin_from(Address, User), UserAddressRow), sep="\n")
 print('='*50)
 print()
 
 # 6 - Anto Right Outer 
 print("Anti Right Outer Join:")
-print(*session.query(User, Address).outerjoin(User, full=True).filter(Address.user_id == None).all(), sep="\n")
+print(*session.scalars(anti_join(session, Address, User)).all(), sep="\n")
 print('='*50)
 print()
 
 # 7 - Full Outer Join
+# full_outer_join() falls back to LEFT JOIN ... UNION ALL ... on databases
+# without FULL OUTER JOIN (SQLite < 3.39, MySQL)
 print("Full Outer Join:")
-print(*session.query(User, Address).outerjoin(User, full=True).all(), sep="\n")
+print(*session.execute(full_outer_join(session, User, Address)).all(), sep="\n")
 print('='*50)
 print()
 
@@ -0,0 +1,293 @@
+"""
+SQLAlchemy Joins Tutorial - Portable FULL OUTER JOIN
+
+``session.query(User, Address).outerjoin(User, full=True)`` renders
+``FULL OUTER JOIN``, which SQLite only understands from version 3.39
+(and MySQL not at all). This module builds the full join either way:
+
+- ``native``: ``SELECT ... FROM user FULL OUTER JOIN address ON ...``,
+- ``union``: the classic rewrite that works everywhere::
+
+      SELECT ... FROM user LEFT OUTER JOIN address ON ...
+      UNION ALL
+      SELECT ... FROM address LEFT OUTER JOIN user ON ... WHERE user.id IS NULL
+
+  i.e. every left row with its matches (or NULLs), plus the right rows
+  that matched nothing (the anti-join). The union is wrapped in a
+  subquery and mapped back onto ``aliased()`` entities, so both plans
+  return the same ``(User, Address)`` tuples.
+
+``strategy="auto"`` picks ``native`` when the connected database supports
+it, except on SQLite when the right table has no index on its join
+columns: SQLite then runs the native plan as a nested loop that scans
+the right table once per left row (minutes at 50k rows), while each
+branch of the union still gets an automatic index. Row filters are
+applied to both branches of the union, which is the same as filtering the
+full join because the branches never share a row.
+
+Key Concepts Covered:
+- Detecting database capabilities from the dialect
+- ``UNION ALL`` + anti-join emulation of FULL OUTER JOIN
+- Mapping a compound SELECT back to entities with ``aliased()``
+- Comparing query plans on large tables
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import LABEL_STYLE_TABLENAME_PLUS_COL, create_engine, func, inspect, select, union_all
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import ColumnClause
+from sqlalchemy.sql.util import join_condition
+
+STRATEGIES = ("auto", "native", "union")
+
+# SQLite learned RIGHT and FULL OUTER JOIN in 3.39.0
+SQLITE_FULL_JOIN_VERSION = (3, 39, 0)
+
+# =============================================================================
+# CAPABILITY DETECTION
+# =============================================================================
+
+
+def _dialect(bind):
+    """Return the dialect of a Session, Engine, Connection or Dialect."""
+    if hasattr(bind, "get_bind"):
+        bind = bind.get_bind()
+    return getattr(bind, "dialect", bind)
+
+
+def _inspectable(bind):
+    """Return something ``inspect()`` can read indexes from."""
+    return bind.connection() if hasattr(bind, "get_bind") else bind
+
+
+def supports_full_outer_join(bind):
+    """
+    Tell whether the database behind ``bind`` can run ``FULL OUTER JOIN``.
+
+    Args:
+        bind: ``Session``, ``Engine``, ``Connection`` or ``Dialect``.
+
+    Returns:
+        bool: True if a native full outer join can be emitted.
+    """
+    dialect = _dialect(bind)
+    if dialect.name == "sqlite":
+        return dialect.dbapi.sqlite_version_info >= SQLITE_FULL_JOIN_VERSION
+    return dialect.name not in ("mysql", "mariadb")
+
+
+def join_columns(left, right, onclause=None):
+    """Return the columns of ``right``'s table that the join condition uses."""
+    table = inspect(right).mapper.local_table
+    if onclause is None:
+        onclause = join_condition(inspect(left).mapper.local_table, table)
+    elif hasattr(onclause, "property"):
+        # A relationship attribute such as User.addresses
+        onclause = onclause.property.primaryjoin
+    return {
+        element.name
+        for element in visitors.iterate(onclause)
+        if isinstance(element, ColumnClause) and getattr(element, "table", None) is table
+    }
+
+
+def right_side_indexed(bind, left, right, onclause=None):
+    """
+    Tell whether the database can look up ``right`` rows by the join columns.
+
+    Args:
+        bind: ``Session``, ``Engine`` or ``Connection``.
+        left: Mapped class on the left.
+        right: Mapped class on the right.
+        onclause: Join condition (default: inferred from the foreign key).
+
+    Returns:
+        bool: True if a primary key or index starts with a join column.
+    """
+    table = inspect(right).mapper.local_table
+    columns = join_columns(left, right, onclause)
+    inspector = inspect(_inspectable(bind))
+    leading = [index["column_names"][0] for index in inspector.get_indexes(table.name) if index["column_names"]]
+    primary_key = inspector.get_pk_constraint(table.name)["constrained_columns"]
+    return bool(columns & set(leading + primary_key[:1]))
+
+
+def choose_strategy(bind, left, right, onclause=None):
+    """
+    Pick ``"native"`` or ``"union"`` for a full outer join on ``bind``.
+
+    Args:
+        bind: ``Session``, ``Engine`` or ``Connection``.
+        left: Mapped class on the left.
+        right: Mapped class on the right.
+        onclause: Join condition (default: inferred from the foreign key).
+
+    Returns:
+        str: ``"native"`` if it is supported and, on SQLite, can use an
+        index on the right table; ``"union"`` otherwise.
+    """
+    if not supports_full_outer_join(bind):
+        return "union"
+    if _dialect(bind).name == "sqlite" and not right_side_indexed(bind, left, right, onclause):
+        return "union"
+    return "native"
+
+
+# =============================================================================
+# FULL OUTER JOIN
+# =============================================================================
+
+
+def _primary_key(entity):
+    """Return the (possibly aliased) attribute of the entity's first PK column."""
+    mapper = inspect(entity).mapper
+    return getattr(entity, mapper.get_property_by_column(mapper.primary_key[0]).key)
+
+
+def full_outer_join(bind, left, right, *criteria, onclause=None, strategy="auto"):
+    """
+    Build ``SELECT left, right FROM left FULL OUTER JOIN right``.
+
+    Args:
+        bind: ``Session``, ``Engine`` or ``Connection`` the statement will
+            run on (used by ``strategy="auto"``).
+        left: Mapped class on the left, e.g. ``User``.
+        right: Mapped class on the right, e.g. ``Address``.
+        *criteria: Filters on the joined rows, e.g. ``Address.user_id == None``.
+        onclause: Join condition (default: inferred from the foreign key).
+        strategy: ``"auto"`` (see ``choose_strategy()``), ``"native"`` or
+            ``"union"``.
+
+    Returns:
+        Select: A statement returning ``(left, right)`` tuples, with None
+        for the missing side.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError("strategy must be one of %s" % ", ".join(STRATEGIES))
+    if strategy == "auto":
+        strategy = choose_strategy(bind, left, right, onclause)
+
+    if strategy == "native":
+        return select(left, right).join_from(left, right, onclause, full=True).where(*criteria)
+
+    matched = select(left, right).join_from(left, right, onclause, isouter=True).where(*criteria)
+    # Right rows without a left match: their left columns are all NULL
+    unmatched = (
+        select(left, right)
+        .join_from(right, left, onclause, isouter=True)
+        .where(_primary_key(left).is_(None), *criteria)
+    )
+    rows = union_all(
+        matched.set_label_style(LABEL_STYLE_TABLENAME_PLUS_COL),
+        unmatched.set_label_style(LABEL_STYLE_TABLENAME_PLUS_COL),
+    ).subquery("full_join")
+    return select(aliased(left, rows), aliased(right, rows))
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def _time_strategy(engine, statement, repeats):
+    """Return ``(rows, count seconds, fetch seconds, plan)`` for one statement."""
+    counting = select(func.count()).select_from(statement.subquery())
+    with Session(engine) as session:
+        plan = session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + str(counting.compile(engine))
+        ).all()
+        count_seconds, fetch_seconds = [], []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            count = session.execute(counting).scalar()
+            count_seconds.append(time.perf_counter() - started)
+
+            # A fresh session each time; the identity map only holds
+            # weak references, so finished partitions are freed
+            with Session(engine) as fetching:
+                started = time.perf_counter()
+                fetched = 0
+                result = fetching.execute(statement, execution_options={"yield_per": 10_000})
+                for partition in result.partitions():
+                    fetched += len(partition)
+                fetch_seconds.append(time.perf_counter() - started)
+    assert fetched == count
+    return count, min(count_seconds), min(fetch_seconds), [row[-1] for row in plan]
+
+
+def run_benchmark(users=1_000_000, addresses=1_000_000, repeats=3, max_scan=100_000):
+    """
+    Compare the native and UNION ALL plans on large tables.
+
+    About a tenth of the users have no address and a tenth of the
+    addresses have no user, so both sides of the full join have misses.
+    Each plan runs without and then with an index on ``address.user_id``.
+
+    Args:
+        users: Number of users.
+        addresses: Number of addresses.
+        repeats: Runs per plan (the best one is reported).
+        max_scan: Skip the native plan without an index above this many
+            users, since it scans the address table once per user.
+    """
+    from models import Address, Base, User
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///" + os.path.join(directory, "joins.db"))
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                'INSERT INTO "user" (first_name, last_name) VALUES (?, ?)',
+                [(f"First {i}", f"Last {i}") for i in range(users)],
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO address (city, state, zip_code, user_id) VALUES (?, ?, ?, ?)",
+                [
+                    ("City", "CA", f"{i % 100_000:05d}",
+                     None if i % 10 == 0 else 1 + (i * 7) % (users - users // 10))
+                    for i in range(addresses)
+                ],
+            )
+
+        print("📊 Full Outer Join Benchmark")
+        print("=" * 50)
+        print(f"   {users:,} users, {addresses:,} addresses, best of {repeats}")
+        print(f"   Native FULL OUTER JOIN supported: {supports_full_outer_join(engine)}")
+        for indexed in (False, True):
+            if indexed:
+                with engine.begin() as conn:
+                    conn.exec_driver_sql("CREATE INDEX ix_benchmark_address_user_id ON address (user_id)")
+            print(f"\n   {'With' if indexed else 'Without'} an index on address.user_id"
+                  f" (auto picks {choose_strategy(engine, User, Address)})")
+            for strategy in ("native", "union"):
+                if strategy == "native" and not supports_full_outer_join(engine):
+                    continue
+                if strategy == "native" and not indexed and users > max_scan:
+                    print("   ⚠️ native: skipped, it scans address once per user (raise --max-scan to run it)")
+                    continue
+                statement = full_outer_join(engine, User, Address, strategy=strategy)
+                count, count_seconds, fetch_seconds, plan = _time_strategy(engine, statement, repeats)
+                print(f"   {strategy}: {count:,} rows")
+                print("      plan: " + "; ".join(plan))
+                print(f"      SQL only (count):     {count_seconds * 1000:>9.1f} ms")
+                print(f"      (User, Address) rows: {fetch_seconds * 1000:>9.1f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark native vs emulated FULL OUTER JOIN")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--addresses", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-scan", type=int, default=100_000)
+    args = parser.parse_args()
+
+    run_benchmark(args.users, args.addresses, args.repeats, args.max_scan)
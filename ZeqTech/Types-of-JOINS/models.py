@@ -1,8 +1,12 @@
 import os
+import sys
 from sqlalchemy import create_engine, Column, Integer, String
-from sqlalchemy.orm import declarative_base, deferred, sessionmaker, relationship
+from sqlalchemy.orm import declarative_base, deferred, sessionmaker, relationship, scoped_session
 from sqlalchemy import ForeignKey
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from schema_sync import reset_schema, sync_schema  # noqa: E402
+
 
 
 engine = create_engine(
@@ -10,7 +14,8 @@ engine = create_engine(
 )
 
 Session = sessionmaker(bind=engine)
-session = Session()
+# One session per thread instead of a single shared Session()
+session = scoped_session(Session)
 
 Base = declarative_base()
 
@@ -44,7 +49,7 @@ class Address(BaseModel):
     city = Column(String)
     state = Column(String)
     zip_code = Column(String)
-    user_id = Column(Integer, ForeignKey("user.id"))
+    user_id = Column(Integer, ForeignKey("user.id"), index=True)
     
     def __repr__(self):
         return "<Address(city='%s', state='%s', zip_code='%s')>" % (
@@ -53,5 +58,11 @@ class Address(BaseModel):
             self.zip_code,
         )
         
-Base.metadata.drop_all(engine)
-Base.metadata.create_all(engine)
\ No newline at end of file
+# Only run DDL when the models changed since the last start; wiping the
+# data is an explicit reset_database() call
+sync_schema(engine, Base.metadata)
+
+
+def reset_database():
+    """Drop and recreate all tables (deletes every row)."""
+    reset_schema(engine, Base.metadata)
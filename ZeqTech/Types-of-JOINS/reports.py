@@ -0,0 +1,314 @@
+"""
+SQLAlchemy Joins Tutorial - Lightweight Report Rows
+
+``session.query(User, Address).outerjoin(Address).all()`` builds a full
+``User`` and ``Address`` for every row: instance state, attribute
+instrumentation, relationship collections, and an entry in the Session's
+identity map. A report that only prints a name and a city needs none of
+that. This module declares the report's fields once:
+
+    UserCityRow = report_record("UserCityRow", User.first_name, Address.city)
+
+and derives everything else from that declaration:
+
+- the selected columns (``select(*UserCityRow.columns)``), so only those
+  columns are read,
+- a compact record class with ``__slots__`` (no ``__dict__``, no
+  instance state) built straight from each result row,
+- a ``Bundle`` (``UserCityRow.bundle()``) for when the report has to go
+  through ``session.execute()`` next to other columns or entities.
+
+Neither path touches the identity map.
+
+Key Concepts Covered:
+- ``__slots__`` records vs ORM entities
+- Custom ``Bundle`` row processors
+- Selecting columns instead of entities
+- Measuring per-row hydration time and memory
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import gc
+import keyword
+import os
+import tempfile
+import time
+from itertools import starmap
+
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Bundle, Session
+
+# =============================================================================
+# REPORT RECORDS
+# =============================================================================
+
+
+class ReportRecord:
+    """Base class of the records built by ``report_record()``."""
+
+    __slots__ = ()
+    # Field names, in select order
+    fields = ()
+    # The labelled columns the fields are read from
+    columns = ()
+
+    def __repr__(self):
+        values = ", ".join("%s=%r" % (name, getattr(self, name)) for name in self.fields)
+        return "%s(%s)" % (type(self).__name__, values)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    __hash__ = None
+
+    def astuple(self):
+        """Return the field values as a tuple."""
+        return tuple(getattr(self, name) for name in self.fields)
+
+    def asdict(self):
+        """Return the record as ``{field: value}``."""
+        return {name: getattr(self, name) for name in self.fields}
+
+    @classmethod
+    def bundle(cls):
+        """Return a ``Bundle`` of the report's columns that yields records."""
+        return RecordBundle(cls)
+
+
+def _field_name(column):
+    """Default field name of a column attribute, e.g. ``Address.city`` -> ``city``."""
+    return getattr(column, "key", None) or getattr(column, "name", None)
+
+
+def report_record(name, *columns, **named_columns):
+    """
+    Declare a report: create a ``__slots__`` record class for its fields.
+
+    Args:
+        name: Name of the record class.
+        *columns: Column attributes named after their key, e.g.
+            ``User.first_name`` becomes the ``first_name`` field.
+        **named_columns: Columns or expressions under an explicit field
+            name, e.g. ``owner=User.last_name``.
+
+    Returns:
+        type: A ``ReportRecord`` subclass with ``fields`` and ``columns``.
+
+    Raises:
+        ValueError: If two fields share a name, or a name is not a valid
+            identifier or is taken by ``ReportRecord`` (e.g. ``asdict``).
+    """
+    declared = [(_field_name(column), column) for column in columns] + list(named_columns.items())
+    fields = tuple(field for field, _ in declared)
+    for field in fields:
+        if (not field or not field.isidentifier() or keyword.iskeyword(field) or field.startswith("_")
+                # fields, columns, astuple(), asdict(), bundle()
+                or field in dir(ReportRecord)):
+            raise ValueError("%r is not a valid report field name" % (field,))
+    duplicates = sorted({field for field in fields if fields.count(field) > 1})
+    if duplicates:
+        raise ValueError("duplicate report fields %s; name them with keyword arguments" % ", ".join(duplicates))
+
+    # A generated __init__ with one assignment per field, like namedtuple
+    # and dataclasses build theirs: about 30% faster than a setattr loop
+    source = "def __init__(self, %s):\n%s" % (
+        ", ".join(fields),
+        "".join("    self.%s = %s\n" % (field, field) for field in fields) or "    pass\n",
+    )
+    namespace = {}
+    exec(source, namespace)
+    return type(
+        name,
+        (ReportRecord,),
+        {
+            "__slots__": fields,
+            "__init__": namespace["__init__"],
+            "fields": fields,
+            "columns": tuple(column.label(field) for field, column in declared),
+        },
+    )
+
+
+class RecordBundle(Bundle):
+    """A ``Bundle`` of a report's columns whose value is a report record."""
+
+    def __init__(self, record):
+        super().__init__(record.__name__, *record.columns)
+        self.record = record
+
+    def create_row_processor(self, query, procs, labels):
+        record = self.record
+
+        def proc(row):
+            return record(*[getter(row) for getter in procs])
+
+        return proc
+
+
+# =============================================================================
+# RUNNING REPORTS
+# =============================================================================
+
+
+def report_select(record):
+    """
+    Return ``select()`` of the report's columns, ready for joins and filters.
+
+    Args:
+        record: A class made by ``report_record()``.
+
+    Returns:
+        Select: e.g. ``report_select(Row).join_from(User, Address)``.
+    """
+    return select(*record.columns)
+
+
+def _report_connection(session):
+    """The connection to run a report on, after the autoflush ``session.execute()`` would do."""
+    if not hasattr(session, "get_bind"):
+        return session
+    if session.autoflush:
+        # connection() skips autoflush; pending objects belong in the report
+        session.flush()
+    return session.connection()
+
+
+def fetch_report(session, statement, record):
+    """
+    Run a report statement and build one record per row.
+
+    The statement runs on the Session's connection, so no ORM result
+    processing or identity map is involved. Pending changes are flushed
+    first when the Session autoflushes, as ``session.execute()`` would.
+
+    Args:
+        session: ``Session`` or ``Connection``.
+        statement: A ``select()`` of ``record.columns`` (see ``report_select()``).
+        record: The record class.
+
+    Returns:
+        list: The records.
+    """
+    connection = _report_connection(session)
+    return list(starmap(record, connection.execute(statement)))
+
+
+def stream_report(session, statement, record, batch_size=10_000):
+    """
+    Like ``fetch_report()``, but yield the records ``batch_size`` rows at a time.
+
+    Args:
+        session: ``Session`` or ``Connection``.
+        statement: A ``select()`` of ``record.columns``.
+        record: The record class.
+        batch_size: Rows fetched per batch.
+
+    Yields:
+        The records.
+    """
+    connection = _report_connection(session)
+    result = connection.execute(statement.execution_options(yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield from starmap(record, partition)
+    finally:
+        result.close()
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+
+def _rss_bytes():
+    """Current resident set size (Linux)."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _hydrate(url, mode):
+    """Load the report in a fresh process; return (seconds, bytes held, rows, identity map size)."""
+    from models import Address, User
+
+    UserAddressRow = report_record(
+        "UserAddressRow", User.first_name, User.last_name, Address.city, Address.state, Address.zip_code
+    )
+    engine = create_engine(url)
+    with Session(engine) as session:
+        session.connection()
+        gc.collect()
+        before = _rss_bytes()
+        started = time.perf_counter()
+        if mode == "entities":
+            rows = session.execute(select(User, Address).join_from(User, Address)).all()
+        elif mode == "bundle":
+            rows = session.execute(select(UserAddressRow.bundle()).join_from(User, Address)).scalars().all()
+        elif mode == "records":
+            rows = fetch_report(session, report_select(UserAddressRow).join_from(User, Address), UserAddressRow)
+        else:
+            rows = session.execute(report_select(UserAddressRow).join_from(User, Address)).all()
+        seconds = time.perf_counter() - started
+        held = _rss_bytes() - before
+        identity_map = len(session.identity_map)
+        count = len(rows)
+        del rows
+    engine.dispose()
+    return seconds, held, count, identity_map
+
+
+def run_benchmark(rows=1_000_000, modes=("entities", "bundle", "records", "rows")):
+    """
+    Measure per-row hydration time and memory of the report modes.
+
+    Every mode loads ``rows`` (User, Address) pairs in its own process and
+    keeps them in a list, as a report that prints them would.
+
+    Args:
+        rows: Number of users, each with one address.
+        modes: Which of ``entities``, ``bundle``, ``records`` and ``rows``
+            (plain ``Row`` tuples) to run.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from models import Address, Base, User
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = "sqlite:///" + os.path.join(directory, "reports.db")
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for start in range(0, rows, 100_000):
+                batch = range(start, min(rows, start + 100_000))
+                conn.execute(
+                    inspect(User).local_table.insert(),
+                    [{"id": i + 1, "first_name": f"First {i}", "last_name": f"Last {i}"} for i in batch],
+                )
+                conn.execute(
+                    inspect(Address).local_table.insert(),
+                    [{"city": f"City {i % 1000}", "state": "CA", "zip_code": f"{i % 100_000:05d}", "user_id": i + 1}
+                     for i in batch],
+                )
+        engine.dispose()
+
+        print("📊 Report Hydration Benchmark")
+        print("=" * 50)
+        print(f"   {rows:,} (User, Address) rows, 5 report fields")
+        print(f"\n   {'mode':<10}{'total s':>9}{'ns/row':>9}{'bytes/row':>11}{'identity map':>14}")
+        for mode in modes:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                seconds, held, count, identity_map = pool.submit(_hydrate, url, mode).result()
+            print(f"   {mode:<10}{seconds:>9.2f}{seconds / count * 1e9:>9.0f}{held / count:>11.0f}{identity_map:>14,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark report records vs full entities")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--modes", nargs="+", default=["entities", "bundle", "records", "rows"])
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.modes)
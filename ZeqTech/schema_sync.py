@@ -0,0 +1,283 @@
+"""
+SQLAlchemy Schema Sync Tutorial - Skipping DDL on Startup with Fingerprints
+
+Running ``Base.metadata.drop_all(engine)`` and ``create_all(engine)`` at
+import time wipes the database and pays for DDL every time a process
+starts. This module hashes the DDL that ``Base.metadata`` would emit into a
+fingerprint and stores it in the database. On startup the stored
+fingerprint is compared with the current one:
+
+- equal: nothing to do, one SELECT and the models are ready,
+- new tables or indexes: they are created, existing data is kept,
+- changed tables: ``SchemaMismatchError`` is raised, because changing an
+  existing table means dropping it, and that has to be asked for
+  explicitly with ``reset_schema()``.
+
+A table's fingerprint includes the ``DDL`` attached to its
+``after_create`` event (triggers, counter tables), which only runs when
+the table is created. Tables from before fingerprints existed are adopted
+only if the database holds exactly what ``create_all()`` would create for
+them today: on SQLite the ``sqlite_master`` entries (columns, constraints,
+indexes, triggers) are compared with a scratch in-memory copy.
+
+It is shared by every ``models.py`` under ``ZeqTech/``.
+
+Key Concepts Covered:
+- Compiling ``CreateTable`` / ``CreateIndex`` DDL without executing it
+- Content hashing with ``hashlib``
+- ``after_create`` DDL as part of a table's definition
+- Adopting databases created before fingerprints existed
+- Explicit, opt-in destructive resets
+
+Author: ZeqTech Tutorial Series
+License: MIT
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+FINGERPRINT_TABLE = "_schema_fingerprint"
+ALL_TABLES = "*"
+# Suffix of the per-table entry that hashes the table and its after_create
+# DDL without the indexes
+COLUMNS = ":columns"
+
+# =============================================================================
+# FINGERPRINTS
+# =============================================================================
+
+
+class SchemaMismatchError(RuntimeError):
+    """Raised when existing tables no longer match the models."""
+
+
+def _after_create_ddl(table):
+    """The statements attached to ``table``'s ``after_create`` event, in order."""
+    # DDL(...) listeners carry their SQL; anything else by name
+    return [
+        getattr(listener, "statement", None) or getattr(listener, "__qualname__", repr(listener))
+        for listener in table.dispatch.after_create
+    ]
+
+
+def table_fingerprints(metadata, dialect):
+    """
+    Hash the DDL of every table in ``metadata``.
+
+    Args:
+        metadata: The ``MetaData`` (usually ``Base.metadata``).
+        dialect: Dialect used to compile the DDL, e.g. ``engine.dialect``.
+
+    Returns:
+        dict: ``{table_name: sha256_hex}``, ``{table_name + ":columns":
+        sha256_hex}`` of the table and its ``after_create`` DDL alone, plus
+        the combined hash under ``"*"``.
+    """
+    fingerprints = {}
+    for table in metadata.sorted_tables:
+        ddl = [str(CreateTable(table).compile(dialect=dialect)).strip()] + _after_create_ddl(table)
+        fingerprints[table.name + COLUMNS] = hashlib.sha256("\n".join(ddl).encode("utf-8")).hexdigest()
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            ddl.append(str(CreateIndex(index).compile(dialect=dialect)).strip())
+        fingerprints[table.name] = hashlib.sha256("\n".join(ddl).encode("utf-8")).hexdigest()
+    combined = "\n".join("%s=%s" % item for item in sorted(fingerprints.items()))
+    fingerprints[ALL_TABLES] = hashlib.sha256(combined.encode("utf-8")).hexdigest()
+    return fingerprints
+
+
+def _read_fingerprints(connection):
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS %s (name VARCHAR PRIMARY KEY, fingerprint VARCHAR)"
+            % FINGERPRINT_TABLE
+        )
+    )
+    rows = connection.execute(text("SELECT name, fingerprint FROM %s" % FINGERPRINT_TABLE))
+    return dict(rows.all())
+
+
+def _write_fingerprints(connection, fingerprints):
+    connection.execute(text("DELETE FROM %s" % FINGERPRINT_TABLE))
+    connection.execute(
+        text("INSERT INTO %s (name, fingerprint) VALUES (:name, :fingerprint)" % FINGERPRINT_TABLE),
+        [{"name": name, "fingerprint": value} for name, value in fingerprints.items()],
+    )
+
+
+def _normalize(sql):
+    """Collapse whitespace, which differs between SQLAlchemy versions' DDL."""
+    if sql is None:
+        return None
+    return re.sub(r"\s*([(),])\s*", r"\1", " ".join(sql.split()))
+
+
+def _schema_objects(connection):
+    """``{(type, name): sql}`` of the tables, indexes and triggers in a SQLite database."""
+    rows = connection.execute(text("SELECT type, name, sql FROM sqlite_master WHERE name != 'sqlite_sequence'"))
+    return {(kind, name): _normalize(sql) for kind, name, sql in rows}
+
+
+def _matches_model(connection, inspector, table):
+    """Whether an existing table is what ``create_all()`` would create for ``table`` now."""
+    if connection.dialect.name != "sqlite":
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        return columns == set(table.columns.keys())
+    # Build the table (and its after_create triggers and companion tables)
+    # in a scratch database and look for every object it got
+    scratch = create_engine("sqlite://")
+    try:
+        with scratch.begin() as scratch_connection:
+            table.metadata.create_all(scratch_connection, tables=[table])
+            expected = _schema_objects(scratch_connection)
+    finally:
+        scratch.dispose()
+    actual = _schema_objects(connection)
+    # Missing indexes are fine: sync_schema() creates them next to the data
+    return all(
+        actual.get(key, False) == sql
+        for key, sql in expected.items() if key in actual or key[0] != "index" or sql is None
+    )
+
+
+# =============================================================================
+# SYNC / RESET
+# =============================================================================
+
+
+def sync_schema(engine, metadata):
+    """
+    Bring the database in line with ``metadata`` without losing data.
+
+    Args:
+        engine: Engine of the database to check.
+        metadata: The ``MetaData`` describing the models.
+
+    Returns:
+        str: ``"unchanged"`` when the fingerprint matched, ``"created"``
+        when missing tables were created.
+
+    Raises:
+        SchemaMismatchError: If an existing table differs from its model.
+    """
+    current = table_fingerprints(metadata, engine.dialect)
+    with engine.begin() as connection:
+        stored = _read_fingerprints(connection)
+        if stored.get(ALL_TABLES) == current[ALL_TABLES]:
+            return "unchanged"
+
+        inspector = inspect(connection)
+        existing = set(inspector.get_table_names())
+        changed = []
+        for table in metadata.sorted_tables:
+            if table.name not in existing:
+                continue
+            if stored.get(table.name) == current[table.name]:
+                continue
+            if table.name + COLUMNS in stored:
+                # Only index changes can be applied without recreating the table
+                if stored[table.name + COLUMNS] != current[table.name + COLUMNS]:
+                    changed.append(table.name)
+            elif not _matches_model(connection, inspector, table):
+                # Created before (column) fingerprints existed, and not the
+                # way the model would create it now
+                changed.append(table.name)
+        if changed:
+            raise SchemaMismatchError(
+                "tables %s no longer match the models; call reset_schema() to drop "
+                "and recreate them (this deletes their data)" % ", ".join(sorted(changed))
+            )
+
+        metadata.create_all(connection)
+        # create_all() skips existing tables, including their new indexes
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+        _write_fingerprints(connection, current)
+    return "created"
+
+
+def reset_schema(engine, metadata):
+    """
+    Drop and recreate every table in ``metadata`` (deletes all data).
+
+    Args:
+        engine: Engine of the database to reset.
+        metadata: The ``MetaData`` describing the models.
+    """
+    with engine.begin() as connection:
+        metadata.drop_all(connection)
+        metadata.create_all(connection)
+        _read_fingerprints(connection)
+        _write_fingerprints(connection, table_fingerprints(metadata, engine.dialect))
+
+
+# =============================================================================
+# BENCHMARK: IMPORT-TO-FIRST-QUERY LATENCY
+# =============================================================================
+
+
+def measure_startup(database, metadata, repeats=20):
+    """
+    Time engine creation + schema setup + first query, old way vs new way.
+
+    Args:
+        database: Path of a SQLite file to work on (it is modified).
+        metadata: The ``MetaData`` describing the models.
+        repeats: Number of simulated process starts per approach.
+
+    Returns:
+        dict: Mean milliseconds for ``"drop_create"`` and ``"fingerprint"``.
+    """
+    first_table = metadata.sorted_tables[0]
+
+    def start(setup):
+        started = time.perf_counter()
+        engine = create_engine("sqlite:///" + database)
+        setup(engine)
+        with engine.connect() as connection:
+            connection.execute(first_table.select().limit(1)).all()
+        elapsed = time.perf_counter() - started
+        engine.dispose()
+        return elapsed
+
+    def drop_create(engine):
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+
+    results = {}
+    for label, setup in (
+        ("drop_create", drop_create),
+        ("fingerprint", lambda engine: sync_schema(engine, metadata)),
+    ):
+        start(setup)  # warm up / create the schema once
+        results[label] = 1000 * sum(start(setup) for _ in range(repeats)) / repeats
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure import-to-first-query latency")
+    parser.add_argument("tutorial", help="tutorial directory, e.g. Create-Read-Update")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), args.tutorial))
+    from models import Base, engine
+
+    with tempfile.TemporaryDirectory() as directory:
+        copy = os.path.join(directory, "startup.db")
+        shutil.copyfile(engine.url.database, copy)
+        timings = measure_startup(copy, Base.metadata, args.repeats)
+
+    print(f"📊 Import-to-first-query latency ({args.tutorial})")
+    print("=" * 50)
+    print(f"   drop_all + create_all: {timings['drop_create']:7.2f} ms")
+    print(f"   fingerprint check:     {timings['fingerprint']:7.2f} ms")
@@ -0,0 +1,231 @@
+"""
+Test cases for the deferred columns tutorial's attribute-access profiler.
+
+This module checks the per-call-site profiles (unused and lazily fetched
+columns), the learned load_only()/undefer() options, saving and loading
+them with their statement fingerprints, and applying them to later queries.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event, select
+from sqlalchemy.orm import Session, declarative_base, deferred, load_only, undefer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, "..", "ZeqTech", "Reduce-Column-Data"))
+
+from access_profiler import AccessProfiler  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    nickname = Column(String)
+    age = deferred(Column(Integer))
+    email = deferred(Column(String))
+
+
+def query_users(session):
+    return session.query(User).order_by(User.id).all()
+
+
+SITE = "test_access_profiler.py:%d" % (query_users.__code__.co_firstlineno + 1)
+
+
+class TestAccessProfiler:
+    """Profiling, learning and applying options per query call site."""
+
+    def setup_method(self):
+        """Create 10 users and a profiler saving to a temporary file."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            session.add_all(
+                [User(name=f"User {i}", nickname=f"u{i}", age=20 + i, email=f"user{i}@example.com")
+                 for i in range(10)]
+            )
+            session.commit()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "access_profile.json")
+        self.profiler = AccessProfiler(User, path=self.path, root=HERE)
+        self.profiler.install()
+        self.session = Session(self.engine)
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: self.statements.append(statement))
+
+    def teardown_method(self):
+        self.profiler.remove()
+        self.session.close()
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def profile(self):
+        return self.profiler.profiles[SITE, "User"]
+
+    def test_unused_and_lazy_columns(self):
+        users = query_users(self.session)
+        [(u.name, u.age) for u in users]
+        profile = self.profile()
+        assert (profile.queries, profile.objects) == (1, 10)
+        assert profile.loaded == {"name", "nickname"}
+        assert profile.read == {"name", "age"}
+        assert profile.unused == {"nickname"}
+        assert profile.lazy == {"age"}
+
+    def test_learned_load_only(self):
+        [u.name for u in query_users(self.session)]
+        assert self.profiler.describe_options(SITE, User) == "load_only(User.name)"
+        [option] = self.profiler.learned_options(SITE, User)
+        assert self.profiler.learned_options("other.py:1", User) == []
+
+    def test_learned_undefer(self):
+        [(u.name, u.nickname, u.email) for u in query_users(self.session)]
+        assert self.profiler.describe_options(SITE, User) == "undefer(User.email)"
+        # Every default column read, no deferred one: nothing to change
+        profiler = AccessProfiler(User)
+        profiler._profile(SITE, "User").read.update({"name", "nickname"})
+        assert profiler.learned_options(SITE, User) == []
+
+    def test_objects_from_the_identity_map(self):
+        query_users(self.session)
+        users = self.session.scalars(select(User).where(User.id <= 4)).all()
+        [u.nickname for u in users]
+        assert self.profile().read == set()
+        [later] = [profile for profile in self.profiler.report() if profile.site != SITE]
+        assert (later.objects, later.read) == (4, {"nickname"})
+
+    def test_save_and_apply(self):
+        [(u.name, u.age) for u in query_users(self.session)]
+        self.profiler.remove()
+        self.profiler.save()
+        self.session.close()
+
+        applying = AccessProfiler(User, path=self.path, auto_apply=True, record=False, root=HERE)
+        applying.install()
+        try:
+            with Session(self.engine) as session:
+                self.statements.clear()
+                users = query_users(session)
+                assert [u.age for u in users] == list(range(20, 30))
+        finally:
+            applying.remove()
+        [statement] = self.statements
+        selected = statement.split("FROM")[0]
+        assert "age" in selected and "nickname" not in selected and "email" not in selected
+
+    def test_sites_are_relative_paths(self):
+        profiler = AccessProfiler(User, root=os.path.dirname(HERE))
+        profiler.install(self.session)
+        try:
+            query_users(self.session)
+        finally:
+            profiler.remove()
+        assert [profile.site for profile in profiler.report()] == ["tests/" + SITE]
+
+    def test_loaded_is_what_the_query_selected(self):
+        """Columns of earlier queries still on the objects are not blamed on this one."""
+        self.session.query(User).options(undefer(User.age), undefer(User.email)).all()
+        [u.name for u in query_users(self.session)]
+        assert self.profile().loaded == {"name", "nickname"}
+        assert self.profile().unused == {"nickname"}
+
+    def test_changed_statements_are_not_applied(self):
+        [(u.name, u.age) for u in query_users(self.session)]
+        self.profiler.save()
+        with open(self.path, encoding="utf-8") as source:
+            [entry] = json.load(source)
+        assert entry["statement"] == self.profile().statement
+        # The query at this line was different when the profile was saved
+        entry["statement"] = "0" * 16
+        with open(self.path, "w", encoding="utf-8") as output:
+            json.dump([entry], output)
+
+        self.profiler.remove()
+        self.session.close()
+        applying = AccessProfiler(User, path=self.path, auto_apply=True, record=False, root=HERE)
+        applying.install()
+        try:
+            with Session(self.engine) as session:
+                self.statements.clear()
+                query_users(session)
+        finally:
+            applying.remove()
+        assert "nickname" in self.statements[0].split("FROM")[0]
+        assert applying.profiles[SITE, "User"].read == set()
+
+    def test_own_options_are_not_reported_as_learned(self, capsys):
+        users = self.session.query(User).options(load_only(User.name, User.nickname)).all()
+        [u.name for u in users]
+        self.profiler.print_report()
+        report = capsys.readouterr().out
+        assert "learned options:    - (the query sets its own)" in report
+        assert "load_only(User.name)" not in report
+
+    def test_own_options_are_kept(self):
+        [u.age for u in query_users(self.session)]
+        self.profiler.auto_apply = True
+        self.session.expunge_all()
+        self.statements.clear()
+        self.session.query(User).options(load_only(User.nickname)).all()
+        assert "age" not in self.statements[0].split("FROM")[0]
+        self.statements.clear()
+        query_users(self.session)
+        assert "age" in self.statements[0].split("FROM")[0]
+
+    def test_opt_out(self):
+        [u.age for u in query_users(self.session)]
+        self.profiler.auto_apply = True
+        self.session.expunge_all()
+        self.statements.clear()
+        users = self.session.query(User).execution_options(access_profile=False).all()
+        [u.nickname for u in users]
+        assert "age" not in self.statements[0].split("FROM")[0]
+        assert [profile.site for profile in self.profiler.report()] == [SITE]
+
+    def test_yield_per_results(self):
+        users = list(self.session.query(User).yield_per(3))
+        [u.email for u in users]
+        [profile] = self.profiler.report()
+        assert (profile.objects, profile.lazy) == (10, {"email"})
+
+    def test_column_queries_are_ignored(self):
+        self.session.execute(select(User.name)).all()
+        self.session.execute(select(User.id, User.age)).all()
+        assert self.profiler.report() == []
+
+    def test_compound_statements(self):
+        union = select(User).where(User.id <= 2).union_all(select(User).where(User.id > 8))
+        assert len(self.session.execute(union).all()) == 4
+        self.profiler.auto_apply = True
+        self.profiler._profile(SITE, "User").read.add("name")
+        users = self.session.scalars(select(User).from_statement(union.order_by("id"))).all()
+        assert [u.id for u in users] == [1, 2, 9, 10]
+        [profile] = [profile for profile in self.profiler.report() if profile.site != SITE]
+        assert (profile.objects, profile.read) == (4, {"id"})
+
+    def test_remove_restores_the_class(self):
+        assert "__getattribute__" in User.__dict__
+        self.profiler.remove()
+        assert not self.profiler.installed
+        assert "__getattribute__" not in User.__dict__
+        [u.name for u in query_users(self.session)]
+        assert self.profiler.report() == []
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            AccessProfiler()
+        with pytest.raises(ValueError):
+            AccessProfiler(User).save()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,119 @@
+"""
+Test cases for the Joins tutorial's anti-join strategies.
+
+This module checks that NOT EXISTS and LEFT JOIN ... IS NULL return the
+same rows, the SQL each one emits, the table statistics (with and without
+ANALYZE) and how strategy="auto" uses them.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, event, text
+from sqlalchemy.orm import Session, declarative_base, relationship
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Types-of-JOINS"))
+
+from anti_join import TableStats, anti_join, choose_strategy, table_stats  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    id = Column(Integer, primary_key=True)
+    first_name = Column(String)
+    addresses = relationship("Address", backref="user")
+
+
+class Address(Base):
+    __tablename__ = "address"
+
+    id = Column(Integer, primary_key=True)
+    city = Column(String)
+    user_id = Column(Integer, ForeignKey("user.id"))
+
+
+class TestAntiJoin:
+    """Test cases for anti_join(), table_stats() and choose_strategy()."""
+
+    def setup_method(self):
+        """Create 20 users; every third one has three addresses, plus two orphans."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        users = [User(first_name=f"User {i}") for i in range(20)]
+        self.session.add_all(users)
+        for user in users[::3]:
+            user.addresses = [Address(city=f"City {n}") for n in range(3)]
+        self.session.add_all([Address(city="Nowhere"), Address(city="Nowhere")])
+        self.session.commit()
+        self.lonely = sorted(u.id for u in users if not u.addresses)
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: self.statements.append(statement))
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def user_ids(self, statement):
+        return sorted(user.id for user in self.session.scalars(statement))
+
+    @pytest.mark.parametrize("strategy", ["not_exists", "left_join", "auto"])
+    def test_strategies_agree(self, strategy):
+        assert self.user_ids(anti_join(self.session, User, Address, strategy=strategy)) == self.lonely
+        orphans = self.session.scalars(anti_join(self.session, Address, User, strategy=strategy)).all()
+        assert [address.city for address in orphans] == ["Nowhere", "Nowhere"]
+
+    def test_emitted_sql(self):
+        self.user_ids(anti_join(self.session, User, Address, strategy="not_exists"))
+        assert "NOT (EXISTS (SELECT" in self.statements[-1]
+        self.user_ids(anti_join(self.session, User, Address, strategy="left_join"))
+        assert "LEFT OUTER JOIN address" in self.statements[-1]
+        assert "address.user_id IS NULL" in self.statements[-1]
+
+    @pytest.mark.parametrize("strategy", ["not_exists", "left_join"])
+    def test_criteria_and_onclause(self, strategy):
+        statement = anti_join(self.session, User, Address, User.id < 10, strategy=strategy)
+        assert self.user_ids(statement) == [i for i in self.lonely if i < 10]
+        # Users without an address in "City 0" (every user but the owners)
+        statement = anti_join(
+            self.session, User, Address,
+            onclause=(Address.user_id == User.id) & (Address.city == "City 0"), strategy=strategy,
+        )
+        assert self.user_ids(statement) == self.lonely
+        statement = anti_join(self.session, User, Address, onclause=User.addresses, strategy=strategy)
+        assert self.user_ids(statement) == self.lonely
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            anti_join(self.session, User, Address, strategy="hash")
+
+    def test_stats_from_counts_and_analyze(self):
+        stats = table_stats(self.engine, User, Address)
+        assert stats == TableStats(20, 23, False, "count")
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE INDEX ix_address_user_id ON address (user_id)"))
+            conn.execute(text("ANALYZE"))
+        self.session.rollback()
+        stats = table_stats(self.session, User, Address)
+        assert (stats.left_rows, stats.right_rows, stats.indexed, stats.source) == (20, 23, True, "sqlite_stat1")
+
+    def test_auto_choice(self):
+        # No index: NOT EXISTS would scan address once per user
+        assert choose_strategy(self.engine, User, Address, stats=TableStats(100, 10_000, False)) == "left_join"
+        assert choose_strategy(self.engine, User, Address, stats=TableStats(10_000, 100, True)) == "left_join"
+        assert choose_strategy(self.engine, User, Address, stats=TableStats(100, 10_000, True)) == "not_exists"
+        # Collected from the database: 23 addresses for 20 users is sparse
+        assert choose_strategy(self.session, User, Address) == "left_join"
+
+        self.statements.clear()
+        anti_join(self.session, User, Address, strategy="auto", stats=TableStats(100, 10_000, True))
+        assert self.statements == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,149 @@
+"""
+Test cases for the deferred columns tutorial's batched undefer loader.
+
+This module counts the statements emitted when deferred columns and
+groups are touched across a query result, and checks chunking, opt-out,
+raiseload, local changes, deleted rows and detached objects.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event, select, text
+from sqlalchemy.orm import Session, declarative_base, defer, deferred, undefer
+from sqlalchemy.orm.exc import DetachedInstanceError, ObjectDeletedError
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Reduce-Column-Data"))
+
+from batch_undefer import BatchUndefer  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = deferred(Column(Integer), group="demographic")
+    email = deferred(Column(String), group="private")
+    password = deferred(Column(String), group="private")
+
+
+class TestBatchUndefer:
+    """Statement-count tests for BatchUndefer."""
+
+    def setup_method(self):
+        """Create 60 users and install the loader with chunks of 25."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            session.add_all(
+                [User(name=f"User {i}", age=20 + i, email=f"user{i}@example.com", password=f"secret{i}")
+                 for i in range(60)]
+            )
+            session.commit()
+        self.loader = BatchUndefer(User, chunk_size=25)
+        self.loader.install()
+        self.session = Session(self.engine)
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: self.statements.append(statement))
+
+    def teardown_method(self):
+        self.loader.remove()
+        self.session.close()
+        self.engine.dispose()
+
+    def query_users(self, *options, **execution_options):
+        users = self.session.query(User).options(*options).execution_options(**execution_options).all()
+        self.statements.clear()
+        return users
+
+    def test_one_statement_per_chunk(self):
+        users = self.query_users()
+        assert [u.age for u in users] == list(range(20, 80))
+        # 60 users in chunks of 25
+        assert len(self.statements) == 3
+        assert all("WHERE users.id IN" in statement for statement in self.statements)
+
+    def test_group_is_loaded_together(self):
+        users = self.query_users()
+        assert users[10].email == "user10@example.com"
+        assert len(self.statements) == 3
+        assert [u.password for u in users] == [f"secret{i}" for i in range(60)]
+        assert len(self.statements) == 3
+        # The demographic group is still deferred
+        assert "age" not in users[0].__dict__
+
+    def test_without_the_loader_every_object_selects(self):
+        users = self.query_users(batch_undefer=False)
+        [u.age for u in users]
+        assert len(self.statements) == 60
+        self.loader.remove()
+        users = self.query_users(populate_existing=True)
+        [u.email for u in users]
+        assert len(self.statements) == 60
+
+    def test_session_execute_and_select(self):
+        users = self.session.scalars(select(User).where(User.id <= 20)).all()
+        self.statements.clear()
+        assert sum(u.age for u in users) == sum(range(20, 40))
+        assert len(self.statements) == 1
+
+    def test_separate_queries_are_separate_batches(self):
+        first = self.session.scalars(select(User).where(User.id <= 10)).all()
+        second = self.session.scalars(select(User).where(User.id > 10)).all()
+        self.statements.clear()
+        first[0].age
+        assert len(self.statements) == 1
+        assert "age" not in second[0].__dict__
+        assert [u.age for u in second][0] == 30
+        assert len(self.statements) == 3
+
+    def test_undeferred_and_query_deferred_columns(self):
+        users = self.query_users(undefer(User.age), defer(User.name))
+        [u.age for u in users]
+        assert self.statements == []
+        assert [u.name for u in users][-1] == "User 59"
+        assert len(self.statements) == 3
+
+    def test_raiseload_is_kept(self):
+        users = self.query_users(defer(User.age, raiseload=True))
+        with pytest.raises(Exception, match="raiseload"):
+            users[0].age
+        assert self.statements == []
+
+    def test_local_changes_are_not_overwritten(self):
+        users = self.query_users()
+        users[5].age = 99
+        assert [u.age for u in users][5] == 99
+        assert users[5] in self.session.dirty
+
+    def test_deleted_row(self):
+        users = self.query_users()
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM users WHERE id = 1"))
+        assert users[1].age == 21
+        with pytest.raises(ObjectDeletedError):
+            users[0].age
+
+    def test_detached_object(self):
+        users = self.query_users()
+        self.session.expunge(users[0])
+        with pytest.raises(DetachedInstanceError):
+            users[0].age
+        assert users[1].age == 21
+
+    def test_install_is_idempotent(self):
+        self.loader.install()
+        assert self.loader.installed
+        self.loader.remove()
+        assert not self.loader.installed
+        with pytest.raises(ValueError):
+            BatchUndefer(User, chunk_size=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
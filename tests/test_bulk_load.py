@@ -0,0 +1,98 @@
+"""
+Test cases for the Relationship-Loading-Techniques bulk loader.
+
+This module checks that bulk_load.py streams parents and children through
+batched Core inserts with correct primary/foreign key assignment.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, func, select
+from sqlalchemy.orm import Session, declarative_base, relationship
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Relationship-Loading-Techniques")
+)
+
+from bulk_load import bulk_load  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    posts = relationship("Post", backref="user")
+
+
+class Post(Base):
+    __tablename__ = "posts"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    user_id = Column(Integer, ForeignKey("users.id"))
+
+
+def make_records(users, posts_per_user):
+    for y in range(users):
+        yield {"name": f"User {y}"}, [{"title": f"{y}-{x}"} for x in range(posts_per_user)]
+
+
+class TestBulkLoad:
+    """Test cases for bulk_load()."""
+
+    def setup_method(self):
+        """Create an in-memory database with the users/posts schema."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+
+    def teardown_method(self):
+        self.engine.dispose()
+
+    def test_loads_all_rows_in_batches(self):
+        """Every parent and child is inserted and batches respect batch_size."""
+        stats = bulk_load(
+            self.engine, User, Post, make_records(25, 4), "user_id", batch_size=20
+        )
+
+        assert stats.parents == 25
+        assert stats.children == 100
+        assert stats.rows == 125
+        assert stats.batches == 7
+        with self.engine.connect() as conn:
+            assert conn.execute(select(func.count(User.id))).scalar() == 25
+            assert conn.execute(select(func.count(Post.id))).scalar() == 100
+
+    def test_children_reference_their_parent(self):
+        """Assigned primary keys are used for the children's foreign keys."""
+        bulk_load(self.engine, User, Post, make_records(3, 2), "user_id", batch_size=4)
+
+        with Session(self.engine) as session:
+            for user in session.scalars(select(User)):
+                index = user.name.split()[1]
+                assert sorted(p.title for p in user.posts) == [f"{index}-0", f"{index}-1"]
+
+    def test_primary_keys_continue_after_existing_rows(self):
+        """Loading into a non-empty table starts at max(id) + 1."""
+        with Session(self.engine) as session:
+            session.add(User(id=41, name="Existing"))
+            session.commit()
+
+        bulk_load(self.engine, User, Post, make_records(2, 1), "user_id")
+
+        with self.engine.connect() as conn:
+            ids = conn.execute(select(User.id).order_by(User.id)).scalars().all()
+            assert ids == [41, 42, 43]
+
+    def test_rejects_invalid_batch_size(self):
+        """A non-positive batch size is a programming error."""
+        with pytest.raises(ValueError):
+            bulk_load(self.engine, User, Post, make_records(1, 1), "user_id", batch_size=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
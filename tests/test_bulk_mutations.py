@@ -0,0 +1,140 @@
+"""
+Test cases for the CRUD tutorial's set-based bulk mutations.
+
+This module checks that bulk_update()/bulk_delete() run as single
+statements, return affected row counts, honour the synchronize_session
+strategies and delete in committed chunks.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event, func, insert, select
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Create-Read-Update"))
+
+from bulk_mutations import bulk_delete, bulk_update  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+
+
+class TestBulkMutations:
+    """Test cases for bulk_update() and bulk_delete()."""
+
+    def setup_method(self):
+        """Create 30 users aged 20-29 and track executed statements."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(insert(User), [{"name": f"U{i}", "age": 20 + i % 10} for i in range(30)])
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+        self.session = Session(self.engine)
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def count(self, *criteria):
+        return self.session.scalar(select(func.count()).select_from(User).where(*criteria))
+
+    def test_update_is_one_statement_with_rowcount(self):
+        """A conditional increment compiles to a single UPDATE."""
+        updated = bulk_update(self.session, User, User.age > 27, {"age": User.age + 1})
+
+        assert updated == 6
+        assert [s for s in self.statements if s.startswith("UPDATE")] == self.statements
+        assert self.count(User.age == 30) == 3
+
+    @pytest.mark.parametrize(
+        "strategy, expected_age", [("evaluate", 99), ("fetch", 99), ("none", 20)]
+    )
+    def test_synchronize_strategies(self, strategy, expected_age):
+        """evaluate/fetch refresh loaded objects, none leaves them stale."""
+        user = self.session.scalars(select(User).where(User.name == "U0")).one()
+
+        bulk_update(self.session, User, User.name == "U0", {"age": 99}, strategy)
+
+        assert user.age == expected_age
+
+    def test_delete_synchronizes_session(self):
+        """Deleted objects are removed from the session with 'evaluate'."""
+        user = self.session.scalars(select(User).where(User.name == "U1")).one()
+
+        assert bulk_delete(self.session, User, [User.age == 21]) == 3
+        assert user not in self.session
+
+    def test_chunked_delete_commits_each_chunk(self):
+        """chunk_size splits a large delete into committed IN (...) batches."""
+        commits = []
+        event.listen(self.session, "after_commit", lambda session: commits.append(1))
+
+        deleted = bulk_delete(self.session, User, User.age < 25, chunk_size=4)
+
+        assert deleted == 15
+        assert len(commits) == 4
+        assert self.count() == 15
+        assert self.count(User.age < 25) == 0
+
+    def test_chunked_delete_keeps_pending_work_out_of_its_commits(self):
+        """Pending changes block per-chunk commits; commit_each_chunk=False leaves them to the caller."""
+        self.session.add(User(name="Pending", age=40))
+        with pytest.raises(ValueError, match="pending changes"):
+            bulk_delete(self.session, User, User.age < 25, chunk_size=4)
+        commits = []
+        event.listen(self.session, "after_commit", lambda session: commits.append(1))
+
+        deleted = bulk_delete(self.session, User, User.age < 25, chunk_size=4, commit_each_chunk=False)
+
+        assert deleted == 15
+        assert commits == []
+        self.session.rollback()
+        assert self.count() == 30
+
+    def test_chunked_delete_refuses_to_commit_earlier_writes(self):
+        """Flushed objects and earlier bulk statements are not committed by the first chunk."""
+        self.session.add(User(name="Flushed", age=40))
+        self.session.flush()
+        bulk_update(self.session, User, User.age == 29, {"age": 50})
+        with pytest.raises(ValueError, match="uncommitted writes"):
+            bulk_delete(self.session, User, User.age < 25, chunk_size=2)
+        self.session.rollback()
+        assert self.count() == 30 and self.count(User.age == 50) == 0
+        # Reads alone do not block it
+        assert self.count(User.age < 25) == 15
+        assert bulk_delete(self.session, User, User.age < 25, chunk_size=4) == 15
+
+    def test_chunked_delete_seeks_past_deleted_ids(self):
+        """Every chunk after the first starts after the last id it deleted."""
+        self.statements.clear()
+        bulk_delete(self.session, User, User.age < 25, chunk_size=4)
+        selects = [statement for statement in self.statements if statement.startswith("SELECT")]
+        assert len(selects) == 5
+        assert "users.id >" not in selects[0]
+        assert all("users.id >" in statement for statement in selects[1:])
+
+    def test_rejects_unknown_strategy_and_chunk_size(self):
+        """Invalid options fail before anything is executed."""
+        with pytest.raises(ValueError):
+            bulk_update(self.session, User, None, {"age": 1}, synchronize_session="auto")
+        with pytest.raises(ValueError):
+            bulk_delete(self.session, User, None, chunk_size=0)
+        assert self.statements == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
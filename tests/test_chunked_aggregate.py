@@ -0,0 +1,174 @@
+"""
+Test cases for the Grouping tutorial's chunked streaming aggregation.
+
+This module checks the mergeable partial aggregates, parity of the chunked
+and process-pool aggregations with SQL GROUP BY, and the id-window reads.
+"""
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, delete, event, func, select
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Grouping-Chaining-Data"))
+
+from chunked_aggregate import (  # noqa: E402
+    AggregateSpec,
+    Partial,
+    merge_results,
+    parallel_aggregate,
+    split_range,
+    streaming_aggregate,
+)
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+
+
+def as_tuples(result):
+    return {group: (p.count, p.total, p.minimum, p.maximum) for group, p in result.items()}
+
+
+class TestPartial:
+    """Test cases for Partial and merge_results()."""
+
+    def test_add_skips_null(self):
+        partial = Partial()
+        for value in (5, None, 2, 9):
+            partial.add(value)
+        assert (partial.count, partial.total, partial.minimum, partial.maximum) == (3, 16, 2, 9)
+        assert partial.mean == pytest.approx(16 / 3)
+        assert Partial().mean is None
+
+    def test_merge_equals_one_pass(self):
+        values = [7, 3, None, 12, -4, 8, 0]
+        whole = Partial()
+        for value in values:
+            whole.add(value)
+        left, right, empty = Partial(), Partial(), Partial()
+        for value in values[:3]:
+            left.add(value)
+        for value in values[3:]:
+            right.add(value)
+        assert left.merge(empty).merge(right) == whole
+
+    def test_merge_results(self):
+        a, b = Partial(), Partial()
+        a.add(1)
+        b.add(5)
+        merged = merge_results([{"x": a}, {"x": b, "y": Partial(1, 2, 2, 2)}])
+        assert as_tuples(merged) == {"x": (2, 6, 1, 5), "y": (1, 2, 2, 2)}
+        # The inputs are not merged into
+        assert as_tuples({"a": a, "b": b}) == {"a": (1, 1, 1, 1), "b": (1, 5, 5, 5)}
+
+
+class TestChunkedAggregate:
+    """Test cases for streaming_aggregate() and parallel_aggregate()."""
+
+    def setup_method(self):
+        """Create a file database with 500 users and gaps in the ids."""
+        self.directory = tempfile.mkdtemp()
+        self.url = "sqlite:///" + os.path.join(self.directory, "test.db")
+        self.engine = create_engine(self.url)
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all(
+            [User(name=f"User {i % 3}", age=None if i % 17 == 0 else 18 + i % 40) for i in range(500)]
+        )
+        self.session.flush()
+        self.session.execute(delete(User).where(User.id.between(100, 180)))
+        self.session.commit()
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+        shutil.rmtree(self.directory)
+
+    def group_by(self, *criteria):
+        rows = self.session.execute(
+            select(User.age, func.count(User.id), func.sum(User.id), func.min(User.id), func.max(User.id))
+            .where(*criteria)
+            .group_by(User.age)
+        ).all()
+        return {row[0]: tuple(row[1:]) for row in rows}
+
+    @pytest.mark.parametrize("chunk_size", [7, 64, 10_000])
+    def test_matches_group_by(self, chunk_size):
+        result = streaming_aggregate(self.session, User.id, group_by=User.age, chunk_size=chunk_size,
+                                     batch_size=5)
+        assert as_tuples(result) == self.group_by()
+
+    def test_range_filters(self):
+        criteria = [User.age > 20, User.age < 50]
+        result = streaming_aggregate(self.session, User.id, User.age, criteria)
+        assert as_tuples(result) == self.group_by(*criteria)
+
+    def test_mean_matches_avg(self):
+        averages = dict(self.session.execute(select(User.age, func.avg(User.id)).group_by(User.age)).all())
+        result = streaming_aggregate(self.session, User.id, User.age)
+        assert {age: p.mean for age, p in result.items()} == pytest.approx(averages)
+
+    def test_multiple_or_no_group_columns(self):
+        result = streaming_aggregate(self.session, User.age, [User.name, User.age], chunk_size=50)
+        rows = self.session.execute(
+            select(User.name, User.age, func.count(User.age)).group_by(User.name, User.age)
+        ).all()
+        assert {group: p.count for group, p in result.items()} == {(n, a): c for n, a, c in rows}
+
+        total = streaming_aggregate(self.session, User.age)
+        assert list(total) == [None]
+        assert total[None].count == self.session.scalar(select(func.count(User.age)))
+
+    def chunks(self, **options):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, sql, *args: statements.append(sql))
+        result = streaming_aggregate(self.session, User.id, User.age, **options)
+        return result, [sql for sql in statements if "LIMIT" in sql]
+
+    def test_reads_in_id_chunks(self):
+        _, chunks = self.chunks(chunk_size=100)
+        assert len(chunks) == 5  # 419 rows in chunks of 100
+        assert all("ORDER BY users.id" in sql for sql in chunks)
+        assert all("users.id > ?" in sql for sql in chunks[1:])
+
+    def test_sparse_ids_skip_the_gaps(self):
+        self.session.execute(delete(User).where(User.id > 50, User.id <= 450))
+        result, chunks = self.chunks(chunk_size=40)
+        # 100 rows left: two full chunks and a short one, whatever the gap
+        assert len(chunks) == 3
+        assert sum(partial.count for partial in result.values()) == 100
+
+    def test_empty_table(self):
+        self.session.execute(delete(User))
+        assert streaming_aggregate(self.session, User.id, User.age) == {}
+
+    def test_spec_is_picklable(self):
+        spec = AggregateSpec.build(User.id, User.age, [User.name == "User 1"], self.engine.dialect)
+        assert pickle.loads(pickle.dumps(spec)) == spec
+        assert spec.where == ("users.name = 'User 1'",)
+
+    def test_split_range(self):
+        assert split_range(1, 11, 3) == [(1, 5), (5, 9), (9, 11)]
+        assert split_range(1, 3, 8) == [(1, 2), (2, 3)]
+
+    def test_parallel_matches_group_by(self):
+        criteria = [User.age > 20, User.age < 50]
+        result = parallel_aggregate(self.url, User.id, User.age, criteria, workers=2, chunk_size=60)
+        assert as_tuples(result) == self.group_by(*criteria)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,107 @@
+"""
+Test cases for the CRUD tutorial's row counting helpers.
+
+This module checks the direct, trigger-maintained counter and approximate
+(sqlite_stat1) counting modes.
+"""
+
+import os
+import sys
+import warnings
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, delete, event, insert, text
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Create-Read-Update"))
+
+from counting import RowCounter, count_rows  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, index=True)
+    age = Column(Integer)
+
+
+counter = RowCounter(User)
+counter.attach()
+
+
+class TestCounting:
+    """Test cases for count_rows() and RowCounter."""
+
+    def setup_method(self):
+        """Create the table (and counter triggers) with ten users."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all([User(name=f"User {i}", age=20 + i) for i in range(10)])
+        self.session.commit()
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_direct_count_has_no_subquery(self):
+        """A plain SELECT count(*) with optional filters."""
+        assert count_rows(self.session, User) == 10
+        assert count_rows(self.session, User, User.age >= 25) == 5
+        assert all("(SELECT" not in statement for statement in self.statements)
+
+    def test_counter_follows_orm_core_and_bulk_writes(self):
+        """Triggers keep the counter exact for every kind of write."""
+        self.session.add(User(name="New", age=99))
+        self.session.flush()
+        self.session.execute(insert(User), [{"name": "Bulk", "age": 1}] * 5)
+        self.session.execute(delete(User).where(User.age < 22))
+        self.session.commit()
+
+        expected = count_rows(self.session, User)
+        self.statements.clear()
+        assert count_rows(self.session, User, mode="counter", counter=counter) == expected == 9
+        assert not any("count(*)" in statement for statement in self.statements)
+
+    def test_install_seeds_existing_tables(self):
+        """install() works on tables created before the counter."""
+        engine = create_engine("sqlite:///:memory:")
+        User.__table__.create(engine)  # fires after_create as well
+        with engine.begin() as conn:
+            conn.execute(text("DROP TRIGGER users_row_count_insert"))
+            conn.execute(text("DELETE FROM row_counts"))
+            conn.execute(insert(User), [{"name": "A"}, {"name": "B"}])
+            # Falls back to count(*), with a warning once per counter
+            missing = RowCounter(User)
+            with pytest.warns(RuntimeWarning, match="RowCounter.install"):
+                assert count_rows(conn, User, mode="counter", counter=missing) == 2
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                assert missing.count(conn) == 2
+            counter.install(conn)
+            conn.execute(insert(User), [{"name": "C"}])
+            assert counter.count(conn) == 3
+
+    def test_approximate_count_needs_analyze(self):
+        assert count_rows(self.session, User, mode="approximate") is None
+        self.session.execute(text("ANALYZE"))
+        assert count_rows(self.session, User, mode="approximate") == 10
+
+    def test_rejects_invalid_mode_and_filtered_fast_counts(self):
+        with pytest.raises(ValueError):
+            count_rows(self.session, User, mode="guess")
+        with pytest.raises(ValueError):
+            count_rows(self.session, User, User.age > 1, mode="counter")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
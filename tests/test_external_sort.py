@@ -0,0 +1,148 @@
+"""
+Test cases for the Ordering tutorial's external merge sort export.
+
+This module checks that spilled, multi-pass merges produce the same order
+as SQLite's ORDER BY (including descending, computed and NULL keys), the
+CSV / JSON Lines writers and the cleanup of temporary run files.
+"""
+
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Ordering-Data"))
+
+from external_sort import ExportStats, export_sorted, sorted_records  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+    email = Column(String)
+
+
+class TestExternalSort:
+    """Test cases for sorted_records() and export_sorted()."""
+
+    def setup_method(self):
+        """Create 500 users with shuffled emails and some NULL ages."""
+        self.directory = tempfile.mkdtemp()
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all(
+            [
+                User(name=f"User {i % 7}", age=None if i % 11 == 0 else i * 37 % 60,
+                     email=f"{i * 7919 % 1000:04d}@example.com")
+                for i in range(500)
+            ]
+        )
+        self.session.commit()
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+        shutil.rmtree(self.directory)
+
+    def expected(self, *order_by):
+        return [tuple(row) for row in self.session.execute(
+            select(User.id, User.name, User.age, User.email).order_by(*order_by)
+        )]
+
+    def sort(self, order_by, **options):
+        records = sorted_records(
+            self.session, select(User.id, User.name, User.age, User.email), order_by,
+            directory=self.directory, **options
+        )
+        assert next(records) == ("id", "name", "age", "email")
+        return list(records)
+
+    @pytest.mark.parametrize(
+        "order_by",
+        [
+            lambda: [User.email],
+            lambda: [User.age, User.id],
+            lambda: [User.age.desc(), User.name.desc(), User.id],
+            lambda: [(User.age * 2).desc(), User.id.asc()],
+        ],
+    )
+    def test_matches_sqlite_order_by(self, order_by):
+        """Spilled runs merge into the same order SQLite produces."""
+        stats = ExportStats()
+        assert self.sort(order_by(), run_rows=37, stats=stats) == self.expected(*order_by())
+        assert stats.runs == 14 and stats.rows == 500
+
+    def test_multi_pass_merge(self):
+        stats = ExportStats()
+        rows = self.sort([User.email], run_rows=10, fan_in=4, stats=stats)
+        assert rows == self.expected(User.email)
+        # 50 runs -> 13 -> 4 -> final merge
+        assert stats.runs == 50 and stats.merge_passes == 3
+
+    def test_small_inputs_stay_in_memory(self):
+        stats = ExportStats()
+        assert self.sort([User.email], stats=stats) == self.expected(User.email)
+        assert stats.runs == 1 and stats.merge_passes == 0
+
+    def test_memory_budget_sets_the_run_size(self):
+        stats = ExportStats()
+        self.sort([User.email], memory_budget=20_000, stats=stats)
+        assert 1 < stats.run_rows < 500 and stats.runs > 1
+
+    def test_memory_budget_with_variable_width_rows(self):
+        """Runs are sized from every row, not just a short first one."""
+        self.session.query(User).filter(User.id > 1).update({User.name: User.name + "x" * 2000})
+        self.session.commit()
+        stats = ExportStats()
+        rows = self.sort([User.email], memory_budget=200_000, stats=stats)
+        assert rows == self.expected(User.email)
+        # Rows of ~2 KB: ~95 per run, not the ~425 sized from the short first row
+        assert stats.run_rows < 120 and stats.runs > 4
+        assert stats.run_bytes < 240_000
+
+    def test_run_files_are_removed(self):
+        records = sorted_records(self.session, select(User), [User.email], run_rows=50, directory=self.directory)
+        next(records)
+        next(records)
+        assert len(os.listdir(self.directory)) == 1
+        records.close()
+        assert os.listdir(self.directory) == []
+
+    def test_entity_select_exports_mapped_columns(self):
+        path = os.path.join(self.directory, "users.csv")
+        stats = export_sorted(self.session, select(User), [User.email], path, run_rows=100)
+        with open(path, newline="") as source:
+            rows = list(csv.reader(source))
+        assert rows[0] == ["id", "name", "age", "email"]
+        assert [row[3] for row in rows[1:]] == [row[3] for row in self.expected(User.email)]
+        assert stats.rows == 500
+
+    def test_jsonl_export(self):
+        path = os.path.join(self.directory, "users.jsonl")
+        export_sorted(self.session, select(User.id, User.age), [User.age.desc(), User.id], path, run_rows=64)
+        with open(path) as source:
+            rows = [json.loads(line) for line in source]
+        assert [(row["id"], row["age"]) for row in rows] == [
+            (row[0], row[2]) for row in self.expected(User.age.desc(), User.id)
+        ]
+        assert rows[-1]["age"] is None
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            export_sorted(self.session, select(User), [User.id], os.path.join(self.directory, "users.xml"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,144 @@
+"""
+Test cases for the Joins tutorial's portable FULL OUTER JOIN.
+
+This module checks that the UNION ALL emulation returns the same rows as
+SQLite's native FULL OUTER JOIN, with and without filters, and how the
+"auto" strategy reads the SQLite version and the available indexes.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, create_engine, event
+from sqlalchemy.orm import Session, declarative_base, relationship
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Types-of-JOINS"))
+
+from full_join import choose_strategy, full_outer_join, right_side_indexed, supports_full_outer_join  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    id = Column(Integer, primary_key=True)
+    first_name = Column(String)
+    addresses = relationship("Address", backref="user")
+
+
+class Address(Base):
+    __tablename__ = "address"
+
+    id = Column(Integer, primary_key=True)
+    city = Column(String)
+    user_id = Column(Integer, ForeignKey("user.id"))
+
+
+class Order(Base):
+    __tablename__ = "order"
+    __table_args__ = (Index("ix_order_user_id", "user_id"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id"))
+
+
+def ordered(rows):
+    """Sort ``(id or None, id or None)`` pairs, None first."""
+    return sorted(rows, key=lambda row: tuple(-1 if value is None else value for value in row))
+
+
+def ids(session, statement):
+    return ordered(
+        ((left.id if left else None), (right.id if right else None))
+        for left, right in session.execute(statement)
+    )
+
+
+class TestFullOuterJoin:
+    """Test cases for full_outer_join() and the strategy selection."""
+
+    def setup_method(self):
+        """Create users with 0-2 addresses and a few orphan addresses."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        users = [User(first_name=f"User {i}") for i in range(10)]
+        self.session.add_all(users)
+        self.session.add_all(
+            [Address(city=f"City {i}", user=users[i % 7] if i % 4 else None) for i in range(12)]
+        )
+        self.session.commit()
+        self.expected = ordered(
+            [(u.id, a.id) for u in users for a in u.addresses]
+            + [(u.id, None) for u in users if not u.addresses]
+            + [(None, a.id) for a in self.session.query(Address).filter(Address.user_id == None)]  # noqa: E711
+        )
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    @pytest.mark.parametrize("strategy", ["native", "union", "auto"])
+    def test_every_strategy_returns_the_full_join(self, strategy):
+        assert ids(self.session, full_outer_join(self.session, User, Address, strategy=strategy)) == self.expected
+
+    @pytest.mark.parametrize("strategy", ["native", "union"])
+    def test_criteria(self, strategy):
+        unmatched = full_outer_join(
+            self.session, User, Address, User.addresses == None, Address.user_id == None,  # noqa: E711
+            strategy=strategy,
+        )
+        assert ids(self.session, unmatched) == [row for row in self.expected if None in row]
+        by_city = full_outer_join(self.session, User, Address, Address.city.in_(["City 1", "City 4"]),
+                                  strategy=strategy)
+        assert ids(self.session, by_city) == ordered([(2, 2), (None, 5)])
+
+    def test_explicit_onclause_and_order(self):
+        statement = full_outer_join(self.session, Address, User, onclause=Address.user_id == User.id,
+                                    strategy="union")
+        assert ids(self.session, statement) == ordered(
+            (address_id, user_id) for user_id, address_id in self.expected
+        )
+
+    def test_union_emits_no_full_join(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        ids(self.session, full_outer_join(self.session, User, Address, strategy="union"))
+        assert "UNION ALL" in statements[-1] and "FULL" not in statements[-1]
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            full_outer_join(self.session, User, Address, strategy="merge")
+
+    def test_capability_detection(self):
+        def dialect(name, version=None):
+            return SimpleNamespace(name=name, dbapi=SimpleNamespace(sqlite_version_info=version))
+
+        assert supports_full_outer_join(dialect("sqlite", (3, 39, 0)))
+        assert not supports_full_outer_join(dialect("sqlite", (3, 38, 5)))
+        assert not supports_full_outer_join(dialect("mysql"))
+        assert supports_full_outer_join(dialect("postgresql"))
+
+    def test_auto_needs_an_index_on_sqlite(self):
+        assert not right_side_indexed(self.session, User, Address)
+        assert choose_strategy(self.session, User, Address) == "union"
+        # The other way round the join column is the user primary key
+        assert right_side_indexed(self.session, Address, User)
+        assert right_side_indexed(self.engine, User, Order)
+        assert right_side_indexed(self.engine, User, Address, onclause=User.id == Address.id)
+        assert not right_side_indexed(self.engine, User, Address, onclause=User.addresses)
+        if supports_full_outer_join(self.engine):
+            assert choose_strategy(self.engine, User, Order) == "native"
+
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("CREATE INDEX ix_address_user_id ON address (user_id)")
+        self.session.rollback()
+        assert right_side_indexed(self.session, User, Address)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,142 @@
+"""
+Test cases for the Indexes tutorial's read-through identity cache.
+
+This module checks cache hits skip SQL, unique-column lookups, LRU and TTL
+eviction, counters, and invalidation from flushes, commits and bulk
+statements.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event, update
+from sqlalchemy.orm import declarative_base, deferred, sessionmaker
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Indexes"))
+
+from identity_cache import IdentityCache, unique_columns  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), index=True)
+    email = deferred(Column(String(120), unique=True))
+    password = deferred(Column(String(200)))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestIdentityCache:
+    """Test cases for IdentityCache."""
+
+    def setup_method(self):
+        """Seed three users and attach a fresh cache."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            session.add_all(
+                [User(name=name, email=f"{name.lower()}@example.com") for name in ("Ahmed", "Omar", "Ali")]
+            )
+            session.commit()
+        self.clock = FakeClock()
+        self.cache = IdentityCache(User, maxsize=2, ttl=60, clock=self.clock)
+        self.cache.attach(self.Session)
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+
+    def teardown_method(self):
+        self.engine.dispose()
+
+    def test_discovers_unique_columns(self):
+        assert unique_columns(User) == ("email",)
+
+    def test_hits_skip_sql_in_new_sessions(self):
+        """The second session gets the row without any statement."""
+        with self.Session() as session:
+            assert self.cache.get_by(session, "email", "omar@example.com").name == "Omar"
+        self.statements.clear()
+
+        with self.Session() as session:
+            user = self.cache.get_by(session, "email", "omar@example.com")
+            by_pk = self.cache.get(session, user.id)
+            assert by_pk is user
+            assert (user.name, user.password) == ("Omar", None)
+
+        assert self.statements == []
+        assert (self.cache.hits, self.cache.misses) == (2, 1)
+
+    def test_missing_rows_return_none(self):
+        with self.Session() as session:
+            assert self.cache.get(session, 99) is None
+            assert self.cache.get_by(session, "email", "nobody@example.com") is None
+        with pytest.raises(ValueError):
+            self.cache.get_by(session, "name", "Omar")
+
+    def test_lru_eviction_and_ttl(self):
+        """maxsize evicts the least recently used row; ttl expires entries."""
+        with self.Session() as session:
+            self.cache.get(session, 1)
+            self.cache.get(session, 2)
+            self.cache.get(session, 1)
+            self.cache.get(session, 3)
+        assert self.cache.evictions == 1
+        assert len(self.cache) == 2
+
+        self.statements.clear()
+        with self.Session() as session:
+            self.cache.get(session, 1)
+            assert self.statements == []
+            self.clock.now = 61
+            self.cache.get(session, 1)
+            assert len(self.statements) == 1
+
+    def test_commit_invalidates_changed_rows(self):
+        """Updated unique values are not served from the old entry."""
+        with self.Session() as session:
+            user = self.cache.get_by(session, "email", "ahmed@example.com")
+            user.email = "ahmed@new.example.com"
+            session.commit()
+
+        with self.Session() as session:
+            assert self.cache.get_by(session, "email", "ahmed@example.com") is None
+            assert self.cache.get_by(session, "email", "ahmed@new.example.com").name == "Ahmed"
+
+    def test_uncommitted_rows_are_not_cached(self):
+        """Rows read after a flush in the same transaction stay private."""
+        with self.Session() as session:
+            user = session.get(User, 2)
+            user.name = "Changed"
+            session.flush()
+            assert self.cache.get(session, 2).name == "Changed"
+            session.rollback()
+        assert len(self.cache) == 0
+
+    def test_bulk_update_clears_the_cache(self):
+        with self.Session() as session:
+            self.cache.get(session, 1)
+            session.execute(update(User).values(name="Renamed"))
+            session.commit()
+        assert len(self.cache) == 0
+
+        with self.Session() as session:
+            assert self.cache.get(session, 1).name == "Renamed"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
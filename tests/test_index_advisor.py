@@ -0,0 +1,127 @@
+"""
+Test cases for the Indexes tutorial's query plan capture and index advisor.
+
+This module checks statement capture, SCAN/SEARCH classification, index
+proposals and the what-if run on a database copy.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, func, inspect, or_
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Indexes"))
+
+from index_advisor import (  # noqa: E402
+    PlanCapture,
+    classify,
+    explain,
+    propose_indexes,
+    what_if,
+)
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+    email = Column(String, index=True)
+
+
+class TestIndexAdvisor:
+    """Test cases for PlanCapture, explain(), propose_indexes() and what_if()."""
+
+    def setup_method(self):
+        """Create a file database with 2,000 users."""
+        self.directory = tempfile.mkdtemp()
+        self.database = os.path.join(self.directory, "test.db")
+        self.engine = create_engine("sqlite:///" + self.database)
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all(
+            [User(name=f"User {i % 50}", age=i % 70, email=f"u{i}@example.com") for i in range(2000)]
+        )
+        self.session.commit()
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+        shutil.rmtree(self.directory)
+
+    def capture(self, *queries):
+        with PlanCapture(self.engine) as capture:
+            for query in queries:
+                query.all()
+        return capture
+
+    def test_classify(self):
+        assert classify("SCAN users") == "scan"
+        assert classify("SCAN users USING COVERING INDEX ix_users_age") == "index scan"
+        assert classify("SEARCH users USING INDEX ix_users_email (email=?)") == "search"
+        assert classify("SEARCH users USING INTEGER PRIMARY KEY (rowid=?)") == "search"
+        assert classify("USE TEMP B-TREE FOR ORDER BY") == "temp b-tree"
+
+    def test_capture_counts_distinct_selects(self):
+        """Repeated shapes are grouped; only SELECTs are kept."""
+        query = self.session.query(User).filter_by(age=5)
+        capture = self.capture(query, query, self.session.query(User).filter_by(name="User 1"))
+        assert len(capture.statements) == 2
+        assert sorted(s.executions for s in capture.statements) == [1, 2]
+
+    def test_flags_scans_and_searches(self):
+        capture = self.capture(
+            self.session.query(User).filter(User.age == 5),
+            self.session.query(User).filter(User.email == "u5@example.com"),
+        )
+        plans = {("age" if "age" in s.sql.split("WHERE")[1] else "email"): explain(self.engine, s)
+                 for s in capture.statements}
+        assert plans["age"].has_full_scan and not plans["age"].uses_index
+        assert plans["email"].uses_index and not plans["email"].has_full_scan
+
+    def test_proposes_equality_then_range_or_order(self):
+        """Equality columns lead; prefixes fold into longer candidates."""
+        capture = self.capture(
+            self.session.query(User).filter(User.name == "User 1", User.age > 30),
+            self.session.query(User).filter(User.name == "User 1"),
+            self.session.query(User).order_by(User.age, User.name),
+            self.session.query(User.age, func.count(User.id)).group_by(User.age),
+            self.session.query(User).filter(User.email == "u1@example.com"),
+        )
+        proposals = propose_indexes([explain(self.engine, s) for s in capture.statements])
+        definitions = sorted(p.definition() for p in proposals)
+        assert definitions == [
+            "Index('ix_users_age_name', 'age', 'name')",
+            "Index('ix_users_name_age', 'name', 'age')",
+        ]
+        # Proposals never modify the model's metadata
+        assert {index.name for index in User.__table__.indexes} == {"ix_users_email"}
+
+    def test_or_branches_get_one_index_each(self):
+        capture = self.capture(
+            self.session.query(User).filter(or_(User.name == "User 1", User.age == 3)),
+        )
+        proposals = propose_indexes([explain(self.engine, s) for s in capture.statements])
+        assert {p.name for p in proposals} == {"ix_users_name", "ix_users_age"}
+
+    def test_what_if_runs_on_a_copy(self):
+        """Candidates turn SCAN into SEARCH without touching the original file."""
+        capture = self.capture(self.session.query(User).filter(User.name == "User 7", User.age == 7))
+        proposals = propose_indexes([explain(self.engine, s) for s in capture.statements])
+
+        results = what_if(self.database, capture.statements, proposals, repeats=1)
+
+        assert results[0].before_plan == ["SCAN users"]
+        assert results[0].after_plan[0].startswith("SEARCH users USING INDEX ix_users_name_age")
+        assert "ix_users_name_age" not in {i["name"] for i in inspect(self.engine).get_indexes("users")}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,114 @@
+"""
+Test cases for the Relationship-Loading-Techniques loader benchmark.
+
+This module checks that loader_benchmark.py records the statement and row
+counts each loading strategy is known to produce.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, insert
+from sqlalchemy.orm import declarative_base, relationship
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Relationship-Loading-Techniques")
+)
+
+from loader_benchmark import create_counting_engine, run_case  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    posts = relationship("Post")
+
+
+class Post(Base):
+    __tablename__ = "posts"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    user_id = Column(Integer, ForeignKey("users.id"))
+
+
+class TestLoaderBenchmark:
+    """Test cases for run_case()."""
+
+    USERS = 5
+    POSTS_PER_USER = 3
+
+    def setup_method(self):
+        """Create a file database with 5 users and 3 posts each."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine, self.counter = create_counting_engine(
+            os.path.join(self.directory.name, "bench.db")
+        )
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(insert(User), [{"name": f"User {i}"} for i in range(self.USERS)])
+            conn.execute(
+                insert(Post),
+                [
+                    {"title": "post", "user_id": u}
+                    for u in range(1, self.USERS + 1)
+                    for _ in range(self.POSTS_PER_USER)
+                ],
+            )
+
+    def teardown_method(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def run(self, strategy, pattern):
+        return run_case(self.engine, self.counter, User, "posts", strategy, pattern)
+
+    def test_lazy_select_issues_one_query_per_user(self):
+        """The 'select' strategy shows the N+1 pattern."""
+        result = self.run("select", "touch_posts")
+        assert result["statements"] == 1 + self.USERS
+        assert result["rows_fetched"] == self.USERS * (1 + self.POSTS_PER_USER)
+        assert result["error"] is None
+
+    @pytest.mark.parametrize("strategy", ["subquery", "selectin"])
+    def test_batched_strategies_use_two_queries(self, strategy):
+        """subquery and selectin load all children in a second statement."""
+        result = self.run(strategy, "count_posts")
+        assert result["statements"] == 2
+        assert result["rows_fetched"] == self.USERS * (1 + self.POSTS_PER_USER)
+
+    def test_joined_uses_one_query(self):
+        """joined loading fetches one row per child through a single JOIN."""
+        result = self.run("joined", "touch_posts")
+        assert result["statements"] == 1
+        assert result["rows_fetched"] == self.USERS * self.POSTS_PER_USER
+
+    def test_raise_strategy_records_error(self):
+        """Touching a raiseload collection is reported rather than propagated."""
+        result = self.run("raise", "touch_posts")
+        assert result["error"] is not None
+        assert self.run("raise", "iterate_users")["error"] is None
+
+    def test_result_is_json_friendly(self):
+        """Every metric needed for the report is present."""
+        result = self.run("selectin", "iterate_users")
+        assert set(result) == {
+            "strategy",
+            "pattern",
+            "seconds",
+            "statements",
+            "rows_fetched",
+            "peak_memory_bytes",
+            "error",
+        }
+        assert result["peak_memory_bytes"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,140 @@
+"""
+Test cases for the Filtering tutorial's temp-table IN / NOT IN helpers.
+
+This module checks that large_in() and large_not_in() return the same rows
+as plain in_() / not_in(), including NULL semantics, and that the temp
+table only lives for the duration of the block.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Integer, String, TypeDecorator, create_engine, inspect, select, text
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Filtering-Data"))
+
+from membership import large_in, large_not_in  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+
+
+class Lowercase(TypeDecorator):
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.lower() if value is not None else None
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    code = Column(Lowercase, primary_key=True)
+
+
+def temp_tables(session):
+    return session.execute(text("SELECT name FROM sqlite_temp_master WHERE type = 'table'")).scalars().all()
+
+
+class TestMembership:
+    """Test cases for large_in() and large_not_in()."""
+
+    def setup_method(self):
+        """Create 200 users, every tenth without a name or age."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all(
+            [
+                User(name=None if i % 10 == 0 else f"User {i}", age=None if i % 10 == 0 else i % 40)
+                for i in range(1, 201)
+            ]
+        )
+        self.session.commit()
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def ids(self, criterion):
+        return self.session.scalars(select(User.id).where(criterion).order_by(User.id)).all()
+
+    @pytest.mark.parametrize("threshold", [0, 10_000])
+    def test_matches_plain_in_and_not_in(self, threshold):
+        """Both strategies agree with the expanding IN they replace."""
+        values = list(range(0, 300, 3)) + [3, 6]
+        with large_in(self.session, User.id, values, threshold=threshold) as criterion:
+            assert self.ids(criterion) == self.ids(User.id.in_(values))
+        with large_not_in(self.session, User.id, values, threshold=threshold) as criterion:
+            assert self.ids(criterion) == self.ids(User.id.not_in(values))
+
+    @pytest.mark.parametrize("threshold", [0, 10_000])
+    def test_not_in_excludes_null_rows(self, threshold):
+        names = [f"User {i}" for i in range(1, 50)]
+        with large_not_in(self.session, User.name, names, threshold=threshold) as criterion:
+            ids = self.ids(criterion)
+        assert ids == self.ids(User.name.not_in(names))
+        assert all(i % 10 for i in ids)
+
+    @pytest.mark.parametrize("threshold", [0, 10_000])
+    def test_null_in_the_list(self, threshold):
+        """NOT IN (..., NULL) matches nothing; IN ignores the NULL."""
+        with large_not_in(self.session, User.age, [1, 2, None], threshold=threshold) as criterion:
+            assert self.ids(criterion) == []
+        with large_in(self.session, User.age, [1, 2, None], threshold=threshold) as criterion:
+            assert self.ids(criterion) == self.ids(User.age.in_([1, 2]))
+
+    def test_temp_table_dropped_after_block(self):
+        with large_in(self.session, User.id, range(100), threshold=10) as criterion:
+            assert len(temp_tables(self.session)) == 1
+            assert len(self.ids(criterion)) == 99
+        assert temp_tables(self.session) == []
+        # Temp tables never appear in the main schema
+        assert inspect(self.engine).get_table_names() == ["tags", "users"]
+
+    def test_values_use_the_column_type(self):
+        """Temp-table values go through the column type's bind processing."""
+        self.session.add_all([Tag(code=code) for code in ("red", "green", "blue")])
+        self.session.commit()
+        with large_in(self.session, Tag.code, ["RED", "Blue"], threshold=0) as criterion:
+            codes = self.session.scalars(select(Tag.code).where(criterion).order_by(Tag.code)).all()
+        assert codes == ["blue", "red"]
+        # Distinct in Python, equal once processed
+        with large_in(self.session, Tag.code, ["RED", "red", "Red"], threshold=0) as criterion:
+            assert self.session.scalars(select(Tag.code).where(criterion)).all() == ["red"]
+        with large_not_in(self.session, Tag.code, ["RED", "red"], threshold=0) as criterion:
+            assert len(self.session.scalars(select(Tag.code).where(criterion)).all()) == 2
+
+    def test_commit_inside_the_block(self):
+        """Committing is not supported in the block, but the temp table is still dropped."""
+        with large_in(self.session, User.id, range(100), threshold=10):
+            self.session.commit()
+        # The connection the table was created on, checked out again
+        assert temp_tables(self.session) == []
+        with self.engine.connect() as conn:
+            assert temp_tables(conn) == []
+
+    def test_short_lists_stay_inline(self):
+        with large_in(self.session, User.id, [1, 2, 3]) as criterion:
+            assert temp_tables(self.session) == []
+            assert self.ids(criterion) == [1, 2, 3]
+
+    def test_works_with_a_connection(self):
+        with self.engine.connect() as conn:
+            with large_not_in(conn, User.id, range(1, 196), threshold=0) as criterion:
+                rows = conn.execute(select(User.id).where(criterion).order_by(User.id)).scalars().all()
+        assert rows == [196, 197, 198, 199, 200]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
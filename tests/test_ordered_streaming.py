@@ -0,0 +1,116 @@
+"""
+Test cases for the Ordering tutorial's index-ordered streaming helpers.
+
+This module checks the covering index plans, ordered streaming with
+yield_per, top-K queries and the plan assertions.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Index, Integer, String, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Ordering-Data"))
+
+from ordered_streaming import assert_index_order, query_plan, stream_ordered, top_k  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+    __table_args__ = (Index("ix_users_age_name_covering", "age", "name", "id", "email"),)
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+    email = Column(String)
+
+
+class Unindexed(Base):
+    __tablename__ = "unindexed"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+
+
+ORDER = (User.age, User.name, User.id)
+
+
+class TestOrderedStreaming:
+    """Test cases for stream_ordered(), top_k() and the plan helpers."""
+
+    def setup_method(self):
+        """Create 300 users with repeated ages and names."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        names = ["Ahmed", "Omar", "Ali", "Belal"]
+        self.session.add_all(
+            [User(name=names[i * 7 % 4], age=18 + i * 13 % 30, email=f"u{i}@example.com") for i in range(300)]
+        )
+        self.session.add_all([Unindexed(name=names[i % 4], age=i % 9) for i in range(50)])
+        self.session.commit()
+        self.expected = sorted(
+            self.session.query(User.age, User.name, User.id).all(), key=lambda row: tuple(row)
+        )
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_covering_index_removes_the_sort(self):
+        plan = assert_index_order(self.session, select(User).order_by(*ORDER), "ix_users_age_name_covering")
+        assert plan == ["SCAN users USING COVERING INDEX ix_users_age_name_covering"]
+
+    def test_plan_assertion_fails_on_a_temp_b_tree(self):
+        statement = select(Unindexed).order_by(Unindexed.age, Unindexed.name)
+        assert "USE TEMP B-TREE FOR ORDER BY" in query_plan(self.session, statement)
+        with pytest.raises(AssertionError, match="temp B-tree"):
+            assert_index_order(self.session, statement)
+        with pytest.raises(AssertionError, match="does not use ix_other"):
+            assert_index_order(self.session, select(User).order_by(*ORDER), "ix_other")
+
+    def test_plan_accepts_queries_and_bound_values(self):
+        query = self.session.query(User).filter(User.age == 20).order_by(User.name, User.id)
+        assert query_plan(self.session, query)[0].startswith("SEARCH users USING COVERING INDEX")
+
+    def test_plan_expands_in_lists(self):
+        statement = select(User).where(User.age.in_([20, 21, 22]), User.name != "x").order_by(*ORDER)
+        assert query_plan(self.session, statement)[0].startswith("SEARCH users USING COVERING INDEX")
+        # A primary key lookup, then a sort
+        with pytest.raises(AssertionError, match="temp B-tree"):
+            assert_index_order(self.session, select(User).where(User.id.in_([1, 2])).order_by(*ORDER))
+
+    def test_stream_in_index_order(self):
+        users = list(stream_ordered(self.session, select(User), ORDER, batch_size=7))
+        assert [(u.age, u.name, u.id) for u in users] == [tuple(row) for row in self.expected]
+
+    def test_stream_rows_and_early_stop(self):
+        rows = stream_ordered(self.session, select(User.age, User.name, User.id), ORDER, batch_size=10)
+        first = [next(rows) for _ in range(3)]
+        rows.close()
+        assert [tuple(row) for row in first] == [tuple(row) for row in self.expected[:3]]
+        # The cursor was released, so the session keeps working
+        assert self.session.query(User).count() == 300
+
+    def test_top_k(self):
+        assert [(u.age, u.name, u.id) for u in top_k(self.session, select(User), ORDER, 5)] == [
+            tuple(row) for row in self.expected[:5]
+        ]
+        assert top_k(self.session, self.session.query(User), ORDER, 0) == []
+        assert len(top_k(self.session, select(User), ORDER, 1000)) == 300
+        assert_index_order(self.session, select(User).order_by(*ORDER).limit(5))
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            next(stream_ordered(self.session, select(User), ORDER, batch_size=0))
+        with pytest.raises(ValueError):
+            top_k(self.session, select(User), ORDER, -1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
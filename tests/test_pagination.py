@@ -0,0 +1,112 @@
+"""
+Test cases for the Ordering-Data keyset paginator.
+
+This module checks that paginate() walks a table in the same order as a
+plain ORDER BY, with stable cursors, mixed directions and no OFFSET.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event, insert, select
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Ordering-Data"))
+
+from pagination import (  # noqa: E402
+    decode_cursor,
+    encode_cursor,
+    iterate_pages,
+    paginate,
+)
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+
+
+class TestKeysetPagination:
+    """Test cases for paginate() and iterate_pages()."""
+
+    def setup_method(self):
+        """Create 47 users with many duplicate (age, name) pairs."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        names = ["Ahmed", "Omar", "Ali"]
+        with self.engine.begin() as conn:
+            conn.execute(
+                insert(User),
+                [{"name": names[i % 3], "age": 20 + i % 5} for i in range(47)],
+            )
+        self.session = Session(self.engine)
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_pages_match_plain_order_by(self):
+        """Concatenated pages equal the full ordered result."""
+        order_by = (User.age, User.name, User.id)
+        expected = self.session.scalars(select(User.id).order_by(*order_by)).all()
+
+        pages = list(iterate_pages(self.session, select(User), order_by, page_size=10))
+
+        assert [len(page) for page in pages] == [10, 10, 10, 10, 7]
+        assert [user.id for page in pages for user in page] == expected
+        assert not pages[-1].has_next
+
+    def test_mixed_directions(self):
+        """DESC/ASC combinations use the expanded seek condition."""
+        order_by = (User.age.desc(), User.name, User.id.desc())
+        expected = self.session.scalars(select(User.id).order_by(*order_by)).all()
+
+        pages = iterate_pages(self.session, select(User), order_by, page_size=6)
+
+        assert [user.id for page in pages for user in page] == expected
+
+    def test_column_queries_and_legacy_query(self):
+        """Multi-column selects and legacy Query objects are supported."""
+        query = self.session.query(User.name, User.age)
+        page = paginate(self.session, query, (User.id,), page_size=3)
+        assert page.items == [("Ahmed", 20), ("Omar", 21), ("Ali", 22)]
+
+        page = paginate(self.session, query, (User.id,), page_size=3, cursor=page.next_cursor)
+        assert page.items == [("Ahmed", 23), ("Omar", 24), ("Ali", 20)]
+
+    def test_later_pages_seek_instead_of_skipping(self):
+        """Later pages seek with WHERE and never skip rows with OFFSET."""
+        executed = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, parameters, *args: executed.append(
+                (statement, parameters)
+            ),
+        )
+        first = paginate(self.session, select(User), (User.age, User.id), page_size=5)
+        paginate(self.session, select(User), (User.age, User.id), 5, first.next_cursor)
+
+        statement = executed[-1][0]
+        assert "(users.age, users.id) > (?, ?)" in statement
+        # SQLite always renders "LIMIT ? OFFSET ?"; the offset must stay 0
+        assert all(params[-1] == 0 for _, params in executed)
+
+    def test_cursor_round_trip_and_validation(self):
+        """Cursors are opaque tokens and bad tokens are rejected."""
+        token = encode_cursor([30, "Ahmed", 7])
+        assert decode_cursor(token) == [30, "Ahmed", 7]
+        with pytest.raises(ValueError):
+            decode_cursor("not a cursor!")
+        with pytest.raises(ValueError):
+            paginate(self.session, select(User), (User.age, User.id), cursor=encode_cursor([1]))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,110 @@
+"""
+Test cases for the denormalized post counter in post_counter.py.
+
+This module checks that the triggers keep ``users.post_count`` correct on
+insert, delete and re-parenting, that loaded users are refreshed after a
+flush and that verify/rebuild detect and repair drift.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, insert, text
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Relationship-Loading-Techniques")
+)
+
+from post_counter import DenormalizedCounter  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    posts = relationship("Post", backref="user")
+
+
+class Post(Base):
+    __tablename__ = "posts"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    user_id = Column(Integer, ForeignKey("users.id"))
+
+
+Session = sessionmaker()
+counter = DenormalizedCounter(User, Post, "user_id", "post_count")
+counter.attach(Session)
+
+
+class TestDenormalizedCounter:
+    """Test cases for DenormalizedCounter."""
+
+    def setup_method(self):
+        """Create the schema (with triggers) and two users."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(bind=self.engine)
+        self.alice = User(name="Alice")
+        self.bob = User(name="Bob")
+        self.session.add_all([self.alice, self.bob])
+        self.session.commit()
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_orm_inserts_update_loaded_users(self):
+        """Adding posts through the ORM refreshes the loaded parent."""
+        self.alice.posts.extend([Post(title="a"), Post(title="b")])
+        self.session.flush()
+        assert self.alice.post_count == 2
+
+    def test_core_bulk_inserts_are_counted(self):
+        """Rows inserted with Core executemany still fire the triggers."""
+        self.session.execute(insert(Post), [{"user_id": self.bob.id}] * 5)
+        self.session.commit()
+        assert self.bob.post_count == 5
+
+    def test_delete_and_reparent(self):
+        """Deleting and moving posts adjusts both old and new parents."""
+        posts = [Post(title=str(i)) for i in range(3)]
+        self.alice.posts.extend(posts)
+        self.session.commit()
+
+        self.session.delete(posts[0])
+        posts[1].user = self.bob
+        self.session.commit()
+
+        assert (self.alice.post_count, self.bob.post_count) == (1, 1)
+        assert counter.verify(self.session) == []
+
+    def test_verify_and_rebuild_fix_drift(self):
+        """Manual edits are reported by verify() and repaired by rebuild()."""
+        self.alice.posts.append(Post(title="x"))
+        self.session.commit()
+        self.session.execute(text("UPDATE users SET post_count = 7 WHERE name = 'Alice'"))
+
+        assert counter.verify(self.session) == [(self.alice.id, 7, 1)]
+        assert counter.rebuild(self.session) == 2
+        assert counter.verify(self.session) == []
+
+    def test_install_is_idempotent(self):
+        """Installing the triggers again does not create duplicates."""
+        with self.engine.begin() as conn:
+            counter.install(conn)
+            triggers = conn.execute(
+                text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")
+            ).scalar()
+        assert triggers == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
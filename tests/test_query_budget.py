@@ -0,0 +1,135 @@
+"""
+Test cases for the N+1 detector in query_budget.py.
+
+The models below reproduce the lazy ``__repr__`` patterns from the
+many-many and one-one tutorials so the budget can be checked against them.
+"""
+
+import logging
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base, relationship, selectinload
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Relationship-Loading-Techniques")
+)
+
+from query_budget import QueryBudget, QueryBudgetExceeded, fingerprint  # noqa: E402
+
+Base = declarative_base()
+
+
+class Doctor(Base):
+    __tablename__ = "doctors"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    appointments = relationship("Appointment", back_populates="doctor")
+
+    def __repr__(self):
+        return f"<Doctor(name='{self.name}', appointments_count={len(self.appointments)})>"
+
+
+class Appointment(Base):
+    __tablename__ = "appointments"
+
+    id = Column(Integer, primary_key=True)
+    doctor_id = Column(Integer, ForeignKey("doctors.id"))
+    doctor = relationship("Doctor", back_populates="appointments")
+
+
+class Node(Base):
+    __tablename__ = "nodes"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False)
+    node_id = Column(Integer, ForeignKey("nodes.id"))
+    next_node = relationship("Node", remote_side=[id], uselist=False)
+
+    def __repr__(self):
+        return f"<Node value={self.value}, next node={self.next_node}>>"
+
+
+class TestQueryBudget:
+    """Test cases for QueryBudget."""
+
+    def setup_method(self):
+        """Create ten doctors with two appointments each and a 4-node chain."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            for i in range(10):
+                session.add(Doctor(name=f"Dr {i}", appointments=[Appointment(), Appointment()]))
+            tail = None
+            for value in range(4):
+                tail = Node(value=value, next_node=tail)
+                session.add(tail)
+            session.commit()
+
+    def teardown_method(self):
+        self.engine.dispose()
+
+    def test_fingerprint_normalizes_literals_and_in_lists(self):
+        """Statements differing only in parameters share a fingerprint."""
+        assert fingerprint("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == fingerprint(
+            "SELECT * FROM t WHERE id IN (?)"
+        )
+        assert fingerprint("SELECT * FROM t WHERE name = 'x' AND age = 3") == (
+            "SELECT * FROM t WHERE name = ? AND age = ?"
+        )
+
+    def test_repr_n_plus_one_raises(self):
+        """Doctor.__repr__ issues one query per doctor and trips max_repeats."""
+        with pytest.raises(QueryBudgetExceeded, match="possible N\\+1: 10 x"):
+            with Session(self.engine) as session, QueryBudget(self.engine, max_repeats=3):
+                repr(session.query(Doctor).all())
+
+    def test_eager_loading_stays_within_budget(self):
+        """selectinload brings the same repr down to two statements."""
+        with Session(self.engine) as session:
+            with QueryBudget(self.engine, max_statements=2, max_repeats=1) as budget:
+                repr(session.query(Doctor).options(selectinload(Doctor.appointments)).all())
+        assert budget.statements == 2
+        assert budget.violations == []
+
+    def test_recursive_repr_counts_each_hop(self):
+        """Node.__repr__ follows next_node one lazy load at a time."""
+        with Session(self.engine) as session:
+            with QueryBudget(self.engine, action="log", max_repeats=None) as budget:
+                head = session.query(Node).order_by(Node.value.desc()).first()
+                repr(head)
+        assert budget.statements == 4
+
+    def test_log_action_warns_instead_of_raising(self, caplog):
+        """action='log' reports the violation through logging."""
+        with caplog.at_level(logging.WARNING):
+            with Session(self.engine) as session:
+                with QueryBudget(self.engine, max_statements=1, action="log") as budget:
+                    repr(session.query(Doctor).all())
+        assert budget.statements == 11
+        assert "11 statements issued, budget is 1" in caplog.text
+
+    def test_decorator_counts_each_call(self):
+        """Used as a decorator the budget applies to every call separately."""
+
+        @QueryBudget(self.engine, max_statements=1)
+        def count_doctors(session):
+            return session.query(Doctor).count()
+
+        with Session(self.engine) as session:
+            assert count_doctors(session) == 10
+            assert count_doctors(session) == 10
+
+    def test_original_exception_is_not_masked(self):
+        """Errors raised inside the unit of work propagate unchanged."""
+        with pytest.raises(KeyError):
+            with Session(self.engine) as session, QueryBudget(self.engine, max_statements=0):
+                session.query(Doctor).all()
+                raise KeyError("boom")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,95 @@
+"""
+Test cases for the Filtering tutorial's named query registry.
+
+This module checks that registered statements return the same rows as the
+ad-hoc filters, reuse the compiled cache and report hit ratios.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Integer, String, bindparam, create_engine, or_, select
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Filtering-Data"))
+
+from query_registry import QueryRegistry, register_user_filters  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+    email = Column(String)
+
+
+class TestQueryRegistry:
+    """Test cases for QueryRegistry."""
+
+    def setup_method(self):
+        """Seed users and register the tutorial's filters."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        names = ["Ahmed", "Omar", "Ali"]
+        self.session.add_all([User(name=names[i % 3], age=20 + i % 4) for i in range(12)])
+        self.session.commit()
+        self.registry = register_user_filters(QueryRegistry(), User)
+        self.registry.attach(self.engine)
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def ids(self, users):
+        return sorted(user.id for user in users)
+
+    def test_results_match_adhoc_filters(self):
+        """Every registered shape returns what session.query() returns."""
+        query = self.session.query(User)
+        cases = [
+            ("by_age", {"age": 21}, query.filter_by(age=21)),
+            ("by_name_and_age", {"name": "Ali", "age": 22}, query.filter_by(name="Ali", age=22)),
+            ("min_age", {"min_age": 22}, query.filter(User.age >= 22)),
+            ("name_or_age", {"name": "Omar", "age": 20},
+             query.filter(or_(User.name == "Omar", User.age == 20))),
+            ("not_name", {"name": "Ahmed"}, query.filter(User.name != "Ahmed")),
+            ("name_not_in", {"names": ["Ahmed", "Omar"]}, query.filter(User.name.not_in(["Ahmed", "Omar"]))),
+        ]
+        for name, params, expected in cases:
+            assert self.ids(self.registry.all(self.session, name, **params)) == self.ids(expected.all()), name
+
+    def test_reports_cache_hits(self):
+        """Only the first execution of a shape compiles."""
+        for age in range(20, 30):
+            self.registry.all(self.session, "by_age", age=age)
+
+        stats = self.registry.stats()["by_age"]
+        assert stats["calls"] == 10
+        assert stats["hits"] >= 9
+        assert stats["hit_ratio"] >= 0.9
+
+    def test_decorator_registration(self):
+        registry = QueryRegistry()
+
+        @registry.query("oldest")
+        def oldest():
+            return select(User).where(User.age == bindparam("age")).order_by(User.id.desc()).limit(1)
+
+        assert "oldest" in registry
+        assert registry.all(self.session, "oldest", age=23)[0].age == 23
+
+    def test_rejects_duplicates_and_unknown_names(self):
+        with pytest.raises(ValueError):
+            self.registry.register("by_age", select(User))
+        with pytest.raises(KeyError):
+            self.registry.execute(self.session, "missing")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,141 @@
+"""
+Test cases for the Joins tutorial's lightweight report records.
+
+This module checks that report_record() derives its columns from the
+declared fields, that records and bundles carry the same values as the
+entities, and that neither path registers anything in the identity map.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, event, func
+from sqlalchemy.orm import Session, declarative_base, relationship
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Types-of-JOINS"))
+
+from reports import ReportRecord, fetch_report, report_record, report_select, stream_report  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    id = Column(Integer, primary_key=True)
+    first_name = Column(String)
+    last_name = Column(String)
+    addresses = relationship("Address", backref="user")
+
+
+class Address(Base):
+    __tablename__ = "address"
+
+    id = Column(Integer, primary_key=True)
+    city = Column(String)
+    state = Column(String)
+    user_id = Column(Integer, ForeignKey("user.id"))
+
+
+UserCityRow = report_record("UserCityRow", User.first_name, Address.city)
+
+
+class TestReportRecords:
+    """Test cases for report_record(), fetch_report() and the bundle path."""
+
+    def setup_method(self):
+        """Create 30 users; all but every fifth have an address."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all(
+            [
+                User(first_name=f"First {i}", last_name=f"Last {i}",
+                     addresses=[Address(city=f"City {i}", state="CA")] if i % 5 else [])
+                for i in range(30)
+            ]
+        )
+        self.session.commit()
+        self.session.expunge_all()
+        self.statement = report_select(UserCityRow).outerjoin_from(User, Address).order_by(User.id)
+        self.expected = [
+            (user.first_name, address.city if address else None)
+            for user, address in self.session.query(User, Address).outerjoin(Address).order_by(User.id)
+        ]
+        self.session.expunge_all()
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_record_class(self):
+        assert issubclass(UserCityRow, ReportRecord)
+        assert UserCityRow.fields == ("first_name", "city")
+        record = UserCityRow("Ahmed", "Cairo")
+        assert not hasattr(record, "__dict__")
+        assert repr(record) == "UserCityRow(first_name='Ahmed', city='Cairo')"
+        assert record.asdict() == {"first_name": "Ahmed", "city": "Cairo"}
+        assert record == UserCityRow("Ahmed", "Cairo") and record != UserCityRow("Ahmed", None)
+        with pytest.raises(AttributeError):
+            record.age = 30
+
+    def test_only_declared_columns_are_selected(self):
+        statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        fetch_report(self.session, self.statement, UserCityRow)
+        selected = statements[-1].split("FROM")[0]
+        assert "first_name" in selected and "city" in selected
+        assert "last_name" not in selected and "state" not in selected
+
+    def test_fetch_report(self):
+        records = fetch_report(self.session, self.statement, UserCityRow)
+        assert [record.astuple() for record in records] == self.expected
+        assert len(self.session.identity_map) == 0
+
+    def test_stream_report(self):
+        records = stream_report(self.session, self.statement, UserCityRow, batch_size=7)
+        assert [record.astuple() for record in records] == self.expected
+        # yield_per applied to that statement only
+        assert len(self.session.execute(self.statement).all()) == 30
+
+    def test_pending_objects_are_flushed(self):
+        self.session.add(User(first_name="Pending", addresses=[Address(city="Giza")]))
+        statement = self.statement.where(User.first_name == "Pending")
+        assert fetch_report(self.session, statement, UserCityRow) == [UserCityRow("Pending", "Giza")]
+        self.session.add(User(first_name="Pending", addresses=[Address(city="Luxor")]))
+        assert [record.city for record in stream_report(self.session, statement, UserCityRow)] == ["Giza", "Luxor"]
+        with self.session.no_autoflush:
+            self.session.add(User(first_name="Pending", addresses=[Address(city="Aswan")]))
+            assert len(fetch_report(self.session, statement, UserCityRow)) == 2
+
+    def test_bundle(self):
+        rows = self.session.execute(
+            report_select(UserCityRow).with_only_columns(UserCityRow.bundle(), func.length(User.last_name))
+            .outerjoin_from(User, Address).order_by(User.id)
+        ).all()
+        assert [(record.first_name, record.city) for record, _ in rows] == self.expected
+        assert all(isinstance(record, UserCityRow) for record, _ in rows)
+        assert len(self.session.identity_map) == 0
+
+    def test_named_fields_and_expressions(self):
+        Row = report_record("Row", User.first_name, owner=User.last_name, cities=func.count(Address.id))
+        assert Row.fields == ("first_name", "owner", "cities")
+        statement = report_select(Row).outerjoin_from(User, Address).group_by(User.id).order_by(User.id).limit(2)
+        assert fetch_report(self.session, statement, Row) == [Row("First 0", "Last 0", 0), Row("First 1", "Last 1", 1)]
+
+    def test_invalid_fields(self):
+        with pytest.raises(ValueError, match="duplicate"):
+            report_record("Row", User.id, Address.id)
+        with pytest.raises(ValueError):
+            report_record("Row", **{"class": User.id})
+        with pytest.raises(ValueError):
+            report_record("Row", _hidden=User.id)
+        for name in ("fields", "columns", "astuple", "asdict", "bundle"):
+            with pytest.raises(ValueError, match="not a valid report field name"):
+                report_record("Row", **{name: User.id})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
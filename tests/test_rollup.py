@@ -0,0 +1,134 @@
+"""
+Test cases for the Grouping tutorial's incremental count rollup.
+
+This module checks that the trigger-maintained age histogram follows
+ORM and Core inserts, updates and deletes, answers range filters and
+reports drift through the consistency checker.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, delete, event, func, insert, text, update
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Grouping-Chaining-Data"))
+
+from rollup import CountRollup, RollupNotInstalledError  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+
+
+age_rollup = CountRollup(User.age)
+age_rollup.attach()
+
+
+class TestCountRollup:
+    """Test cases for CountRollup."""
+
+    def setup_method(self):
+        """Create the table (and rollup triggers) with 30 users."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all([User(name=f"User {i}", age=15 + i % 10 * 5) for i in range(30)])
+        self.session.commit()
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def group_by(self, *criteria):
+        query = self.session.query(User.age, func.count(User.id)).filter(*criteria)
+        return [tuple(row) for row in query.group_by(User.age).order_by(User.age).all()]
+
+    def histogram(self, *criteria):
+        return [tuple(row) for row in age_rollup.histogram(self.session, *criteria)]
+
+    def test_matches_group_by(self):
+        assert self.histogram() == self.group_by()
+        assert age_rollup.check_consistency(self.session) == {}
+
+    def test_range_filters_are_answered_from_the_rollup(self):
+        """The chained age > 20 / age < 50 query reads only the rollup table."""
+        statements = []
+        event.listen(
+            self.engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql)
+        )
+        histogram = self.histogram(User.age > 20, User.age < 50)
+        assert "FROM users_age_counts" in statements[-1]
+        assert "FROM users " not in statements[-1]
+        assert histogram == self.group_by(User.age > 20, User.age < 50)
+
+    def test_filters_on_other_columns_are_rejected(self):
+        with pytest.raises(ValueError):
+            age_rollup.histogram(self.session, User.name == "User 1")
+
+    def test_follows_orm_writes(self):
+        users = self.session.query(User).order_by(User.id).all()
+        users[0].age = 99
+        users[1].age = None
+        self.session.delete(users[2])
+        self.session.add(User(name="New", age=99))
+        self.session.flush()
+        assert self.histogram() == self.group_by()
+        assert (99, 2) in self.histogram()
+        assert (None, 1) in self.histogram()
+
+    def test_follows_core_and_bulk_writes(self):
+        """Statements that bypass the ORM's unit of work are counted too."""
+        self.session.execute(insert(User), [{"name": "Bulk", "age": 70}] * 5)
+        self.session.execute(update(User).where(User.age == 15).values(age=16))
+        self.session.execute(delete(User).where(User.age == 20))
+        self.session.commit()
+        histogram = dict(self.histogram())
+        assert histogram[70] == 5 and histogram[16] == 3
+        assert 15 not in histogram and 20 not in histogram
+        assert age_rollup.check_consistency(self.session) == {}
+
+    def test_rollback_undoes_the_rollup_changes(self):
+        before = self.histogram()
+        self.session.execute(delete(User))
+        assert self.histogram() == []
+        self.session.rollback()
+        assert self.histogram() == before
+
+    def test_consistency_check_reports_drift(self):
+        self.session.execute(text("UPDATE users_age_counts SET row_count = row_count + 1 WHERE age = 15"))
+        self.session.execute(text("DELETE FROM users_age_counts WHERE age = 60"))
+        assert age_rollup.check_consistency(self.session) == {15: (4, 3), 60: (0, 3)}
+        age_rollup.install(self.session.connection())
+        assert age_rollup.check_consistency(self.session) == {}
+
+    def test_install_on_an_existing_table(self):
+        """Without the rollup the histogram falls back to GROUP BY."""
+        engine = create_engine("sqlite:///:memory:")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR, age INTEGER)"))
+            conn.execute(text("INSERT INTO users (age) VALUES (1), (1), (2)"))
+            with pytest.warns(RuntimeWarning, match="not installed"):
+                assert [tuple(r) for r in age_rollup.histogram(conn)] == [(1, 2), (2, 1)]
+            with pytest.raises(RollupNotInstalledError):
+                age_rollup.check_consistency(conn)
+            age_rollup.install(conn)
+            conn.execute(text("INSERT INTO users (age) VALUES (2)"))
+            assert age_rollup.installed(conn)
+            assert [tuple(r) for r in age_rollup.histogram(conn)] == [(1, 2), (2, 2)]
+            assert age_rollup.check_consistency(conn) == {}
+            # A rollup table without its triggers would drift
+            conn.execute(text("DROP TRIGGER users_age_counts_update"))
+            assert not age_rollup.installed(conn)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
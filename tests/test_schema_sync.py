@@ -0,0 +1,178 @@
+"""
+Test cases for the shared schema fingerprint module.
+
+This module checks that sync_schema() only runs DDL when the models change,
+keeps existing data, refuses to silently alter changed tables and that
+reset_schema() is the explicit way to start over.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import DDL, Column, Index, Integer, MetaData, String, Table, create_engine, event, inspect, text
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech"))
+
+from schema_sync import (  # noqa: E402
+    SchemaMismatchError,
+    reset_schema,
+    sync_schema,
+    table_fingerprints,
+)
+
+
+TRIGGER = "CREATE TRIGGER users_touch AFTER INSERT ON users BEGIN SELECT 1; END"
+
+
+def make_metadata(extra_column=False, extra_table=False, extra_index=False, unique_name=False, trigger=False):
+    metadata = MetaData()
+    columns = [Column("id", Integer, primary_key=True), Column("name", String, index=True, unique=unique_name)]
+    if extra_column:
+        columns.append(Column("age", Integer))
+    if extra_index:
+        columns.append(Index("ix_users_name_id", "name", "id"))
+    users = Table("users", metadata, *columns)
+    if trigger:
+        event.listen(users, "after_create", DDL(TRIGGER))
+    if extra_table:
+        Table("tags", metadata, Column("id", Integer, primary_key=True))
+    return metadata
+
+
+class TestSchemaSync:
+    """Test cases for sync_schema() and reset_schema()."""
+
+    def setup_method(self):
+        """Create an empty file database."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.directory.name, "test.db"))
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+
+    def teardown_method(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def ddl(self):
+        return [s for s in self.statements if s.lstrip().upper().startswith(("CREATE TABLE", "DROP"))]
+
+    def test_fingerprint_is_stable_and_tracks_changes(self):
+        """Same models hash the same; a new column changes the table's hash."""
+        dialect = self.engine.dialect
+        first = table_fingerprints(make_metadata(), dialect)
+        assert first == table_fingerprints(make_metadata(), dialect)
+        changed = table_fingerprints(make_metadata(extra_column=True), dialect)
+        assert changed["users"] != first["users"]
+        assert changed["*"] != first["*"]
+        # after_create DDL is part of the table
+        triggered = table_fingerprints(make_metadata(trigger=True), dialect)
+        assert triggered["users:columns"] != first["users:columns"]
+
+    def test_second_start_runs_no_ddl_and_keeps_data(self):
+        """An unchanged fingerprint skips DDL entirely."""
+        assert sync_schema(self.engine, make_metadata()) == "created"
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO users (name) VALUES ('Ahmed')"))
+
+        self.statements.clear()
+        assert sync_schema(self.engine, make_metadata()) == "unchanged"
+
+        assert [s for s in self.ddl() if "_schema_fingerprint" not in s] == []
+        with self.engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM users")).scalar() == 1
+
+    def test_new_tables_are_created_without_touching_old_ones(self):
+        """Adding a model only creates the new table."""
+        sync_schema(self.engine, make_metadata())
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO users (name) VALUES ('Ahmed')"))
+
+        assert sync_schema(self.engine, make_metadata(extra_table=True)) == "created"
+
+        with self.engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM users")).scalar() == 1
+            assert conn.execute(text("SELECT count(*) FROM tags")).scalar() == 0
+
+    def test_changed_table_requires_explicit_reset(self):
+        """Altering an existing table raises until reset_schema() is called."""
+        sync_schema(self.engine, make_metadata())
+        with pytest.raises(SchemaMismatchError, match="users"):
+            sync_schema(self.engine, make_metadata(extra_column=True))
+
+        reset_schema(self.engine, make_metadata(extra_column=True))
+        assert sync_schema(self.engine, make_metadata(extra_column=True)) == "unchanged"
+
+    def test_new_indexes_are_created_without_a_reset(self):
+        """Index-only changes keep the table and its rows."""
+        sync_schema(self.engine, make_metadata())
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO users (name) VALUES ('Ahmed')"))
+
+        assert sync_schema(self.engine, make_metadata(extra_index=True)) == "created"
+
+        assert "ix_users_name_id" in {index["name"] for index in inspect(self.engine).get_indexes("users")}
+        with self.engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM users")).scalar() == 1
+        assert sync_schema(self.engine, make_metadata(extra_index=True)) == "unchanged"
+
+    def test_adopts_databases_created_before_fingerprints(self):
+        """Tables from plain create_all() are adopted if the columns match."""
+        make_metadata().create_all(self.engine)
+        assert sync_schema(self.engine, make_metadata()) == "created"
+
+        other = create_engine("sqlite:///" + os.path.join(self.directory.name, "old.db"))
+        make_metadata().create_all(other)
+        with pytest.raises(SchemaMismatchError):
+            sync_schema(other, make_metadata(extra_column=True))
+        other.dispose()
+
+    def test_adoption_compares_constraints_and_after_create_ddl(self):
+        """An old table missing a UNIQUE constraint or its triggers is not adopted."""
+        make_metadata().create_all(self.engine)
+        with pytest.raises(SchemaMismatchError, match="users"):
+            sync_schema(self.engine, make_metadata(unique_name=True))
+        with pytest.raises(SchemaMismatchError, match="users"):
+            sync_schema(self.engine, make_metadata(trigger=True))
+
+        other = create_engine("sqlite:///" + os.path.join(self.directory.name, "old.db"))
+        make_metadata(unique_name=True, trigger=True).create_all(other)
+        assert sync_schema(other, make_metadata(unique_name=True, trigger=True)) == "created"
+        other.dispose()
+
+    def test_adoption_creates_missing_indexes(self):
+        """A table written by hand without the model's indexes is adopted and indexed."""
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE users (id INTEGER NOT NULL, name VARCHAR, PRIMARY KEY (id))"))
+        assert sync_schema(self.engine, make_metadata()) == "created"
+        assert "ix_users_name" in {index["name"] for index in inspect(self.engine).get_indexes("users")}
+
+    def test_new_after_create_ddl_requires_a_reset(self):
+        """Triggers only run on create, so adding them to an existing table needs reset_schema()."""
+        sync_schema(self.engine, make_metadata())
+        with pytest.raises(SchemaMismatchError, match="users"):
+            sync_schema(self.engine, make_metadata(trigger=True))
+        reset_schema(self.engine, make_metadata(trigger=True))
+        with self.engine.connect() as conn:
+            triggers = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars().all()
+        assert triggers == ["users_touch"]
+
+    def test_reset_deletes_rows(self):
+        """reset_schema() drops and recreates the tables."""
+        sync_schema(self.engine, make_metadata())
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO users (name) VALUES ('Ahmed')"))
+
+        reset_schema(self.engine, make_metadata())
+
+        with self.engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM users")).scalar() == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,152 @@
+"""
+Test cases for the CRUD tutorial's session lifecycle helpers.
+
+This module checks the SQLite engine configuration, thread and context
+scoped session registries and the session_scope() transaction wrapper.
+"""
+
+import asyncio
+import contextvars
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+from sqlalchemy import Column, Integer, String, func, select, text
+from sqlalchemy.orm import declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Create-Read-Update"))
+
+from sessions import (  # noqa: E402
+    create_sqlite_engine,
+    make_scoped_session,
+    session_scope,
+)
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class TestSessions:
+    """Test cases for the session lifecycle module."""
+
+    def setup_method(self):
+        """Create a file database (WAL needs a real file)."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_sqlite_engine(
+            os.path.join(self.directory.name, "test.db"), pool_size=4
+        )
+        Base.metadata.create_all(self.engine)
+
+    def teardown_method(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_engine_uses_wal_and_busy_timeout(self):
+        """Connections are configured for concurrent access."""
+        with self.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 30000
+        assert self.engine.pool.size() == 4
+
+    def test_thread_scope_gives_one_session_per_thread(self):
+        """The registry returns the same session within a thread only."""
+        registry = make_scoped_session(self.engine)
+        sessions = []
+
+        def grab():
+            sessions.append(registry())
+
+        threads = [threading.Thread(target=grab) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert registry() is registry()
+        assert len({id(s) for s in sessions + [registry()]}) == 4
+
+    def test_context_scope_gives_one_session_per_context(self):
+        """Separate contextvars contexts get separate sessions."""
+        registry = make_scoped_session(self.engine, scope="context")
+        first = contextvars.copy_context().run(registry)
+        second = contextvars.copy_context().run(registry)
+
+        assert first is not second
+        assert registry() is registry()
+
+    def test_context_scope_gives_one_session_per_task(self):
+        """Child tasks get their own session even if the parent used the registry first."""
+        registry = make_scoped_session(self.engine, scope="context")
+
+        async def child():
+            await asyncio.sleep(0)
+            session = registry()
+            assert registry() is session
+            registry.remove()
+            return session
+
+        async def parent():
+            session = registry()
+            children = await asyncio.gather(child(), child())
+            assert registry() is session
+            registry.remove()
+            return [session] + children
+
+        sessions = asyncio.run(parent())
+        assert len({id(s) for s in sessions}) == 3
+
+    def test_session_scope_commits_and_removes(self):
+        """A successful block commits and releases the scoped session."""
+        registry = make_scoped_session(self.engine)
+        with session_scope(registry) as session:
+            session.add(User(name="Ahmed"))
+        assert not registry.registry.has()
+
+        with session_scope(registry) as session:
+            assert session.scalar(select(func.count(User.id))) == 1
+
+    def test_session_scope_rolls_back_on_error(self):
+        """An exception rolls the unit of work back and propagates."""
+        registry = make_scoped_session(self.engine)
+        with pytest.raises(RuntimeError):
+            with session_scope(registry) as session:
+                session.add(User(name="Omar"))
+                session.flush()
+                raise RuntimeError("boom")
+
+        with session_scope(registry.session_factory) as session:
+            assert session.scalar(select(func.count(User.id))) == 0
+
+    def test_concurrent_writers_do_not_fail(self):
+        """Several threads can write through one registry."""
+        registry = make_scoped_session(self.engine)
+
+        def write(n):
+            for i in range(20):
+                with session_scope(registry) as session:
+                    session.add(User(name=f"{n}-{i}"))
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with session_scope(registry) as session:
+            assert session.scalar(select(func.count(User.id))) == 80
+
+    def test_rejects_unknown_scope(self):
+        with pytest.raises(ValueError):
+            make_scoped_session(self.engine, scope="process")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,110 @@
+"""
+Test cases for the Relationship-Loading-Techniques streaming helpers.
+
+This module checks that streaming.py yields partitions, removes the
+duplicates produced by implicit joins and keeps memory flat as the number
+of duplicate rows grows.
+"""
+
+import os
+import sys
+import tracemalloc
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, insert, select
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Relationship-Loading-Techniques")
+)
+
+from streaming import stream_partitions, stream_unique  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class Post(Base):
+    __tablename__ = "posts"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+
+
+def make_engine(users, posts_per_user):
+    """Create an in-memory database with ``users`` x ``posts_per_user`` posts."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"User {i}"} for i in range(1, users + 1)])
+        conn.execute(
+            insert(Post),
+            [{"user_id": i} for i in range(1, users + 1) for _ in range(posts_per_user)],
+        )
+    return engine
+
+
+class TestStreaming:
+    """Test cases for stream_partitions() and stream_unique()."""
+
+    def test_partitions_respect_batch_size(self):
+        """Rows arrive in partitions no larger than batch_size."""
+        engine = make_engine(users=25, posts_per_user=1)
+        with Session(engine) as session:
+            sizes = [len(p) for p in stream_partitions(session, select(User), batch_size=10)]
+        assert sizes == [10, 10, 5]
+
+    def test_unique_removes_join_duplicates(self):
+        """Each user is yielded once even though the join repeats it per post."""
+        engine = make_engine(users=5, posts_per_user=4)
+        statement = select(User).where(Post.user_id == User.id)
+        with Session(engine) as session:
+            names = [u.name for u in stream_unique(session, statement, batch_size=3)]
+        assert sorted(names) == [f"User {i}" for i in range(1, 6)]
+
+    def test_unique_accepts_legacy_query_and_ordered_mode(self):
+        """Legacy Query objects work and ordered=True only compares neighbours."""
+        engine = make_engine(users=4, posts_per_user=3)
+        with Session(engine) as session:
+            query = session.query(User).where(Post.user_id == User.id).order_by(User.id)
+            ids = [u.id for u in stream_unique(session, query, batch_size=2, ordered=True)]
+        assert ids == [1, 2, 3, 4]
+
+    def test_unique_with_custom_key_on_rows(self):
+        """Column rows can be de-duplicated with an explicit key."""
+        engine = make_engine(users=3, posts_per_user=2)
+        statement = select(User.id, User.name).join(Post, Post.user_id == User.id)
+        with Session(engine) as session:
+            rows = list(stream_unique(session, statement, key=lambda row: row.id))
+        assert [row.id for row in rows] == [1, 2, 3]
+
+    def test_peak_memory_is_flat_in_duplicate_rows(self):
+        """Ten times more posts must not mean ten times more memory."""
+        peaks = []
+        for posts_per_user in (10, 100):
+            engine = make_engine(users=50, posts_per_user=posts_per_user)
+            statement = select(User).where(Post.user_id == User.id)
+            with Session(engine) as session:
+                tracemalloc.start()
+                count = sum(1 for _ in stream_unique(session, statement, batch_size=100))
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            assert count == 50
+        assert peaks[1] < peaks[0] * 3
+
+    def test_rejects_invalid_batch_size(self):
+        """A non-positive batch size is a programming error."""
+        engine = make_engine(users=1, posts_per_user=1)
+        with Session(engine) as session:
+            with pytest.raises(ValueError):
+                list(stream_partitions(session, select(User), batch_size=0))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,135 @@
+"""
+Test cases for the CRUD tutorial's upsert helper.
+
+This module checks that upsert() resolves duplicate keys with
+INSERT ... ON CONFLICT and reports inserted/updated/skipped counts.
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, Integer, String, UniqueConstraint, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Create-Read-Update"))
+
+from upsert import upsert  # noqa: E402
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+    email = Column(String, unique=True)
+
+
+class Membership(Base):
+    __tablename__ = "memberships"
+    __table_args__ = (UniqueConstraint("user_id", "group"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer)
+    group = Column(String)
+    role = Column(String)
+
+
+class TestUpsert:
+    """Test cases for upsert()."""
+
+    def setup_method(self):
+        """Create an empty database and a session."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        upsert(self.session, User, [{"name": "Ahmed", "age": 30, "email": "ahmed@example.com"}])
+        self.session.commit()
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def users(self):
+        return self.session.execute(select(User.email, User.age).order_by(User.id)).all()
+
+    def test_do_update_counts_and_overwrites(self):
+        """Existing emails are updated, new emails inserted."""
+        result = upsert(
+            self.session,
+            User,
+            [
+                {"name": "Ahmed", "age": 31, "email": "ahmed@example.com"},
+                {"name": "Omar", "age": 25, "email": "omar@example.com"},
+            ],
+        )
+        assert (result.inserted, result.updated, result.skipped) == (1, 1, 0)
+        assert self.users() == [("ahmed@example.com", 31), ("omar@example.com", 25)]
+
+    def test_do_nothing_keeps_existing_rows(self):
+        """DO NOTHING skips conflicting rows."""
+        result = upsert(
+            self.session,
+            User,
+            [{"name": "Ahmed", "age": 99, "email": "ahmed@example.com"}],
+            on_conflict="nothing",
+        )
+        assert (result.inserted, result.skipped) == (0, 1)
+        assert self.users() == [("ahmed@example.com", 30)]
+
+    def test_duplicates_across_batches_and_within_a_batch(self):
+        """Repeated keys count as updates whether or not they share a batch."""
+        rows = [{"name": f"U{i}", "age": i, "email": f"u{i % 5}@example.com"} for i in range(12)]
+
+        result = upsert(self.session, User, rows, batch_size=4)
+
+        assert (result.inserted, result.updated, result.total) == (5, 7, 12)
+        assert len(self.users()) == 6
+        assert ("u1@example.com", 11) in self.users()
+
+    def test_null_keys_are_inserts(self):
+        """A NULL key never conflicts, so every such row is inserted."""
+        rows = [{"name": f"N{i}", "age": i, "email": None} for i in range(3)]
+        result = upsert(self.session, User, rows + [{"name": "Ahmed", "age": 40, "email": "ahmed@example.com"}])
+        assert (result.inserted, result.updated) == (3, 1)
+        assert len(self.users()) == 4
+        rows = [{"user_id": None, "group": "admins", "role": "member"}] * 2
+        result = upsert(self.session, Membership, rows, index_elements=("user_id", "group"))
+        assert (result.inserted, result.updated) == (2, 0)
+
+    def test_update_columns_limit_what_is_overwritten(self):
+        """Only the listed columns change on conflict."""
+        upsert(
+            self.session,
+            User,
+            [{"name": "Renamed", "age": 50, "email": "ahmed@example.com"}],
+            update_columns=["age"],
+        )
+        name, age = self.session.execute(select(User.name, User.age)).one()
+        assert (name, age) == ("Ahmed", 50)
+
+    def test_composite_conflict_target(self):
+        """Multi-column unique constraints work as conflict targets."""
+        rows = [
+            {"user_id": 1, "group": "admins", "role": "member"},
+            {"user_id": 1, "group": "admins", "role": "owner"},
+            {"user_id": 2, "group": "admins", "role": "member"},
+        ]
+        result = upsert(self.session, Membership, rows, index_elements=("user_id", "group"))
+        assert (result.inserted, result.updated) == (2, 1)
+        roles = self.session.scalars(select(Membership.role).order_by(Membership.user_id)).all()
+        assert roles == ["owner", "member"]
+
+    def test_rejects_invalid_options(self):
+        """Unknown conflict actions and batch sizes are rejected."""
+        with pytest.raises(ValueError):
+            upsert(self.session, User, [], on_conflict="replace")
+        with pytest.raises(ValueError):
+            upsert(self.session, User, [], batch_size=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,144 @@
+"""
+Test cases for the Filtering tutorial's vectorized in-memory filters.
+
+This module checks that VectorSnapshot returns exactly the ids SQLite
+returns for the same SQLAlchemy expressions, NULLs included.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+from sqlalchemy import Column, Float, Integer, String, and_, create_engine, not_, or_, select
+from sqlalchemy.orm import Session, declarative_base
+
+np = pytest.importorskip("numpy")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "ZeqTech", "Filtering-Data"))
+
+from vector_filter import UnsupportedExpression, VectorSnapshot  # noqa: E402
+
+Base = declarative_base()
+
+NAMES = ["Ahmed", "Omar", "Ali", "Mohammed", "Khalid", "Belal", None]
+AGES = [30, 25, 20, 35, 40, 20, None]
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+    score = Column("rating", Float)
+
+
+def leaf_predicates():
+    return [
+        User.age == 20,
+        User.age != 20,
+        User.age >= 25,
+        User.age < 30,
+        User.age <= 30,
+        User.age > 99,
+        User.name == "Ahmed",
+        User.name != "Omar",
+        User.name == "Zed",
+        User.name >= "Khalid",
+        User.name < "B",
+        User.name > "Nobody",
+        User.name.in_(["Ahmed", "Omar"]),
+        User.name.in_(["Zed"]),
+        User.name.not_in(["Ahmed", "Omar"]),
+        User.age.in_([20, 35]),
+        User.age.not_in([20, None]),
+        User.name.in_([]),
+        User.name.not_in([]),
+        User.name.is_(None),
+        User.age.is_not(None),
+        User.score >= 0.5,
+        30 > User.age,
+    ]
+
+
+class TestVectorSnapshot:
+    """Parity tests between SQL and the NumPy engine."""
+
+    def setup_method(self):
+        """Seed 500 users with NULLs in every column."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        rng = random.Random(7)
+        self.session.add_all(
+            [
+                User(
+                    name=rng.choice(NAMES),
+                    age=rng.choice(AGES),
+                    score=rng.choice([None, rng.random()]),
+                )
+                for _ in range(500)
+            ]
+        )
+        self.session.commit()
+        self.snapshot = VectorSnapshot.load(self.session, User, batch_size=64)
+
+    def teardown_method(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def assert_parity(self, *criteria):
+        expected = self.session.execute(select(User.id).where(*criteria).order_by(User.id)).scalars().all()
+        assert self.snapshot.ids(*criteria).tolist() == expected, str(and_(*criteria))
+
+    def test_leaf_predicates(self):
+        for predicate in leaf_predicates():
+            self.assert_parity(predicate)
+
+    def test_app_combinations(self):
+        """The or_/and_/not_ shapes used in app.py."""
+        self.assert_parity(or_(User.name == "Ahmed", User.age == 20))
+        self.assert_parity(and_(User.name == "Ahmed", User.age == 20))
+        self.assert_parity(not_(User.name == "Ahmed"))
+        self.assert_parity(
+            or_(User.name == "Ahmed", User.age == 20),
+            and_(User.name == "Ahmed", User.age == 20),
+            not_(User.name == "Mohammed"),
+        )
+
+    def test_random_expression_trees(self):
+        """Three-valued logic matches SQLite for nested and/or/not trees."""
+        rng = random.Random(11)
+        leaves = leaf_predicates()
+
+        def build(depth):
+            if depth == 0 or rng.random() < 0.3:
+                return rng.choice(leaves)
+            kind = rng.choice(["and", "or", "not"])
+            if kind == "not":
+                return not_(build(depth - 1))
+            parts = [build(depth - 1) for _ in range(rng.randint(2, 3))]
+            return and_(*parts) if kind == "and" else or_(*parts)
+
+        for _ in range(200):
+            self.assert_parity(build(4))
+
+    def test_rows_and_count(self):
+        rows = self.snapshot.rows(User.name == "Ali", attributes=["id", "name", "age"])
+        assert set(rows["name"]) == {"Ali"}
+        assert self.snapshot.count(User.name == "Ali") == len(rows["id"])
+        ages = self.session.execute(
+            select(User.age).where(User.name == "Ali").order_by(User.id)
+        ).scalars().all()
+        assert rows["age"].tolist() == ages
+
+    def test_unsupported_expressions_raise(self):
+        with pytest.raises(UnsupportedExpression, match="not supported"):
+            self.snapshot.ids(User.name.like("A%"))
+        with pytest.raises(ValueError):
+            self.snapshot.ids(User.age == User.id)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])